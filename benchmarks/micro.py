@@ -0,0 +1,286 @@
+import os
+import sys
+import json
+import time
+import atexit
+import argparse
+import contextlib
+import numpy as np
+
+# Benchmarks run without a display
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+from PyQt6.QtWidgets import QApplication
+from simulator import SensorSimulator, generate_dynamic_config
+from core.sensor_config import SIM_CONFIG
+from core.protocol import (PROTOCOL_JSON, PROTOCOL_BINARY, FrameDecoder, build_schema, encode_json,
+                           encode_json_frame, encode_binary_frame)
+from core.stream_state import SensorState, BatchAccumulator
+from core.notifications import NotificationManager
+from core.alarms import AlarmEngine
+from core.shm_transport import ShmRingWriter, ShmRingReader
+from core.comm_thread import CommThread
+from gui.dashboard import Dashboard
+
+# Hot-Path Microbenchmarks
+#
+# Each benchmark builds its inputs for a sensor count once, then times one
+# operation (one frame, one batch, one alert per sensor) over several
+# repeats and keeps the best time. Results are compared against the
+# committed numbers in baselines.json; a case slower than `threshold` x its
+# baseline is a regression. Baselines are machine-specific: refresh them
+# with --save-baseline on the reference machine when a change is intended.
+#
+#   python -m benchmarks.micro                      # compare against baselines.json
+#   python -m benchmarks.micro --save-baseline      # record new baselines
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+DEFAULT_SIZES = (100, 1000, 10000)
+# Slower than this factor x baseline counts as a regression (leaves room for timer noise)
+DEFAULT_THRESHOLD = 1.5
+# Sink for the simulator's and the mock channels' console output
+_DEVNULL = open(os.devnull, "w")
+_app = None
+
+def _quiet_simulator(sensor_config, **kwargs):
+    with contextlib.redirect_stdout(_DEVNULL):
+        return SensorSimulator(sensor_config=sensor_config, sim_config=dict(SIM_CONFIG), seed=0, **kwargs)
+
+def bench_generate_data(sensors):
+    """SensorSimulator.generate_data(): one frame of the per-sensor loop."""
+    simulator = _quiet_simulator(generate_dynamic_config(sensors))
+    return simulator.generate_data
+
+def bench_generate_frame_vectorized(sensors):
+    """SensorSimulator.generate_frame() on the NumPy engine."""
+    simulator = _quiet_simulator(generate_dynamic_config(sensors), vectorized=True)
+    return simulator.generate_frame
+
+def bench_encode_binary(sensors):
+    """encode_binary_frame() of one full frame."""
+    frame = _quiet_simulator(generate_dynamic_config(sensors), vectorized=True).generate_frame()
+    return lambda: encode_binary_frame(frame)
+
+def bench_encode_json(sensors):
+    """encode_json_frame() of one full frame."""
+    frame = _quiet_simulator(generate_dynamic_config(sensors), vectorized=True).generate_frame()
+    return lambda: encode_json_frame(frame)
+
+def _comm_ingest(sensors, protocol):
+    """Decode + apply of one frame, as CommThread.run does per received chunk."""
+    sensor_config = generate_dynamic_config(sensors)
+    frame = _quiet_simulator(sensor_config, vectorized=True).generate_frame()
+    payload = encode_binary_frame(frame) if protocol == PROTOCOL_BINARY else encode_json_frame(frame)
+    comm = CommThread()
+    comm.handle_message(build_schema(sensor_config))
+    decoder = FrameDecoder()
+
+    def run():
+        for msg in decoder.feed(payload):
+            comm.handle_message(msg)
+        comm.batch.take(decoder.stats())
+    return run
+
+def bench_comm_ingest_binary(sensors):
+    """FrameDecoder.feed() + CommThread.handle_message() + batch take, binary frame."""
+    return _comm_ingest(sensors, PROTOCOL_BINARY)
+
+def bench_comm_ingest_json(sensors):
+    """FrameDecoder.feed() + CommThread.handle_message() + batch take, JSON frame."""
+    return _comm_ingest(sensors, PROTOCOL_JSON)
+
+def bench_comm_ingest_shm(sensors):
+    """ShmRingWriter.write() + ShmRingReader.frames() + CommThread.handle_message() + batch take."""
+    sensor_config = generate_dynamic_config(sensors)
+    frame = _quiet_simulator(sensor_config, vectorized=True).generate_frame()
+    schema = build_schema(sensor_config)
+    writer = ShmRingWriter(f"proline_bench_{os.getpid()}_{sensors}", sensors, encode_json(schema))
+    reader = ShmRingReader(writer.name)
+    # Unlinked when the benchmark process exits (atexit runs the reader's close first)
+    atexit.register(writer.close)
+    atexit.register(reader.close)
+    comm = CommThread()
+    comm.handle_message(reader.schema)
+
+    def run():
+        writer.write(frame)
+        for msg in reader.frames():
+            comm.handle_message(msg)
+        comm.batch.take(reader.stats())
+    return run
+
+def bench_dashboard_update_data(sensors):
+    """Dashboard.update_data() of one batch covering every sensor (no alarms)."""
+    global _app
+    _app = QApplication.instance() or QApplication([])  # Must outlive the dashboard
+    sensor_config = generate_dynamic_config(sensors)
+    dashboard = Dashboard(CommThread(), fps=30)
+    dashboard.render_timer.stop()
+    dashboard.update_schema(build_schema(sensor_config))
+
+    # Mid-range values keep every sensor inside its limits
+    state = SensorState(sensor_config)
+    accumulator = BatchAccumulator(state)
+    simulator = _quiet_simulator(sensor_config, vectorized=True)
+    frame = simulator.generate_frame()
+    frame.values[:] = [sum(info['limits']) / 2 for info in sensor_config.values()]
+    frame.status[:] = 0
+    accumulator.add(state.apply(frame), frame.timestamp)
+    batch = accumulator.take()
+    step = SIM_CONFIG["update_rate"]
+
+    def run():
+        batch.timestamps += step
+        batch.sample_time += step
+        dashboard.update_data(batch)
+    return run
+
+def bench_alarm_evaluate(sensors):
+    """AlarmEngine.evaluate() of one full frame, every sensor jittering across its high limit."""
+    sensor_config = generate_dynamic_config(sensors)
+    engine = AlarmEngine(sensor_config)
+    positions = np.arange(sensors)
+    high = engine.high
+    jitter = np.array([0.2, -0.2]) * (high - engine.low)[:, None] * 0.02  # Inside the hysteresis band
+    status = np.zeros(sensors, dtype=np.uint8)
+    step = [0]
+
+    def run():
+        step[0] ^= 1
+        engine.evaluate(positions, high + jitter[:, step[0]], status)
+    return run
+
+def bench_send_alert(sensors):
+    """NotificationManager.send_alert() for every sensor, its digest and delivery (mock channels, no cooldown)."""
+    manager = NotificationManager(queue_size=2 * sensors)
+    manager.cooldown = 0.0
+    ids = list(generate_dynamic_config(sensors))
+
+    def run():
+        with contextlib.redirect_stdout(_DEVNULL):
+            for sid in ids:
+                manager.send_alert(sid, f"Sensor {sid}", "HIGH LIMIT: 95.0 > 80.0", "LIMIT", "Generic")
+            manager.flush_digest()
+            manager.flush()
+    return run
+
+# Name -> setup(sensors) returning the operation to time
+BENCHMARKS = {
+    "generate_data": bench_generate_data,
+    "generate_frame_vectorized": bench_generate_frame_vectorized,
+    "encode_binary": bench_encode_binary,
+    "encode_json": bench_encode_json,
+    "comm_ingest_binary": bench_comm_ingest_binary,
+    "comm_ingest_json": bench_comm_ingest_json,
+    "comm_ingest_shm": bench_comm_ingest_shm,
+    "dashboard_update_data": bench_dashboard_update_data,
+    "alarm_evaluate": bench_alarm_evaluate,
+    "send_alert": bench_send_alert,
+}
+
+def time_operation(operation, repeat=5, min_time=0.2):
+    """
+    Best seconds per call of `operation`.
+
+    The call count per repeat is doubled until one repeat takes min_time,
+    then the fastest of `repeat` repeats is used (the least disturbed run).
+
+    Input: Zero-argument callable, repeats, minimum seconds per repeat
+    Output: Seconds per call (float)
+    """
+    operation()  # Warm-up (lazy imports, first-call allocations)
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            operation()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1 << 20:
+            break
+        number *= 2
+    best = elapsed / number
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            operation()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+def case_key(name, sensors):
+    return f"{name}[{sensors}]"
+
+def run_benchmarks(sizes=DEFAULT_SIZES, names=None, repeat=5, min_time=0.2):
+    """
+    Times every selected benchmark at every sensor count.
+
+    Input: Sensor counts, benchmark names (None = all), repeats, seconds per repeat
+    Output: {case_key: seconds per call}
+    """
+    results = {}
+    for name in names or BENCHMARKS:
+        for sensors in sizes:
+            results[case_key(name, sensors)] = time_operation(BENCHMARKS[name](sensors), repeat, min_time)
+    return results
+
+def load_baselines(path=BASELINE_PATH):
+    """Committed {case_key: seconds per call}; empty if the file does not exist yet."""
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)["results"]
+
+def save_baselines(results, path=BASELINE_PATH):
+    """Merges `results` into the baseline file (cases not run keep their old numbers)."""
+    merged = load_baselines(path)
+    merged.update({key: float(f"{seconds:.4g}") for key, seconds in results.items()})
+    with open(path, "w") as f:
+        json.dump({"unit": "seconds per call", "results": dict(sorted(merged.items()))}, f, indent=2)
+        f.write("\n")
+
+def compare(results, baselines, threshold=DEFAULT_THRESHOLD):
+    """
+    Compares measured cases with their baselines.
+
+    Input: Measured and baseline {case_key: seconds}, regression factor
+    Output: List of {case, seconds, baseline, ratio, regression} dicts (baseline None if missing)
+    """
+    report = []
+    for key, seconds in results.items():
+        baseline = baselines.get(key)
+        ratio = seconds / baseline if baseline else None
+        report.append({"case": key, "seconds": seconds, "baseline": baseline,
+                       "ratio": None if ratio is None else round(ratio, 3),
+                       "regression": ratio is not None and ratio > threshold})
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Microbenchmarks for the simulator, CommThread, Dashboard and alerts")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Sensor counts")
+    parser.add_argument("--only", choices=sorted(BENCHMARKS), nargs="+", help="Run only these benchmarks")
+    parser.add_argument("--repeat", type=int, default=5, help="Repeats per case (best one is kept)")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Minimum seconds per repeat")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Report a regression above this factor x baseline")
+    parser.add_argument("--baseline", type=str, default=BASELINE_PATH, help="Baseline file")
+    parser.add_argument("--save-baseline", action="store_true", help="Write the results as the new baselines")
+    parser.add_argument("--json", action="store_true", help="Print the comparison as JSON")
+
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.sizes, args.only, args.repeat, args.min_time)
+    report = compare(results, load_baselines(args.baseline), args.threshold)
+    if args.json:
+        print(json.dumps({"benchmark": "micro", "threshold": args.threshold, "results": report}, indent=2))
+    else:
+        for row in report:
+            if row["baseline"] is None:
+                versus = "no baseline"
+            else:
+                versus = f"baseline {row['baseline'] * 1e6:.1f} us, {row['ratio']:.2f}x"
+            flag = "  REGRESSION" if row["regression"] else ""
+            print(f"{row['case']:<40} {row['seconds'] * 1e6:12.1f} us  ({versus}){flag}")
+
+    if args.save_baseline:
+        save_baselines(results, args.baseline)
+        print(f"Saved {len(results)} baselines to {args.baseline}", file=sys.stderr)
+    elif any(row["regression"] for row in report):
+        sys.exit(1)
@@ -0,0 +1,192 @@
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import contextlib
+import numpy as np
+
+# Benchmarks run without a display
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+from PyQt6.QtCore import QEventLoop, QTimer
+from PyQt6.QtWidgets import QApplication
+from simulator import SensorSimulator, generate_dynamic_config
+from core.sensor_config import SIM_CONFIG
+from core.protocol import PROTOCOLS, PROTOCOL_BINARY, sample_rates
+from core.comm_thread import CommThread
+from gui.dashboard import Dashboard
+
+# End-to-End Pipeline Benchmark
+#
+# Runs SensorSimulator in-process on an ephemeral port, connects a CommThread
+# to it and collects the batches it hands to the GUI thread (optionally into
+# a real Dashboard), for every combination of sensor count and update rate.
+# Latency is measured from a frame's timestamp (taken by the simulator when
+# it generates the frame) to the moment its batch is handled on the GUI
+# thread. Fast sensors' burst samples are left out of the latency figures,
+# since they are older than their frame by design.
+#
+#   python -m benchmarks.pipeline --sensors 100 1000 10000 --rates 0.5 0.1 0.02
+
+DEFAULT_SENSORS = (100, 1000, 10000)
+DEFAULT_RATES = (0.5, 0.1, 0.02)
+# A case is "sustained" if at least this share of the generated frames arrived
+SUSTAINED_RATIO = 0.95
+
+def _rss_mb():
+    """Current resident set size of this process in MB (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except (OSError, ValueError, IndexError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1e6 if sys.platform == "darwin" else peak / 1e3
+
+class _BatchCollector:
+    """
+    Records per-frame latency and the latest stream counters of delivered batches.
+
+    Input: Per-sensor sample rates in schema order (burst sensors are excluded from latency)
+    Output: Latency samples and counters, read by run_case()
+    """
+    def __init__(self, rates):
+        self.slow = np.asarray(rates) <= 0
+        self.latencies = []
+        self.stats = {}
+        self.batches = 0
+        self.recording = False
+
+    def on_batch(self, batch):
+        now = time.time()
+        self.stats = batch.stats
+        if not self.recording:
+            return
+        self.batches += 1
+        index = batch.sample_index
+        if index.size:
+            # One timestamp per frame merged into the batch
+            stamps = np.unique(batch.sample_time[self.slow[index]])
+            self.latencies.append(now - stamps)
+
+def run_case(sensors, update_rate, duration=5.0, warmup=1.0, protocol=PROTOCOL_BINARY, delta=False,
+             dashboard=False, fps=30):
+    """
+    Measures one simulator -> CommThread (-> Dashboard) configuration.
+
+    Input: Sensor count, update rate (s), measured seconds, warm-up seconds,
+           wire protocol, delta mode, whether a Dashboard ingests the batches
+    Output: Result dict (frames/s, bytes/s, latency percentiles, CPU, RSS)
+    """
+    app = QApplication.instance() or QApplication([])
+    sensor_config = generate_dynamic_config(sensors)
+    sim_config = dict(SIM_CONFIG, update_rate=update_rate)
+
+    simulator = SensorSimulator(host="127.0.0.1", port=0, sensor_config=sensor_config, sim_config=sim_config,
+                                vectorized=True, delta=delta, seed=0)
+    server_thread = threading.Thread(target=simulator.start, daemon=True)
+    server_thread.start()
+    if not simulator.wait_until_ready(5.0):
+        raise RuntimeError("Simulator did not start listening")
+
+    comm = CommThread(host=simulator.host, port=simulator.port, protocol=protocol)
+    collector = _BatchCollector(sample_rates(sensor_config))
+    comm.data_received.connect(collector.on_batch)
+    window = None
+    if dashboard:
+        window = Dashboard(comm, fps=fps)
+    comm.start()
+
+    def pump(seconds):
+        # Blocks in the event loop (no busy polling) so CPU time reflects the pipeline
+        loop = QEventLoop()
+        QTimer.singleShot(int(seconds * 1000), loop.quit)
+        loop.exec()
+
+    try:
+        pump(warmup)
+        start_stats = dict(collector.stats)
+        start_seq = simulator.frame_seq
+        start_cpu = time.process_time()
+        start_wall = time.monotonic()
+        collector.recording = True
+
+        pump(duration)
+
+        collector.recording = False
+        wall = time.monotonic() - start_wall
+        cpu = time.process_time() - start_cpu
+        end_stats = dict(collector.stats)
+        generated = simulator.frame_seq - start_seq
+        rss = _rss_mb()
+        server_dropped = sum(client.frames_dropped for client in simulator.clients.values())
+    finally:
+        comm.stop()
+        if window is not None:
+            window.render_timer.stop()
+            window.deleteLater()
+        simulator.stop()
+        server_thread.join(5.0)
+
+    received = end_stats.get("frames", 0) - start_stats.get("frames", 0)
+    latencies = np.concatenate(collector.latencies) if collector.latencies else np.empty(0)
+    return {
+        "sensors": sensors,
+        "update_rate": update_rate,
+        "protocol": protocol,
+        "delta": delta,
+        "dashboard": dashboard,
+        "seconds": round(wall, 3),
+        "target_frames_per_s": round(1.0 / update_rate, 3),
+        "frames_generated": generated,
+        "frames_received": received,
+        "frames_per_s": round(received / wall, 2),
+        "samples_per_s": round(received * sensors / wall, 1),
+        "bytes_per_s": round((end_stats.get("bytes_received", 0) - start_stats.get("bytes_received", 0)) / wall, 1),
+        "batches": collector.batches,
+        "conflated": end_stats.get("conflated", 0) - start_stats.get("conflated", 0),
+        "frames_dropped": end_stats.get("frames_dropped", 0) - start_stats.get("frames_dropped", 0),
+        "server_frames_skipped": server_dropped,
+        "latency_ms": {
+            "p50": round(float(np.percentile(latencies, 50)) * 1e3, 3) if latencies.size else None,
+            "p99": round(float(np.percentile(latencies, 99)) * 1e3, 3) if latencies.size else None,
+            "max": round(float(latencies.max()) * 1e3, 3) if latencies.size else None,
+        },
+        "cpu_percent": round(100.0 * cpu / wall, 1),
+        "rss_mb": round(rss, 1),
+        "sustained": bool(generated) and received >= SUSTAINED_RATIO * generated and not server_dropped,
+    }
+
+def run_sweep(sensor_counts, rates, **options):
+    """Runs run_case() for every sensor count x update rate combination, in that order."""
+    results = []
+    for sensors in sensor_counts:
+        for rate in rates:
+            print(f"Benchmarking {sensors} sensors at {1.0 / rate:g} Hz...", file=sys.stderr)
+            results.append(run_case(sensors, rate, **options))
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="End-to-end simulator -> CommThread -> Dashboard benchmark")
+    parser.add_argument("--sensors", type=int, nargs="+", default=DEFAULT_SENSORS, help="Sensor counts to sweep")
+    parser.add_argument("--rates", type=float, nargs="+", default=DEFAULT_RATES,
+                        help="Update rates to sweep (seconds between frames)")
+    parser.add_argument("--duration", type=float, default=5.0, help="Measured seconds per case")
+    parser.add_argument("--warmup", type=float, default=1.0, help="Seconds discarded before measuring")
+    parser.add_argument("--protocol", choices=PROTOCOLS, default=PROTOCOL_BINARY, help="Wire protocol to request")
+    parser.add_argument("--delta", action="store_true", help="Run the simulator in delta mode")
+    parser.add_argument("--dashboard", action="store_true", help="Feed the batches into a (offscreen) Dashboard")
+    parser.add_argument("-o", "--output", type=str, help="Also write the JSON results to this file")
+
+    args = parser.parse_args()
+
+    # Simulator and dashboard chatter goes to stderr; stdout is the JSON report
+    with contextlib.redirect_stdout(sys.stderr):
+        results = run_sweep(args.sensors, args.rates, duration=args.duration, warmup=args.warmup,
+                            protocol=args.protocol, delta=args.delta, dashboard=args.dashboard)
+    report = json.dumps({"benchmark": "pipeline", "results": results}, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+    print(report)
@@ -0,0 +1,144 @@
+import numpy as np
+from core.protocol import STATUS_OK, STATUS_LABELS
+
+# Alarm states (one uint8 per sensor)
+ALARM_NONE = 0
+ALARM_FAULT = 1
+ALARM_LOW = 2
+ALARM_HIGH = 3
+ALARM_LABELS = ("NONE", "FAULT", "LOW LIMIT", "HIGH LIMIT")
+
+class AlarmTransitions:
+    """
+    Sensors whose alarm state changed in one evaluate() call.
+
+    Input: Built by AlarmEngine.evaluate()
+    Output: None (plain container of equally long arrays)
+    """
+    def __init__(self, positions, previous, current, values, status):
+        self.positions = positions  # Engine positions (sensor_ids order)
+        self.previous = previous    # State before the frame
+        self.current = current      # State after the frame
+        self.values = values        # Value that caused the change
+        self.status = status        # Its status code
+
+    def __len__(self):
+        return len(self.positions)
+
+def alarm_message(state, value, status, limits):
+    """
+    Log line text for an alarm state (as shown in the Dashboard's alarm logs).
+
+    Input: Alarm state, value, status code, (low, high) limits
+    Output: Message string ("" for ALARM_NONE)
+    """
+    if state == ALARM_FAULT:
+        return f"FAULT: {STATUS_LABELS[status]} (under fixation)"
+    if state == ALARM_LOW:
+        return f"LOW LIMIT: {value} < {limits[0]}"
+    if state == ALARM_HIGH:
+        return f"HIGH LIMIT: {value} > {limits[1]}"
+    return ""
+
+class AlarmEngine:
+    """
+    Vectorized fault / low limit / high limit classification for many sensors.
+
+    Limits, hysteresis bands, states and debounce counters are arrays in
+    sensor_ids order, so a frame is classified in a few NumPy operations:
+    - a bad status code is a FAULT, otherwise below low is LOW, above high is HIGH
+    - an active limit alarm only clears once the value is `band` back inside
+      the limit, so values jittering at a limit do not toggle it
+    - a new state must be seen on `debounce` consecutive evaluations of the
+      sensor before it is taken (FAULTs are taken at once)
+    Only state changes are returned. No Qt dependency.
+
+    Input: Sensor config dict (ordered by ID; optional per-sensor 'hysteresis'
+           in sensor units), hysteresis as a fraction of the range, debounce count
+    Output: AlarmTransitions from evaluate(), current states in `state`
+    """
+    def __init__(self, sensor_config, hysteresis=0.02, debounce=1):
+        self.sensor_ids = list(sensor_config)
+        count = len(self.sensor_ids)
+        limits = np.array([info['limits'] for info in sensor_config.values()], dtype=np.float64).reshape(count, 2)
+        self.low = limits[:, 0].copy()
+        self.high = limits[:, 1].copy()
+        self.band = np.array([
+            info.get('hysteresis', (info['limits'][1] - info['limits'][0]) * hysteresis)
+            for info in sensor_config.values()
+        ], dtype=np.float64)
+        self.debounce = max(1, int(debounce))
+        self.state = np.zeros(count, dtype=np.uint8)
+        self.pending = np.zeros(count, dtype=np.uint8)   # State waiting for confirmation
+        self.counts = np.zeros(count, dtype=np.uint32)   # Consecutive evaluations in `pending`
+        self._mapping = (None, None)  # (stream sensor_ids, engine position per stream position)
+
+    def reset(self):
+        """Clears every alarm (active alarms are reported again on their next evaluation)."""
+        self.state.fill(ALARM_NONE)
+        self.pending.fill(ALARM_NONE)
+        self.counts.fill(0)
+
+    def map_positions(self, sensor_ids, indices):
+        """
+        Engine positions of stream positions (the stream's sensor order may differ).
+
+        Input: Stream sensor_ids list (the mapping is cached while the same list is passed), positions in it
+        Output: Int array aligned with indices (-1 for sensors the engine does not know)
+        """
+        mapped_ids, mapping = self._mapping
+        if mapped_ids is not sensor_ids:
+            # Stream layout changed (schema or legacy data): map it once
+            own = {sid: pos for pos, sid in enumerate(self.sensor_ids)}
+            mapping = np.array([own.get(sid, -1) for sid in sensor_ids], dtype=np.intp)
+            self._mapping = (sensor_ids, mapping)
+        return mapping[indices]
+
+    def evaluate_batch(self, batch):
+        """
+        Evaluates a SampleBatch snapshot (sensors unknown to the engine are skipped).
+
+        Input: SampleBatch
+        Output: (engine positions of the evaluated sensors, AlarmTransitions)
+        """
+        positions = self.map_positions(batch.sensor_ids, batch.indices)
+        known = positions >= 0
+        positions = positions[known]
+        return positions, self.evaluate(positions, batch.values[known], batch.status[known])
+
+    def evaluate(self, positions, values, status):
+        """
+        Classifies one frame's readings and updates the alarm states.
+
+        Input: Engine positions (unique), values and status codes of the same length
+        Output: AlarmTransitions for the sensors whose state changed
+        """
+        positions = np.asarray(positions, dtype=np.intp)
+        values = np.asarray(values, dtype=np.float64)
+        status = np.asarray(status)
+        state = self.state[positions]
+
+        # Hysteresis: an active limit alarm uses a limit moved `band` inwards
+        low = self.low[positions]
+        high = self.high[positions]
+        band = self.band[positions]
+        low_edge = np.where(state == ALARM_LOW, low + band, low)
+        high_edge = np.where(state == ALARM_HIGH, high - band, high)
+        candidate = np.full(positions.size, ALARM_NONE, dtype=np.uint8)
+        candidate[values < low_edge] = ALARM_LOW
+        candidate[values > high_edge] = ALARM_HIGH
+        candidate[status != STATUS_OK] = ALARM_FAULT
+
+        # Debounce: count consecutive evaluations asking for the same new state
+        differs = candidate != state
+        repeated = differs & (candidate == self.pending[positions])
+        counts = np.where(repeated, self.counts[positions] + 1, differs.astype(np.uint32))
+        commit = differs & ((counts >= self.debounce) | (candidate == ALARM_FAULT))
+        counts[commit] = 0
+        self.pending[positions] = np.where(differs & ~commit, candidate, state)
+        self.counts[positions] = counts
+
+        changed = np.flatnonzero(commit)
+        moved = positions[changed]
+        self.state[moved] = candidate[changed]
+        return AlarmTransitions(moved, state[changed], candidate[changed], values[changed], status[changed])
@@ -0,0 +1,56 @@
+import numpy as np
+
+def minmax_decimate(times, values, t_start, t_end, buckets):
+    """
+    Reduces the samples of a time range to a per-bucket min/max envelope.
+
+    The range is split into `buckets` equal time slices (one per pixel
+    column); each non-empty slice contributes its minimum and maximum sample,
+    in the order they occurred, so spikes survive however far the view is
+    zoomed out. The nearest sample on each side of the range is kept so the
+    line runs to the plot edges. Ranges that already fit are returned as-is.
+
+    Input: Sorted times array, matching values array, visible range, bucket count
+    Output: (times, values) arrays with at most 2 * buckets + 2 points
+    """
+    first = max(np.searchsorted(times, t_start, side='left') - 1, 0)
+    last = min(np.searchsorted(times, t_end, side='right') + 1, len(times))
+    if last - first <= 2 * buckets + 2 or t_end <= t_start:
+        return times[first:last], values[first:last]
+
+    # Inner samples (strictly inside the range) are bucketed; the edge samples pass through
+    lo = first + 1 if times[first] < t_start else first
+    hi = last - 1 if times[last - 1] > t_end else last
+    inner_t = times[lo:hi]
+    inner_v = values[lo:hi]
+
+    # Bucket boundaries as sample positions; empty buckets are skipped
+    edges = np.linspace(t_start, t_end, buckets + 1)
+    bounds = np.searchsorted(inner_t, edges[:-1], side='left')
+    starts = np.unique(bounds)
+    starts = starts[starts < len(inner_t)]
+    counts = np.diff(np.append(starts, len(inner_t)))
+
+    # Position of the first min and first max in each bucket
+    mins = np.minimum.reduceat(inner_v, starts)
+    maxs = np.maximum.reduceat(inner_v, starts)
+    bucket = np.repeat(np.arange(len(starts)), counts)
+    positions = np.arange(len(inner_t))
+    end = len(inner_t)
+    pos_min = np.minimum.reduceat(np.where(inner_v == mins[bucket], positions, end), starts)
+    pos_max = np.minimum.reduceat(np.where(inner_v == maxs[bucket], positions, end), starts)
+
+    # Two points per bucket, in time order
+    picks = np.empty(2 * len(starts), dtype=np.intp)
+    picks[0::2] = np.minimum(pos_min, pos_max)
+    picks[1::2] = np.maximum(pos_min, pos_max)
+
+    out_t = inner_t[picks]
+    out_v = inner_v[picks]
+    if lo > first:
+        out_t = np.concatenate((times[first:lo], out_t))
+        out_v = np.concatenate((values[first:lo], out_v))
+    if hi < last:
+        out_t = np.concatenate((out_t, times[hi:last]))
+        out_v = np.concatenate((out_v, values[hi:last]))
+    return out_t, out_v
@@ -0,0 +1,153 @@
+import sys
+import time
+import queue
+import threading
+from core.sensor_config import HOST, PORT, SENSOR_CONFIG, ALARM_CONFIG
+from core.protocol import PROTOCOL_BINARY, STATUS_LABELS, schema_to_config
+from core.stream_client import StreamClient
+from core.alarms import AlarmEngine, alarm_message, ALARM_NONE, ALARM_FAULT
+from core.notifications import NotificationManager
+
+# Seconds between status lines and between notification digest polls
+STATUS_INTERVAL = 10.0
+POLL_INTERVAL = 1.0
+
+class HeadlessMonitor:
+    """
+    Ingestion, alarms and notifications without Qt, for server-side deployments.
+
+    A StreamClient receives on a plain thread; batches, schemas and
+    connection changes are queued to the thread calling run(), which
+    evaluates alarms, sends notifications and writes one line per alarm
+    change to `output` plus a periodic status line to `status_output`.
+
+    Input: Host, port, requested protocol, batches per second, optional
+           SegmentStore recorder, alarm line stream, status line stream (None
+           = no status), seconds between status lines, optional NotificationManager,
+           optional shared-memory ring name (None = TCP)
+    Output: Alarm and status lines; alarm_states {sid: message} of active alarms
+    """
+    def __init__(self, host=HOST, port=PORT, protocol=PROTOCOL_BINARY, batch_rate=20.0, recorder=None,
+                 output=sys.stdout, status_output=sys.stderr, status_interval=STATUS_INTERVAL,
+                 notifications=None, shm_name=None):
+        self._events = queue.Queue()
+        self.client = StreamClient(host, port, protocol, batch_rate, recorder,
+                                   on_batch=lambda batch: self._events.put(("batch", batch)),
+                                   on_schema=lambda schema: self._events.put(("schema", schema)),
+                                   on_connection=lambda connected: self._events.put(("connection", connected)),
+                                   shm_name=shm_name)
+        self.output = output
+        self.status_output = status_output
+        self.status_interval = status_interval
+        self.notifications = notifications or NotificationManager()
+        self.stream_stats = {}
+        self._stop_event = threading.Event()
+        self._thread = None
+        self.set_sensors(SENSOR_CONFIG)
+
+    def set_sensors(self, sensor_config):
+        """Rebuilds the alarm engine for a sensor set (local config or received schema)."""
+        self.sensor_info = sensor_config
+        self.alarms = AlarmEngine(sensor_config, ALARM_CONFIG["hysteresis"], ALARM_CONFIG["debounce"])
+        self.alarm_states = {}
+
+    def handle_schema(self, schema):
+        sensor_config = schema_to_config(schema)
+        if sensor_config != self.sensor_info:
+            self.set_sensors(sensor_config)
+        self._status(f"Schema received: {len(sensor_config)} sensors.")
+
+    def handle_batch(self, batch):
+        """
+        Evaluates the alarms of one batch; writes and notifies state changes only.
+
+        Input: SampleBatch
+        Output: None
+        """
+        self.stream_stats = batch.stats
+        _, transitions = self.alarms.evaluate_batch(batch)
+        if not len(transitions):
+            return
+        sensor_ids = self.alarms.sensor_ids
+        t_str = time.strftime("%Y-%m-%d %H:%M:%S")
+        lines = []
+        for pos, current, val, code in zip(transitions.positions.tolist(), transitions.current.tolist(),
+                                           transitions.values.tolist(), transitions.status.tolist()):
+            sid = sensor_ids[pos]
+            info = self.sensor_info[sid]
+            name = info['name']
+            if current == ALARM_NONE:
+                self.alarm_states.pop(sid, None)
+                lines.append(f"[{t_str}] CLEAR {name} ({sid}) - back to normal: {val}")
+                continue
+
+            alarm_msg = alarm_message(current, val, code, info['limits'])
+            if current == ALARM_FAULT:
+                lines.append(f"[{t_str}] FAULT {name} ({sid}) - {alarm_msg}")
+                self.notifications.send_alert(sid, name, f"Sensor Fault detected: {STATUS_LABELS[code]}", "FAULT",
+                                              info['type'])
+            else:
+                lines.append(f"[{t_str}] LIMIT {name} ({sid}) - {alarm_msg}")
+                self.notifications.send_alert(sid, name, f"Limit Exceeded: {val}", "LIMIT", info['type'])
+            self.alarm_states[sid] = alarm_msg
+        self.output.write("\n".join(lines) + "\n")
+        self.output.flush()
+
+    def status_line(self):
+        stats = self.stream_stats
+        alerts = self.notifications.stats()
+        return (f"Frames: {stats.get('frames', 0)} | Batches: {stats.get('batches', 0)} | "
+                f"Conflated: {stats.get('conflated', 0)} | Dropped: {stats.get('frames_dropped', 0)} | "
+                f"Lost: {stats.get('frames_lost', 0)} | Active alarms: {len(self.alarm_states)} | "
+                f"Alerts sent: {alerts['sent']} pending: {alerts['depth']} dropped: {alerts['dropped']}")
+
+    def _status(self, text):
+        if self.status_output is not None:
+            self.status_output.write(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] {text}\n")
+            self.status_output.flush()
+
+    def process_events(self, timeout):
+        """Handles queued client events for up to `timeout` seconds (returns early when idle)."""
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                kind, payload = self._events.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                return
+            if kind == "batch":
+                self.handle_batch(payload)
+                self.client.batch_delivered()
+            elif kind == "schema":
+                self.handle_schema(payload)
+            else:
+                self._status("CONNECTED" if payload else "DISCONNECTED")
+
+    def start(self):
+        """Starts receiving on a background thread."""
+        self._thread = threading.Thread(target=self.client.run, name="stream-client", daemon=True)
+        self._thread.start()
+
+    def run(self):
+        """Receives and monitors until stop() (or KeyboardInterrupt); then shuts down."""
+        if self._thread is None:
+            self.start()
+        next_status = time.monotonic() + self.status_interval
+        try:
+            while not self._stop_event.is_set():
+                self.process_events(POLL_INTERVAL)
+                self.notifications.poll()
+                if time.monotonic() >= next_status:
+                    next_status += self.status_interval
+                    self._status(self.status_line())
+        finally:
+            self.shutdown()
+
+    def stop(self):
+        """Makes run() return (safe from signal handlers and other threads)."""
+        self._stop_event.set()
+
+    def shutdown(self, timeout=2.0):
+        self.client.stop()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.notifications.close(timeout=timeout)
@@ -0,0 +1,70 @@
+import numpy as np
+
+class RingHistory:
+    """
+    Fixed-capacity (time, value) history backed by preallocated float64 arrays.
+
+    Every sample is written twice, at its slot and one capacity further on,
+    so the most recent samples are always one contiguous slice. window()
+    returns views into that slice, which can go straight to
+    PlotDataItem.setData() without building lists or copying.
+
+    Input: Capacity in samples (upper bound; the plotted window is chosen by time)
+    Output: (times, values) views from window()
+    """
+    def __init__(self, capacity):
+        self.capacity = max(1, int(capacity))
+        self._times = np.zeros(2 * self.capacity, dtype=np.float64)
+        self._values = np.zeros(2 * self.capacity, dtype=np.float64)
+        self.cursor = 0  # Next slot to write, in [0, capacity)
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def clear(self):
+        self.cursor = 0
+        self.size = 0
+
+    def append(self, timestamp, value):
+        cursor = self.cursor
+        self._times[cursor] = self._times[cursor + self.capacity] = timestamp
+        self._values[cursor] = self._values[cursor + self.capacity] = value
+        self.cursor = (cursor + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def extend(self, times, values):
+        """Appends arrays of samples (oldest first); only the last `capacity` are kept."""
+        count = len(times)
+        if count > self.capacity:
+            times = times[-self.capacity:]
+            values = values[-self.capacity:]
+            count = self.capacity
+        first = min(count, self.capacity - self.cursor)
+        self._write(self.cursor, times[:first], values[:first])
+        if count > first:
+            self._write(0, times[first:], values[first:])
+        self.cursor = (self.cursor + count) % self.capacity
+        self.size = min(self.size + count, self.capacity)
+
+    def _write(self, slot, times, values):
+        end = slot + len(times)
+        mirror = slot + self.capacity
+        self._times[slot:end] = times
+        self._times[mirror:mirror + len(times)] = times
+        self._values[slot:end] = values
+        self._values[mirror:mirror + len(values)] = values
+
+    def view(self):
+        """All stored samples, oldest first, as contiguous (times, values) views."""
+        end = self.cursor + self.capacity
+        start = end - self.size
+        return self._times[start:end], self._values[start:end]
+
+    def window(self, seconds):
+        """Samples within `seconds` of the newest one, as contiguous views."""
+        times, values = self.view()
+        if not self.size:
+            return times, values
+        first = np.searchsorted(times, times[-1] - seconds, side='left')
+        return times[first:], values[first:]
@@ -0,0 +1,145 @@
+import math
+import numpy as np
+
+# Stage Latency
+#
+# Every frame is timestamped along the pipeline: generated (frame timestamp)
+# and sent by the simulator, received and parsed by CommThread, rendered by
+# the Dashboard. The gaps between those timestamps are the stages below;
+# the simulator and the dashboard are expected to share a clock (same host
+# or NTP-synced). Event-loop lag is how late a periodic Qt timer fires.
+
+STAGE_SEND = "send"              # generated -> sent (simulator)
+STAGE_NETWORK = "network"        # sent -> received (socket)
+STAGE_PARSE = "parse"            # received -> parsed (decode + state update)
+STAGE_QUEUE = "queue"            # batch emitted -> handled on the GUI thread (Qt queue)
+STAGE_RENDER = "render"          # ingested -> drawn
+STAGE_END_TO_END = "end_to_end"  # generated -> drawn
+STAGE_EVENT_LOOP = "event_loop"  # Qt event-loop lag
+STAGES = (STAGE_SEND, STAGE_NETWORK, STAGE_PARSE, STAGE_QUEUE, STAGE_RENDER, STAGE_END_TO_END, STAGE_EVENT_LOOP)
+STAGE_LABELS = {
+    STAGE_SEND: "Generated → Sent",
+    STAGE_NETWORK: "Sent → Received",
+    STAGE_PARSE: "Received → Parsed",
+    STAGE_QUEUE: "Qt Queue",
+    STAGE_RENDER: "Ingested → Rendered",
+    STAGE_END_TO_END: "End to End",
+    STAGE_EVENT_LOOP: "Event-Loop Lag",
+}
+
+# Fixed log-spaced buckets: 10 per decade from 10 us to 100 s (~26% wide),
+# plus one underflow and one overflow bucket
+MIN_LATENCY = 1e-5
+BUCKETS_PER_DECADE = 10
+DECADES = 7
+BUCKET_COUNT = BUCKETS_PER_DECADE * DECADES + 2
+# Upper edge of every bucket in seconds (the overflow bucket is unbounded)
+BUCKET_EDGES = np.append(MIN_LATENCY * 10.0 ** (np.arange(BUCKET_COUNT - 1) / BUCKETS_PER_DECADE), np.inf)
+
+def format_latency(seconds):
+    """Short human-readable latency ("-" without samples)."""
+    if seconds is None:
+        return "-"
+    if seconds == float("inf"):
+        return f"> {BUCKET_EDGES[-2]:g} s"
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.0f} µs"
+    if seconds < 1.0:
+        return f"{seconds * 1e3:.1f} ms"
+    return f"{seconds:.2f} s"
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram over a rolling window.
+
+    record() only increments a preallocated counter, so sampling every frame
+    costs no allocation. Counts live in two windows: rotate() makes the
+    current window the previous one and starts a fresh one, so percentiles
+    always cover between one and two rotation periods of recent samples.
+
+    Input: None
+    Output: Percentiles in seconds from percentile(), sample count from count()
+    """
+    def __init__(self):
+        self.counts = np.zeros((2, BUCKET_COUNT), dtype=np.int64)
+        self.current = 0
+        self.total = 0    # All samples since creation (not windowed)
+        self.max = 0.0    # Largest sample in the current window
+
+    def record(self, seconds):
+        if seconds < MIN_LATENCY:
+            bucket = 0
+        else:
+            bucket = min(int(math.log10(seconds / MIN_LATENCY) * BUCKETS_PER_DECADE) + 1, BUCKET_COUNT - 1)
+        self.counts[self.current, bucket] += 1
+        self.total += 1
+        if seconds > self.max:
+            self.max = seconds
+
+    def rotate(self):
+        self.current ^= 1
+        self.counts[self.current].fill(0)
+        self.max = 0.0
+
+    def count(self):
+        """Samples in the rolling window."""
+        return int(self.counts.sum())
+
+    def percentile(self, q):
+        """
+        Upper bucket edge below which q percent of the windowed samples fall.
+
+        Input: Percentile in [0, 100]
+        Output: Seconds, inf when it lies in the overflow bucket, None without samples
+        """
+        cumulative = np.cumsum(self.counts.sum(axis=0))
+        if not cumulative[-1]:
+            return None
+        bucket = int(np.searchsorted(cumulative, cumulative[-1] * q / 100.0, side='left'))
+        return float(BUCKET_EDGES[bucket])
+
+class LatencyMonitor:
+    """
+    Per-stage latency histograms plus sequence-gap accounting for one stream.
+
+    Each stage is written by a single thread (the first three by CommThread,
+    the rest by the GUI thread) and read by the GUI thread for display.
+
+    Input: None
+    Output: Histograms per stage, frames_lost / gaps counters, summary()
+    """
+    def __init__(self):
+        self.histograms = {stage: LatencyHistogram() for stage in STAGES}
+        self.reset_sequence()
+        self.frames_lost = 0  # Sequence numbers never received
+        self.gaps = 0         # Runs of missing sequence numbers
+
+    def record(self, stage, seconds):
+        self.histograms[stage].record(seconds)
+
+    def reset_sequence(self):
+        """Forgets the last sequence number (new connection or schema)."""
+        self.last_seq = None
+
+    def observe_seq(self, seq):
+        """Counts frames missing between the previous sequence number and seq (0 = unnumbered)."""
+        if not seq:
+            return
+        last = self.last_seq
+        if last is not None and seq > last + 1:
+            self.frames_lost += seq - last - 1
+            self.gaps += 1
+        self.last_seq = seq
+
+    def rotate(self):
+        for histogram in self.histograms.values():
+            histogram.rotate()
+
+    def summary(self, percentiles=(50, 95, 99)):
+        """{stage: {"p50": s, "p95": s, "p99": s, "count": n}} over the rolling window."""
+        result = {}
+        for stage, histogram in self.histograms.items():
+            row = {f"p{q}": histogram.percentile(q) for q in percentiles}
+            row["count"] = histogram.count()
+            result[stage] = row
+        return result
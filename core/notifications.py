@@ -1,28 +1,128 @@
 import os
 import time
+import queue
 import logging
 import smtplib
-from dotenv import load_dotenv
-from PyQt6.QtWidgets import QSystemTrayIcon, QStyle, QApplication
-from PyQt6.QtGui import QIcon
+import threading
+from collections import deque
 from email.mime.text import MIMEText
-from twilio.rest import Client
 
-# Load environment variables from .env file if present
-load_dotenv()
+def _find_env_file():
+    """Nearest .env in this package's directory or above (where load_dotenv() would look)."""
+    directory = os.path.dirname(os.path.abspath(__file__))
+    while True:
+        path = os.path.join(directory, ".env")
+        if os.path.isfile(path):
+            return path
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return None
+        directory = parent
+
+# Load environment variables from .env file if present (python-dotenv is only imported then)
+_ENV_FILE = _find_env_file()
+if _ENV_FILE:
+    from dotenv import load_dotenv
+    load_dotenv(_ENV_FILE)
+
+# Background delivery defaults
+DELIVERY_WORKERS = 2        # Threads sending email/SMS
+DELIVERY_QUEUE_SIZE = 1000  # Pending deliveries before new ones are dropped
+DELIVERY_RETRIES = 3        # Extra attempts after a failed delivery
+DELIVERY_BACKOFF = 1.0      # Seconds before the first retry, doubled for each further one
+DELIVERY_BACKOFF_MAX = 30.0
+WORKER_POLL_INTERVAL = 0.1  # Seconds an idle worker waits for a job before checking for close()
+
+# Digest defaults: non-urgent alerts are summarized per window, FAULTs escalate immediately
+# up to a budget per window, so an alert storm costs a bounded number of messages
+DIGEST_WINDOW = float(os.environ.get("ALERT_DIGEST_WINDOW", 10.0))  # Seconds
+MAX_IMMEDIATE = int(os.environ.get("ALERT_MAX_IMMEDIATE", 3))        # Immediate FAULTs per window
+DIGEST_LINES_PER_GROUP = 20  # Sensors listed per (level, type) group in a digest email
+
+class SMTPSession:
+    """
+    One persistent SMTP connection, opened on first use and reused.
+
+    A dropped connection (server idle timeout, network error) is reopened
+    once within the same send before the error is passed on.
+
+    Input: Email config dict (server, port, sender, password, use_tls)
+    Output: None (send() raises on failure)
+    """
+    def __init__(self, config, timeout=10.0):
+        self.config = config
+        self.timeout = timeout
+        self.server = None
+        self.connects = 0
+
+    def _connect(self):
+        server = smtplib.SMTP(self.config["smtp_server"], self.config["smtp_port"], timeout=self.timeout)
+        try:
+            if self.config.get("use_tls", True):
+                server.starttls()
+            if self.config["password"]:
+                server.login(self.config["sender"], self.config["password"])
+        except Exception:
+            server.close()
+            raise
+        self.server = server
+        self.connects += 1
+
+    def send(self, msg):
+        for attempt in range(2):
+            if self.server is None:
+                self._connect()
+            try:
+                self.server.send_message(msg)
+                return
+            except (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError):
+                # Stale connection: reconnect once, then give up to the caller's retry
+                self.close()
+                if attempt:
+                    raise
+
+    def close(self):
+        if self.server is not None:
+            try:
+                self.server.quit()
+            except (smtplib.SMTPException, OSError):
+                self.server.close()
+            self.server = None
 
 class NotificationManager:
     """
     Manages multi-channel notifications (Email, SMS, Desktop).
     
-    Input: Optional parent widget for system tray integration
-    Output: None
+    Desktop notifications are shown on the calling (GUI) thread. Email and
+    SMS deliveries are put on a bounded queue and sent by worker threads
+    over a persistent SMTP session per worker and one shared SMS client,
+    with retries and exponential backoff, so a slow mail server never
+    blocks the caller. When the queue is full new deliveries are dropped
+    and counted.
+
+    Alerts are grouped into a digest per window (by level and sensor type)
+    and sent as one summary per channel; only FAULTs escalate immediately,
+    up to max_immediate per window.
+
+    Input: Optional parent widget for system tray integration (None = no Qt), worker count,
+           queue size, retries per delivery, first retry delay (s), digest
+           window (s), immediate FAULT alerts per window
+    Output: None (delivery counters from stats())
     """
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, workers=DELIVERY_WORKERS, queue_size=DELIVERY_QUEUE_SIZE,
+                 max_retries=DELIVERY_RETRIES, backoff=DELIVERY_BACKOFF, digest_window=DIGEST_WINDOW,
+                 max_immediate=MAX_IMMEDIATE):
         self.parent = parent
-        self.tray_icon = None
+        self.tray_icon = None  # Created with the first desktop notification (keeps startup fast)
         self.last_alert_time = {} # {sensor_id: timestamp}
         self.cooldown = 10.0 # Cooldown in seconds
+
+        # Digest: {(level, sensor_type): {sensor_id: (name, message, time, count)}}
+        self.digest_window = digest_window
+        self.max_immediate = max_immediate
+        self._digest = {}
+        self._digest_start = None
+        self._escalations = deque()  # Times of immediate FAULT alerts in the current window
         
         # Email Configuration from Environment Variables
         self.email_config = {
@@ -31,7 +131,8 @@ class NotificationManager:
             "password": os.environ.get("EMAIL_PASSWORD", ""),
             "recipients": os.environ.get("EMAIL_RECIPIENTS", "recipient@example.com").split(","),
             "smtp_server": os.environ.get("EMAIL_SMTP_SERVER", "smtp.gmail.com"),
-            "smtp_port": int(os.environ.get("EMAIL_SMTP_PORT", 587))
+            "smtp_port": int(os.environ.get("EMAIL_SMTP_PORT", 587)),
+            "use_tls": os.environ.get("EMAIL_USE_TLS", "True").lower() == "true"
         }
         
         # SMS Configuration from Environment Variables
@@ -42,12 +143,28 @@ class NotificationManager:
             "from": os.environ.get("SMS_TWILIO_FROM", "+1234567890"),
             "to": os.environ.get("SMS_TWILIO_TO", "+0987654321")
         }
-        
-        self._setup_tray()
+
+        # Email and SMS go out on worker threads; the caller (GUI thread) only enqueues
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._stop_event = threading.Event()
+        self._sms_client = None  # Twilio client, created once and shared by the workers
+        self._sms_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._dropping = False
+        self.metrics = {"queued": 0, "sent": 0, "failed": 0, "retries": 0, "dropped": 0, "max_depth": 0,
+                        "digests": 0}
+        self._workers = [threading.Thread(target=self._worker, name=f"alert-delivery-{i}", daemon=True)
+                         for i in range(workers)]
+        for worker in self._workers:
+            worker.start()
 
     def _setup_tray(self):
-        # Setup System Tray Icon for Desktop Notifications
+        # Setup System Tray Icon for Desktop Notifications (Qt is only loaded with a parent
+        # widget, so the headless monitor runs without it)
         if self.parent:
+            from PyQt6.QtWidgets import QSystemTrayIcon, QStyle
             self.tray_icon = QSystemTrayIcon(self.parent)
             # Use the window icon if available, or a fallback
             icon = self.parent.windowIcon()
@@ -56,10 +173,15 @@ class NotificationManager:
             self.tray_icon.setIcon(icon)
             self.tray_icon.setVisible(True)
 
-    def send_alert(self, sensor_id, sensor_name, message, level="WARNING"):
+    def send_alert(self, sensor_id, sensor_name, message, level="WARNING", sensor_type=None):
         """
         Triggers notifications across all channels if cooldown passed.
         level: "FAULT" or "LIMIT"
+
+        FAULT alerts go out immediately while the escalation budget of the
+        current digest window lasts; everything else (and faults beyond the
+        budget) is collected into the digest, sent by poll() as one summary
+        per channel.
         """
         now = time.time()
         last = self.last_alert_time.get(sensor_id, 0)
@@ -69,6 +191,81 @@ class NotificationManager:
             return 
             
         self.last_alert_time[sensor_id] = now
+        self.poll(now)
+
+        # Immediate escalation: at most max_immediate per digest window
+        while self._escalations and now - self._escalations[0] >= self.digest_window:
+            self._escalations.popleft()
+        if level == "FAULT" and len(self._escalations) < self.max_immediate:
+            self._escalations.append(now)
+            self._dispatch(*self._format_alert(sensor_id, sensor_name, message, level, now))
+            return
+
+        if self._digest_start is None:
+            self._digest_start = now
+        group = self._digest.setdefault((level, sensor_type or "Unknown"), {})
+        # Repeats of a sensor within the window keep its latest message
+        _, _, _, count = group.get(sensor_id, (None, None, None, 0))
+        group[sensor_id] = (sensor_name, message, now, count + 1)
+
+    def poll(self, now=None):
+        """Sends the digest once its window has elapsed. Call regularly (e.g. from a GUI timer)."""
+        now = time.time() if now is None else now
+        if self._digest_start is not None and now - self._digest_start >= self.digest_window:
+            self.flush_digest(now)
+
+    def flush_digest(self, now=None):
+        """
+        Sends everything collected so far as one message per channel.
+
+        Input: Optional current time
+        Output: Number of sensor alerts summarized (0 if the digest was empty)
+        """
+        now = time.time() if now is None else now
+        digest, self._digest = self._digest, {}
+        started, self._digest_start = self._digest_start, None
+        entries = [(level, sensor_type, sid, entry) for (level, sensor_type), group in digest.items()
+                   for sid, entry in group.items()]
+        if not entries:
+            return 0
+        if len(entries) == 1:
+            # A lone alert keeps the regular format
+            level, _, sid, (name, message, at, _) = entries[0]
+            self._dispatch(*self._format_alert(sid, name, message, level, at))
+            return 1
+
+        # Faults first, then the largest groups
+        groups = sorted(digest.items(), key=lambda item: (item[0][0] != "FAULT", -len(item[1]), item[0]))
+        start_str = time.strftime("%H:%M:%S", time.localtime(started))
+        end_str = time.strftime("%H:%M:%S", time.localtime(now))
+        sensors = len(entries)
+        subject = f"Smart Factory Alert Digest: {sensors} sensors"
+        lines = [
+            "SMART FACTORY ALERT DIGEST",
+            "--------------------------------------------------",
+            f"Window:     {start_str} - {end_str}",
+            f"Sensors:    {sensors}",
+            "",
+        ]
+        for (level, sensor_type), group in groups:
+            lines.append(f"[{level}] {sensor_type}: {len(group)} sensors")
+            for sid, (name, message, _, count) in list(group.items())[:DIGEST_LINES_PER_GROUP]:
+                repeat = f" (x{count})" if count > 1 else ""
+                lines.append(f"  {name} ({sid}): {message}{repeat}")
+            if len(group) > DIGEST_LINES_PER_GROUP:
+                lines.append(f"  ... and {len(group) - DIGEST_LINES_PER_GROUP} more")
+            lines.append("")
+        lines += ["--------------------------------------------------", "Please take immediate action."]
+        summary = ", ".join(f"{level}/{sensor_type} {len(group)}" for (level, sensor_type), group in groups)
+        short_msg = f"[DIGEST] {sensors} sensors: {summary}"
+        if any(level == "FAULT" for level, _ in digest):
+            subject += " (FAULT)"
+        self._dispatch(subject, "\n".join(lines), short_msg)
+        self._count("digests")
+        return sensors
+
+    def _format_alert(self, sensor_id, sensor_name, message, level, now):
+        """Builds (subject, email body, short message) for a single alert."""
         timestamp_str = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
         
         # Professional Message Format
@@ -89,7 +286,9 @@ class NotificationManager:
         
         # Short format for SMS/Desktop Title
         short_msg = f"[{level}] {sensor_name}: {message}"
-        
+        return subject, full_msg, short_msg
+
+    def _dispatch(self, subject, full_msg, short_msg):
         # 1. Desktop Notification (Title + Short Msg)
         self._send_desktop(subject, short_msg)
         
@@ -100,7 +299,10 @@ class NotificationManager:
         self._send_sms(short_msg)
         
     def _send_desktop(self, title, message):
+        if self.tray_icon is None:
+            self._setup_tray()
         if self.tray_icon:
+            from PyQt6.QtWidgets import QSystemTrayIcon
             # Map level to standard icon type
             icon_type = QSystemTrayIcon.MessageIcon.Warning
             if "FAULT" in title:
@@ -109,36 +311,127 @@ class NotificationManager:
             self.tray_icon.showMessage(title, message, icon_type, 5000)
 
     def _send_email(self, subject, body):
-        if not self.email_config["enabled"]:
-            print(f"[MOCK EMAIL] To: {self.email_config['recipients']} | Sub: {subject} | Body: {body}")
+        self._enqueue(self._deliver_email, subject, body)
+
+    def _send_sms(self, body):
+        self._enqueue(self._deliver_sms, body)
+
+    def _enqueue(self, deliver, *args):
+        """Queues a delivery without blocking; drops it if the queue is full."""
+        try:
+            self._queue.put_nowait((deliver, args))
+        except queue.Full:
+            self._count("dropped")
+            if not self._dropping:
+                # Once per overflow, not once per dropped delivery
+                logging.warning(f"Alert queue full ({self._queue.maxsize} pending); dropping deliveries")
+                self._dropping = True
             return
+        self._dropping = False
+        depth = self._queue.qsize()
+        with self._stats_lock:
+            self.metrics["queued"] += 1
+            self.metrics["max_depth"] = max(self.metrics["max_depth"], depth)
+
+    def _count(self, key):
+        with self._stats_lock:
+            self.metrics[key] += 1
+
+    def stats(self):
+        """Delivery counters plus the current queue depth."""
+        with self._stats_lock:
+            stats = dict(self.metrics)
+        stats["depth"] = self._queue.qsize()
+        return stats
 
+    def _worker(self):
+        # Each worker keeps its own SMTP connection open between alerts
+        smtp = SMTPSession(self.email_config)
         try:
-            msg = MIMEText(body)
-            msg['Subject'] = subject
-            msg['From'] = self.email_config["sender"]
-            msg['To'] = ", ".join(self.email_config["recipients"])
+            # Stopped by close() through the event, so a full queue cannot keep a worker alive
+            while not self._stop_event.is_set():
+                try:
+                    job = self._queue.get(timeout=WORKER_POLL_INTERVAL)
+                except queue.Empty:
+                    continue
+                deliver, args = job
+                try:
+                    self._deliver_with_retry(deliver, smtp, args)
+                finally:
+                    self._queue.task_done()
+        finally:
+            smtp.close()
 
-            with smtplib.SMTP(self.email_config["smtp_server"], self.email_config["smtp_port"]) as server:
-                server.starttls()
-                server.login(self.email_config["sender"], self.email_config["password"])
-                server.send_message(msg)
-                print("Email Sent Successfully")
-        except Exception as e:
-            print(f"Email Failed: {e}")
+    def _deliver_with_retry(self, deliver, smtp, args):
+        delay = self.backoff
+        for attempt in range(self.max_retries + 1):
+            try:
+                deliver(smtp, *args)
+                self._count("sent")
+                return
+            except Exception as e:
+                if attempt == self.max_retries or self._stop_event.is_set():
+                    self._count("failed")
+                    print(f"{deliver.__name__} failed after {attempt + 1} attempts: {e}")
+                    return
+                self._count("retries")
+                # Backoff; close() cuts it short
+                if self._stop_event.wait(delay):
+                    self._count("failed")
+                    return
+                delay = min(delay * 2, DELIVERY_BACKOFF_MAX)
 
-    def _send_sms(self, body):
+    def _deliver_email(self, smtp, subject, body):
+        if not self.email_config["enabled"]:
+            print(f"[MOCK EMAIL] To: {self.email_config['recipients']} | Sub: {subject} | Body: {body}")
+            return
+
+        msg = MIMEText(body)
+        msg['Subject'] = subject
+        msg['From'] = self.email_config["sender"]
+        msg['To'] = ", ".join(self.email_config["recipients"])
+        smtp.send(msg)
+        print("Email Sent Successfully")
+
+    def _deliver_sms(self, smtp, body):
         if not self.sms_config["enabled"]:
-             print(f"[MOCK SMS] To: {self.sms_config['to']} | Msg: {body}")
-             return
-             
-        try:
-            client = Client(self.sms_config['sid'], self.sms_config['token'])
-            message = client.messages.create(
-                body=body,
-                from_=self.sms_config['from'],
-                to=self.sms_config['to']
-            )
-            print(f"SMS Sent Successfully. SID: {message.sid}")
-        except Exception as e:
-            print(f"SMS Failed: {e}")
+            print(f"[MOCK SMS] To: {self.sms_config['to']} | Msg: {body}")
+            return
+
+        with self._sms_lock:
+            if self._sms_client is None:
+                # Twilio is only imported once SMS is enabled and used (slow import)
+                from twilio.rest import Client
+                self._sms_client = Client(self.sms_config['sid'], self.sms_config['token'])
+        message = self._sms_client.messages.create(
+            body=body,
+            from_=self.sms_config['from'],
+            to=self.sms_config['to']
+        )
+        print(f"SMS Sent Successfully. SID: {message.sid}")
+
+    def flush(self, timeout=None):
+        """Waits until every queued delivery was attempted. Returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def close(self, timeout=5.0):
+        """
+        Sends the pending digest, delivers what is queued, then stops the workers.
+
+        Input: Seconds the whole shutdown may take (None = wait for every delivery)
+        Output: None; deliveries still queued or in flight at the deadline are abandoned
+                (the workers are daemon threads)
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        self.flush_digest()
+        self.flush(timeout)
+        self._stop_event.set()
+        for worker in self._workers:
+            worker.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
@@ -0,0 +1,367 @@
+import json
+import time
+import struct
+import numpy as np
+
+# Wire Protocol
+#
+# On connect the simulator sends one JSON "schema" message with the static
+# sensor metadata (IDs, names, types, units, limits). Data frames after that
+# are positional: values and status codes in schema order.
+#
+# In delta mode most frames only carry the sensors that changed: an
+# "indices" list (positions in schema order) next to their values and status
+# codes. Frames without indices are full keyframes.
+#
+# Sensors with a "sample_rate" (Hz) in the schema sample faster than the
+# frame rate. Their samples since the previous frame travel as a burst block:
+# sensor positions, a sample count per sensor and all samples concatenated,
+# oldest first. The last sample of a sensor is taken at the frame timestamp,
+# the others 1 / sample_rate apart before it. "values" still carries every
+# sensor's latest reading, so clients that ignore bursts keep working.
+#
+# Frames may carry the time the simulator handed them to the sockets
+# ("sent"), next to the generation time in "timestamp", so clients can
+# tell simulator delay from transport delay.
+#
+# JSON (default / fallback): one JSON object per line, UTF-8.
+#   {"type": "data", "seq": n, "timestamp": t, "values": [...], "statuses": [...]}
+#   {"type": "data", "seq": n, "timestamp": t, "indices": [...], "values": [...], "statuses": [...]}
+#   optional "samples": {"indices": [...], "counts": [...], "values": [...]}
+#   optional "sent": t
+# Binary (negotiated with the SET_PROTOCOL command): length-prefixed frames
+#   header  = magic, version, message type, flags, payload length,
+#             sequence number, frame timestamp, entry count
+#   MSG_DATA payload  = float32[count] values, uint8[count] status codes
+#   MSG_DELTA payload = uint32[count] indices, float32[count] values, uint8[count] status codes
+#   either payload may be followed by a burst block:
+#     uint32 sensors, uint32[sensors] positions, uint32[sensors] counts, float32[sum(counts)] samples
+#   with FLAG_SENT, the payload ends with a float64 sent time
+# Command acks are always JSON lines, so both kinds can share one stream.
+
+PROTOCOL_JSON = "json"
+PROTOCOL_BINARY = "binary"
+PROTOCOLS = (PROTOCOL_JSON, PROTOCOL_BINARY)
+
+# Status codes carried in the binary status array (index into STATUS_LABELS)
+STATUS_OK = 0
+STATUS_FAULT = 1
+STATUS_LABELS = ("OK", "Faulty Sensor")
+STATUS_CODES = {label: code for code, label in enumerate(STATUS_LABELS)}
+
+# JSON message types
+MSG_TYPE_SCHEMA = "schema"
+MSG_TYPE_DATA = "data"
+
+# 0xA5 can never start a JSON line, so it tells binary frames apart
+FRAME_MAGIC = b"\xa5"
+FRAME_VERSION = 1
+MSG_DATA = 1
+MSG_DELTA = 2
+FRAME_HEADER = struct.Struct("<cBBBIIdI")
+BURST_HEADER = struct.Struct("<I")
+SENT_TRAILER = struct.Struct("<d")
+# Header flags
+FLAG_SENT = 0x01
+
+class SensorFrame:
+    """
+    One tick of readings in positional order.
+
+    Input: Sequence number, frame timestamp, values array, status code array,
+           optional positions of the entries (None for a full keyframe),
+           optional burst (positions, counts, samples) for fast sensors,
+           optional time the simulator sent the frame
+    Output: None (plain container shared by the simulator and the client)
+    """
+    def __init__(self, seq, timestamp, values, status, indices=None, burst=None, sent=None):
+        self.seq = seq
+        self.timestamp = timestamp
+        self.values = values
+        self.status = status
+        self.indices = indices
+        self.burst = burst
+        self.sent = sent
+
+    @property
+    def is_keyframe(self):
+        return self.indices is None
+
+    @classmethod
+    def from_readings(cls, seq, readings):
+        """Builds a frame from the legacy {sid: reading} dict."""
+        values = np.fromiter((r['value'] for r in readings.values()), dtype=np.float64, count=len(readings))
+        status = np.fromiter((STATUS_CODES.get(r['status'], STATUS_FAULT) for r in readings.values()),
+                             dtype=np.uint8, count=len(readings))
+        timestamp = max((r['timestamp'] for r in readings.values()), default=0.0)
+        return cls(seq, timestamp, values, status)
+
+    def to_readings(self, sensor_ids):
+        """Expands the frame into {sid: {value, status, timestamp}} for the dashboard."""
+        timestamp = self.timestamp
+        # Same 2-decimal precision as the JSON frames (undoes float32 noise)
+        values = np.round(self.values.astype(np.float64), 2).tolist()
+        if self.indices is not None:
+            sensor_ids = [sensor_ids[i] for i in np.asarray(self.indices).tolist()]
+        return {
+            sid: {"value": val, "status": STATUS_LABELS[code], "timestamp": timestamp}
+            for sid, val, code in zip(sensor_ids, values, self.status.tolist())
+        }
+
+def build_schema(sensor_config):
+    """Builds the connect-time schema message from a SENSOR_CONFIG-style dict."""
+    sensors = []
+    for sid, info in sensor_config.items():
+        sensor = {"id": sid, "name": info['name'], "type": info['type'], "unit": info['unit'],
+                  "limits": list(info['limits'])}
+        if 'sample_rate' in info:
+            sensor["sample_rate"] = info['sample_rate']
+        sensors.append(sensor)
+    return {"type": MSG_TYPE_SCHEMA, "sensors": sensors, "status_labels": list(STATUS_LABELS)}
+
+def schema_to_config(schema):
+    """Turns a received schema message back into a SENSOR_CONFIG-style dict keyed by ID."""
+    config = {}
+    for sensor in schema["sensors"]:
+        info = {"name": sensor["name"], "type": sensor["type"], "unit": sensor["unit"],
+                "limits": tuple(sensor["limits"])}
+        if "sample_rate" in sensor:
+            info["sample_rate"] = sensor["sample_rate"]
+        config[sensor["id"]] = info
+    return config
+
+def sample_rates(sensor_config):
+    """Per-sensor sample rate in Hz, in config order (0 = one sample per frame)."""
+    return np.array([info.get('sample_rate', 0.0) for info in sensor_config.values()], dtype=np.float64)
+
+def encode_json(message):
+    """Encodes a JSON message as one newline-terminated line."""
+    return (json.dumps(message) + "\n").encode('utf-8')
+
+def encode_json_frame(frame):
+    """Encodes a SensorFrame (keyframe or delta) as a positional JSON data line."""
+    message = {"type": MSG_TYPE_DATA, "seq": frame.seq, "timestamp": frame.timestamp}
+    if frame.indices is not None:
+        message["indices"] = np.asarray(frame.indices).tolist()
+    message["values"] = np.asarray(frame.values).tolist()
+    message["statuses"] = np.asarray(frame.status).tolist()
+    if frame.burst is not None:
+        positions, counts, samples = frame.burst
+        message["samples"] = {"indices": np.asarray(positions).tolist(), "counts": np.asarray(counts).tolist(),
+                              "values": np.round(np.asarray(samples, dtype=np.float64), 4).tolist()}
+    if frame.sent is not None:
+        message["sent"] = frame.sent
+    return encode_json(message)
+
+def decode_json_message(message):
+    """Converts positional JSON data lines into SensorFrame; other messages pass through."""
+    if isinstance(message, dict) and message.get("type") == MSG_TYPE_DATA:
+        indices = message.get("indices")
+        samples = message.get("samples")
+        burst = None
+        if samples is not None:
+            burst = (np.asarray(samples["indices"], dtype=np.uint32), np.asarray(samples["counts"], dtype=np.uint32),
+                     np.asarray(samples["values"], dtype=np.float64))
+        return SensorFrame(message["seq"], message["timestamp"],
+                           np.asarray(message["values"], dtype=np.float64),
+                           np.asarray(message["statuses"], dtype=np.uint8),
+                           None if indices is None else np.asarray(indices, dtype=np.uint32), burst,
+                           message.get("sent"))
+    return message
+
+def encode_binary_frame(frame):
+    """Packs a SensorFrame into a length-prefixed binary data (or delta) frame."""
+    count = len(frame.values)
+    parts = []
+    if frame.indices is None:
+        msg_type = MSG_DATA
+    else:
+        msg_type = MSG_DELTA
+        parts.append(np.asarray(frame.indices, dtype=np.uint32).tobytes())
+    parts.append(np.asarray(frame.values, dtype=np.float32).tobytes())
+    parts.append(np.asarray(frame.status, dtype=np.uint8).tobytes())
+    if frame.burst is not None:
+        positions, counts, samples = frame.burst
+        parts.append(BURST_HEADER.pack(len(positions)))
+        parts.append(np.asarray(positions, dtype=np.uint32).tobytes())
+        parts.append(np.asarray(counts, dtype=np.uint32).tobytes())
+        parts.append(np.asarray(samples, dtype=np.float32).tobytes())
+    flags = 0
+    if frame.sent is not None:
+        flags |= FLAG_SENT
+        parts.append(SENT_TRAILER.pack(frame.sent))
+    length = sum(len(part) for part in parts)
+    header = FRAME_HEADER.pack(FRAME_MAGIC, FRAME_VERSION, msg_type, flags, length, frame.seq, frame.timestamp,
+                               count)
+    return b"".join([header] + parts)
+
+def decode_binary_frame(header_fields, payload):
+    """Unpacks a binary data or delta frame payload into a SensorFrame of NumPy views."""
+    _, _, msg_type, flags, _, seq, timestamp, count = header_fields
+    indices = None
+    offset = 0
+    end = len(payload)
+    sent = None
+    if flags & FLAG_SENT:
+        end -= SENT_TRAILER.size
+        sent, = SENT_TRAILER.unpack_from(payload, end)
+    if msg_type == MSG_DELTA:
+        indices = np.frombuffer(payload, dtype=np.uint32, count=count)
+        offset = count * 4
+    values = np.frombuffer(payload, dtype=np.float32, count=count, offset=offset)
+    status = np.frombuffer(payload, dtype=np.uint8, count=count, offset=offset + count * 4)
+    offset += count * 5
+
+    burst = None
+    if end > offset:
+        # Burst block of the fast sensors
+        sensors, = BURST_HEADER.unpack_from(payload, offset)
+        offset += BURST_HEADER.size
+        positions = np.frombuffer(payload, dtype=np.uint32, count=sensors, offset=offset)
+        counts = np.frombuffer(payload, dtype=np.uint32, count=sensors, offset=offset + sensors * 4)
+        samples = np.frombuffer(payload, dtype=np.float32, count=int(counts.sum()), offset=offset + sensors * 8)
+        burst = (positions, counts, samples)
+    return SensorFrame(seq, timestamp, values, status, indices, burst, sent)
+
+# Receive buffer sizing
+RECV_SIZE = 262144              # Bytes requested per recv_into()
+MAX_MESSAGE_BYTES = 64 << 20    # Anything larger is treated as stream corruption
+
+class FrameDecoder:
+    """
+    Incremental parser for the simulator stream.
+
+    Bytes are received straight into one reusable bytearray. Complete JSON
+    lines and binary frames are parsed in place; a partial message stays in
+    the buffer and is only moved to the front when the tail runs out of room.
+    Newline scanning resumes where it stopped, so a large JSON frame arriving
+    in many chunks is scanned once, not once per chunk.
+
+    Input: Raw chunks via feed(), or a socket via receive()
+    Output: List of decoded messages: dicts for JSON lines, SensorFrame objects
+            for data frames (binary or JSON)
+    """
+    def __init__(self, capacity=RECV_SIZE * 4, max_message_bytes=MAX_MESSAGE_BYTES):
+        self.buffer = bytearray(capacity)
+        self.start = 0   # First unconsumed byte
+        self.end = 0     # End of received data
+        self._scan = 0   # Where the next newline search resumes
+        self.max_message_bytes = max_message_bytes
+
+        # Counters
+        self.bytes_received = 0
+        self.frames_decoded = 0
+        self.frames_dropped = 0
+        self.bytes_dropped = 0
+        # Wall-clock time of the latest receive()/feed(), i.e. when its messages arrived
+        self.received_at = 0.0
+
+    def stats(self):
+        return {
+            "bytes_received": self.bytes_received,
+            "frames_decoded": self.frames_decoded,
+            "frames_dropped": self.frames_dropped,
+            "bytes_dropped": self.bytes_dropped,
+        }
+
+    def reset(self):
+        """Discards any partial message (e.g. after a reconnect); counters are kept."""
+        self.bytes_dropped += self.end - self.start
+        self.start = self.end = self._scan = 0
+
+    def receive(self, sock, size=RECV_SIZE):
+        """
+        Reads once from a socket directly into the buffer and decodes it.
+
+        Input: Connected socket, max bytes to read
+        Output: List of decoded messages, or None on EOF
+        """
+        self._reserve(size)
+        with memoryview(self.buffer) as view:
+            nbytes = sock.recv_into(view[self.end:self.end + size])
+        if not nbytes:
+            return None
+        self.received_at = time.time()
+        self.end += nbytes
+        self.bytes_received += nbytes
+        return self._decode()
+
+    def feed(self, data):
+        """Appends a chunk of bytes and decodes every complete message."""
+        nbytes = len(data)
+        self._reserve(nbytes)
+        self.buffer[self.end:self.end + nbytes] = data
+        self.received_at = time.time()
+        self.end += nbytes
+        self.bytes_received += nbytes
+        return self._decode()
+
+    def _reserve(self, nbytes):
+        """Makes room for nbytes after self.end, compacting before growing."""
+        if len(self.buffer) - self.end >= nbytes:
+            return
+        if self.start:
+            pending = self.end - self.start
+            self.buffer[:pending] = self.buffer[self.start:self.end]
+            self._scan -= self.start
+            self.start, self.end = 0, pending
+        if len(self.buffer) - self.end < nbytes:
+            grow = max(len(self.buffer), self.end + nbytes - len(self.buffer))
+            self.buffer.extend(bytes(grow))
+
+    def _drop(self, nbytes):
+        self.frames_dropped += 1
+        self.bytes_dropped += nbytes
+        self.start += nbytes
+
+    def _decode(self):
+        buf = self.buffer
+        messages = []
+        while self.start < self.end:
+            if buf[self.start] == FRAME_MAGIC[0]:
+                if self.end - self.start < FRAME_HEADER.size:
+                    break
+                fields = FRAME_HEADER.unpack_from(buf, self.start)
+                length = fields[4]
+                if length > self.max_message_bytes:
+                    # Corrupt header: skip the magic byte and resynchronise
+                    self._drop(1)
+                    continue
+                body = self.start + FRAME_HEADER.size
+                frame_end = body + length
+                if self.end < frame_end:
+                    break  # Partial frame, wait for more bytes
+                if fields[1] == FRAME_VERSION and fields[2] in (MSG_DATA, MSG_DELTA):
+                    # One copy of the payload; the frame's arrays are views into it
+                    try:
+                        messages.append(decode_binary_frame(fields, bytes(buf[body:frame_end])))
+                    except (struct.error, ValueError):
+                        self._drop(frame_end - self.start)  # Payload shorter than its counts claim
+                        continue
+                    self.frames_decoded += 1
+                    self.start = frame_end
+                else:
+                    self._drop(frame_end - self.start)
+            else:
+                newline = buf.find(b"\n", max(self._scan, self.start), self.end)
+                if newline == -1:
+                    self._scan = self.end
+                    if self.end - self.start > self.max_message_bytes:
+                        self._drop(self.end - self.start)
+                    break
+                line = buf[self.start:newline]
+                line_start = self.start
+                self.start = newline + 1
+                if not line.strip():
+                    continue
+                try:
+                    messages.append(decode_json_message(json.loads(line)))
+                    self.frames_decoded += 1
+                except (json.JSONDecodeError, UnicodeDecodeError, KeyError, TypeError, ValueError):
+                    self.frames_dropped += 1
+                    self.bytes_dropped += newline + 1 - line_start
+
+        if self.start == self.end:
+            # Everything consumed: rewind for free instead of compacting later
+            self.start = self.end = self._scan = 0
+        return messages
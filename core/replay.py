@@ -0,0 +1,139 @@
+import re
+import json
+import numpy as np
+from core.protocol import (MSG_TYPE_SCHEMA, SensorFrame, encode_json, encode_json_frame,
+                           decode_json_message, schema_to_config)
+
+# Recording Format
+#
+# A recording is a newline-delimited JSON file: the schema message first,
+# then one positional keyframe per tick in the same layout as the JSON wire
+# protocol. Frames are always stored in full, so playback can start at any
+# line.
+
+# Frame timestamps are read from the line prefix when indexing a file
+_TIMESTAMP = re.compile(rb'"timestamp":\s*(-?[0-9.eE+-]+)')
+
+class FrameRecorder:
+    """
+    Writes the frames a simulator generates to a recording file.
+
+    Input: Output path, schema message of the session
+    Output: Newline-delimited JSON recording readable by ReplaySource
+    """
+    def __init__(self, path, schema):
+        self.path = path
+        self.file = open(path, 'wb')
+        self.file.write(encode_json(schema))
+        self.frames = 0
+
+    def write(self, frame):
+        """Appends one full frame (deltas cannot be replayed from an arbitrary point)."""
+        self.file.write(encode_json_frame(frame))
+        self.frames += 1
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+class ReplaySource:
+    """
+    Plays a recording back as a frame source for SensorSimulator.
+
+    The file is indexed once (line offset and timestamp per frame) and frames
+    are read on demand, so long recordings are not loaded into memory.
+    delay() paces playback from the recorded gaps divided by `speed`
+    (0 = as fast as possible). After a loop or rewind, timestamps are shifted
+    so they keep increasing, as clients expect from a live stream.
+
+    Input: Recording path, speed factor, loop flag, start offset in seconds
+    Output: SensorFrame objects from next_frame()
+    """
+    def __init__(self, path, speed=1.0, loop=False, seek=0.0):
+        self.path = path
+        self.speed = speed
+        self.loop = loop
+        self.file = open(path, 'rb')
+
+        # First line: the recorded session's schema
+        self.schema = json.loads(self.file.readline())
+        if self.schema.get("type") != MSG_TYPE_SCHEMA:
+            raise ValueError(f"{path} does not start with a schema message")
+        self.sensor_config = schema_to_config(self.schema)
+
+        # Index: file offset and timestamp of every frame
+        offsets, times = [], []
+        offset = self.file.tell()
+        for line in self.file:
+            match = _TIMESTAMP.search(line, 0, 200)
+            if match:
+                offsets.append(offset)
+                times.append(float(match.group(1)))
+            offset += len(line)
+        if not offsets:
+            raise ValueError(f"{path} holds no frames")
+        self.offsets = offsets
+        self.times = np.array(times)
+
+        gaps = np.diff(self.times)
+        self.interval = float(np.median(gaps)) if gaps.size else self.schema.get("update_rate", 0.5)
+        self.start_offset = 0.0
+        self.position = 0
+        self.time_shift = 0.0  # Added to recorded timestamps once playback jumps back
+        self._last_timestamp = None
+        self.finished = False
+        self._gap = None  # Recorded gap after the frame last returned
+        self.seek(seek)
+
+    @property
+    def update_rate(self):
+        """Seconds between frames as seen by clients (advertised in the schema)."""
+        return self.interval / self.speed if self.speed > 0 else self.interval
+
+    def seek(self, seconds):
+        """Continues playback `seconds` after the start of the recording."""
+        self.start_offset = max(0.0, seconds)
+        self.rewind()
+
+    def rewind(self):
+        """Goes back to the seek position (e.g. on a RESET command)."""
+        self.position = int(np.searchsorted(self.times, self.times[0] + self.start_offset, side='left'))
+        self.finished = self.position >= len(self.offsets)
+
+    def next_frame(self, seq):
+        """
+        Reads the next recorded frame.
+
+        Input: Sequence number to stamp on the frame
+        Output: SensorFrame, or None once a non-looping recording has ended
+        """
+        if self.finished:
+            return None
+        self.file.seek(self.offsets[self.position])
+        frame = decode_json_message(json.loads(self.file.readline()))
+        timestamp = frame.timestamp + self.time_shift
+        if self._last_timestamp is not None and timestamp <= self._last_timestamp:
+            # Jumped back (loop or rewind): continue one interval after the last frame sent
+            self.time_shift += self._last_timestamp + self.interval - timestamp
+            timestamp = self._last_timestamp + self.interval
+        self._last_timestamp = timestamp
+        self._gap = None
+        self.position += 1
+        if self.position >= len(self.offsets):
+            if self.loop:
+                self.rewind()
+                self._gap = self.interval  # From the last frame to the start of the next pass
+            else:
+                self.finished = True
+        if self._gap is None and not self.finished:
+            self._gap = self.times[self.position] - self.times[self.position - 1]
+        return SensorFrame(seq, timestamp, frame.values, frame.status, burst=frame.burst)
+
+    def delay(self):
+        """Seconds to wait before the next frame, following the recorded gap."""
+        if self.speed <= 0 or self.finished or self._gap is None:
+            return 0.0
+        return self._gap / self.speed
+
+    def close(self):
+        self.file.close()
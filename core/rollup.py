@@ -0,0 +1,179 @@
+import numpy as np
+
+# (bucket seconds, buckets kept): 15 min of 1 s, 3 h of 10 s, 1 day of 1 min, 1 week of 10 min
+ROLLUP_LEVELS = ((1.0, 900), (10.0, 1080), (60.0, 1440), (600.0, 1008))
+
+class RollupLevel:
+    """
+    Time buckets of one resolution for a fixed set of sensors.
+
+    Buckets are aligned to multiples of the resolution and stored in a ring:
+    slot = bucket number % capacity. Each slot remembers which bucket it
+    holds, so a slot is reset when a newer bucket claims it and stale slots
+    are ignored by queries.
+
+    Input: Bucket length in seconds, number of buckets kept, sensor count
+    Output: Per-bucket count/min/max/mean/last from query()
+    """
+    def __init__(self, resolution, capacity, sensor_count):
+        self.resolution = float(resolution)
+        self.capacity = int(capacity)
+        self.bucket_ids = np.full(self.capacity, -1, dtype=np.int64)
+        shape = (self.capacity, sensor_count)
+        self.count = np.zeros(shape, dtype=np.int64)
+        self.min = np.full(shape, np.inf)
+        self.max = np.full(shape, -np.inf)
+        self.sum = np.zeros(shape)
+        self.last = np.full(shape, np.nan)
+        self.newest = -1  # Newest bucket number seen
+
+    def _reset(self, slot, bucket_id):
+        self.bucket_ids[slot] = bucket_id
+        self.count[slot] = 0
+        self.min[slot] = np.inf
+        self.max[slot] = -np.inf
+        self.sum[slot] = 0.0
+        self.last[slot] = np.nan
+
+    def add(self, positions, times, values):
+        """Folds samples (sensor position, time, value; in arrival order) into their buckets."""
+        ids = np.floor_divide(times, self.resolution).astype(np.int64)
+        slots = ids % self.capacity
+        for bucket_id in np.unique(ids).tolist():
+            slot = bucket_id % self.capacity
+            if self.bucket_ids[slot] < bucket_id:
+                self._reset(slot, bucket_id)
+        self.newest = max(self.newest, int(ids.max()))
+
+        # Samples older than the retained window have lost their slot
+        keep = self.bucket_ids[slots] == ids
+        if not keep.all():
+            positions, values, slots = positions[keep], values[keep], slots[keep]
+        if not len(values):
+            return
+
+        # Group samples by (slot, sensor) with one stable sort, then reduce each group
+        keys = slots * self.count.shape[1] + positions
+        order = np.argsort(keys, kind='stable')
+        keys, values = keys[order], values[order]
+        starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+        ends = np.append(starts[1:], len(keys))
+        cells = keys[starts]
+
+        count = self.count.reshape(-1)
+        minimum = self.min.reshape(-1)
+        maximum = self.max.reshape(-1)
+        total = self.sum.reshape(-1)
+        count[cells] += ends - starts
+        minimum[cells] = np.minimum(minimum[cells], np.minimum.reduceat(values, starts))
+        maximum[cells] = np.maximum(maximum[cells], np.maximum.reduceat(values, starts))
+        total[cells] += np.add.reduceat(values, starts)
+        self.last.reshape(-1)[cells] = values[ends - 1]  # Stable sort: last in group = newest
+
+    def oldest(self):
+        """Start time of the oldest bucket still retained."""
+        return (self.newest - self.capacity + 1) * self.resolution
+
+    def query(self, t_start, t_end, positions=None):
+        """
+        Buckets overlapping [t_start, t_end] that hold data, oldest first.
+
+        Input: Time range, optional sensor positions (all sensors if None)
+        Output: Dict of "time" (bucket start, 1-D) and "count"/"min"/"max"/
+                "mean"/"last" arrays shaped [bucket, sensor]; NaN where a
+                sensor has no samples in a bucket
+        """
+        first = max(int(np.floor(t_start / self.resolution)), self.newest - self.capacity + 1)
+        last = min(int(np.floor(t_end / self.resolution)), self.newest)
+        ids = np.arange(first, last + 1, dtype=np.int64)
+        slots = ids % self.capacity
+        valid = self.bucket_ids[slots] == ids
+        ids, slots = ids[valid], slots[valid]
+        columns = slice(None) if positions is None else np.asarray(positions, dtype=np.intp)
+
+        count = self.count[slots][:, columns]
+        empty = count == 0
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = self.sum[slots][:, columns] / count
+        result = {
+            "time": ids * self.resolution,
+            "count": count,
+            "min": np.where(empty, np.nan, self.min[slots][:, columns]),
+            "max": np.where(empty, np.nan, self.max[slots][:, columns]),
+            "mean": np.where(empty, np.nan, mean),
+            "last": self.last[slots][:, columns],
+        }
+        return result
+
+class RollupPyramid:
+    """
+    Rollups of the same samples at several resolutions (1 s up to 10 min),
+    maintained incrementally as samples arrive.
+
+    Long-range queries read a few hundred buckets from a coarse level
+    instead of every raw sample, and choose_level() picks the finest level
+    that still fits the available pixels.
+
+    Input: Sensor count, optional ((resolution, capacity), ...) levels
+    Output: Bucket dicts from query(), plot envelopes from envelope()
+    """
+    def __init__(self, sensor_count, levels=ROLLUP_LEVELS):
+        self.sensor_count = sensor_count
+        self.levels = [RollupLevel(resolution, capacity, sensor_count) for resolution, capacity in levels]
+        self.first = np.inf  # Time of the oldest sample added
+
+    def add(self, positions, times, values):
+        """
+        Adds samples to every level.
+
+        Input: Sensor positions, absolute times and values (arrays of equal length)
+        Output: None
+        """
+        if not len(positions):
+            return
+        positions = np.asarray(positions, dtype=np.intp)
+        times = np.asarray(times, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64)
+        self.first = min(self.first, float(times.min()))
+        for level in self.levels:
+            level.add(positions, times, values)
+
+    def query(self, level, t_start, t_end, positions=None):
+        """Buckets of one level (index into levels) over a time range; see RollupLevel.query."""
+        return self.levels[level].query(t_start, t_end, positions)
+
+    def choose_level(self, t_start, t_end, buckets, raw_start=None):
+        """
+        Picks the level of detail for drawing [t_start, t_end] in `buckets` pixels.
+
+        Input: Visible time range, pixel columns, oldest raw sample time (None if no raw data)
+        Output: Level index, or None when a pixel is finer than the finest level and
+                raw samples should be drawn instead
+        """
+        pixel = (t_end - t_start) / max(buckets, 1)
+        if raw_start is not None and pixel < self.levels[0].resolution:
+            # Raw history is capped (fast sensors keep only minutes); where the rollups go
+            # further back into the range than the raw samples, level 0 draws it instead
+            covered_from = max(t_start, self.first + self.levels[0].resolution)
+            if raw_start <= covered_from:
+                return None
+        for index, level in enumerate(self.levels):
+            if level.resolution >= pixel and level.oldest() <= t_start:
+                return index
+        return len(self.levels) - 1
+
+    def envelope(self, level, t_start, t_end, position):
+        """
+        Min/max envelope of one sensor from one level, ready for PlotDataItem.setData().
+
+        Input: Level index, time range, sensor position
+        Output: (times, values) with the min then the max of each non-empty bucket
+        """
+        buckets = self.query(level, t_start, t_end, [position])
+        filled = buckets["count"][:, 0] > 0
+        starts = buckets["time"][filled]
+        times = np.repeat(starts + self.levels[level].resolution / 2, 2)
+        values = np.empty(times.size)
+        values[0::2] = buckets["min"][filled, 0]
+        values[1::2] = buckets["max"][filled, 0]
+        return times, values
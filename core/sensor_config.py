@@ -19,13 +19,15 @@ SENSOR_CONFIG = {
         "name": "Speed",
         "type": "Mechanical",
         "unit": "RPM",
-        "limits": (0.0, 1500.0)
+        "limits": (0.0, 1500.0),
+        "sample_rate": 100.0  # Hz; several samples per frame
     },
     "S04": {
         "name": "Vibration",
         "type": "Mechanical",
         "unit": "mm/s",
-        "limits": (0.0, 5.0)
+        "limits": (0.0, 5.0),
+        "sample_rate": 1000.0  # Hz; several samples per frame
     },
     "S05": {
         "name": "Optical",
@@ -42,8 +44,19 @@ SIM_CONFIG = {
     "spike_prob": 0.001,          # 10% chance of sudden limit exceed
     "drift_amount": 0.05,       # Max change per step relative to range (5%)
     "fault_duration": 20.0,     # Duration in seconds for a sensor to remain faulty
+    "max_client_backlog": 1048576, # Bytes queued per client before frames are skipped for it
+    "deadband": 0.01,           # Delta mode: min change relative to range (1%) before a value is resent
+    "keyframe_interval": 20,    # Delta mode: full frame every N frames
+    "burst_amplitude": 0.05,    # Fast sensors: oscillation around the trend relative to range (5%)
+}
+
+# Alarm Evaluation (Dashboard)
+ALARM_CONFIG = {
+    "hysteresis": 0.02,         # Active limit alarm clears only this far (relative to range) back inside
+    "debounce": 1,              # Consecutive readings a new limit state must persist before it is raised/cleared
 }
 
 # Network Configuration
 HOST = "127.0.0.1"
 PORT = 65432
+SHM_NAME = "proline_sensors"  # Shared-memory frame ring for same-host clients (--shm)
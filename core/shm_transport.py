@@ -0,0 +1,226 @@
+import json
+import math
+import logging
+import numpy as np
+from multiprocessing import shared_memory, resource_tracker
+from core.protocol import SensorFrame
+
+# Shared-memory layout
+#
+# One segment per simulator, named by --shm (SHM_NAME by default):
+#   header  uint64[8]: magic, sensor count, slot count, schema bytes,
+#           published seq (newest complete frame), closed flag, 2 x reserved
+#   schema  the JSON schema message TCP clients receive on connect, padded to 8 bytes
+#   slots   ring of fixed-layout frames, one per seq (slot = seq % slot count):
+#             uint64 seq_start, float64 timestamp, float64 sent (NaN = unknown),
+#             float64[n] values, uint8[n] status (padded to 8), uint64 seq_end
+# Single writer, any number of readers, no locks. The writer stamps seq_start,
+# fills the slot, stamps seq_end and only then publishes the seq in the header.
+# Readers check seq_end, copy the slot into their own buffers (a memory copy of
+# n x 9 bytes, no parsing) and check that seq_start still matches (a seqlock).
+# Otherwise the writer lapped the reader mid-copy: the frame counts as torn and
+# is skipped, so torn data never reaches the client.
+
+SHM_MAGIC = 0x31_4D_48_53_4C_4F_52_50  # b"PROLSHM1" read as little-endian uint64
+HEADER_FIELDS = 8
+H_MAGIC, H_SENSORS, H_SLOTS, H_SCHEMA, H_SEQ, H_CLOSED = range(6)
+SHM_SLOTS = 64                   # Frames a reader may fall behind before it loses some
+SHM_MAX_BYTES = 64 << 20         # Fewer slots for very large sensor counts
+
+def slot_dtype(sensor_count):
+    """Fixed record layout of one ring slot (see above)."""
+    pad = -sensor_count % 8
+    fields = [("seq_start", "<u8"), ("timestamp", "<f8"), ("sent", "<f8"),
+              ("values", "<f8", (sensor_count,)), ("status", "u1", (sensor_count,))]
+    if pad:
+        fields.append(("pad", "u1", (pad,)))
+    fields.append(("seq_end", "<u8"))
+    return np.dtype(fields)
+
+def _attach(name):
+    """Opens an existing segment without handing it to this process's resource tracker."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        pass
+    # Before 3.13 the tracker would unlink the writer's segment when a reader exits
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+class _SharedRing:
+    """Views over a mapped segment, shared by the writer and the reader."""
+    def _map(self, shm):
+        self.shm = shm
+        self.header = np.ndarray((HEADER_FIELDS,), np.uint64, shm.buf)
+        self.sensor_count = int(self.header[H_SENSORS])
+        self.slots = int(self.header[H_SLOTS])
+        schema_bytes = int(self.header[H_SCHEMA])
+        offset = HEADER_FIELDS * 8
+        self.schema_payload = bytes(shm.buf[offset:offset + schema_bytes])
+        offset += schema_bytes + (-schema_bytes % 8)
+        ring = np.ndarray((self.slots,), slot_dtype(self.sensor_count), shm.buf, offset)
+        # Per-field [slot] / [slot, sensor] views; frames index into these
+        self.seq_start = ring["seq_start"]
+        self.timestamp = ring["timestamp"]
+        self.sent = ring["sent"]
+        self.values = ring["values"]
+        self.status = ring["status"]
+        self.seq_end = ring["seq_end"]
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    @property
+    def closed(self):
+        return self.shm is None or bool(self.header[H_CLOSED])
+
+    def _unmap(self):
+        # The buffer can only be closed once no views into it are left
+        self.header = self.seq_start = self.timestamp = self.sent = None
+        self.values = self.status = self.seq_end = None
+        shm, self.shm = self.shm, None
+        try:
+            shm.close()
+        except BufferError:
+            logging.warning(f"Shared memory {shm.name} still has views in use; left to the garbage collector")
+        return shm
+
+class ShmRingWriter(_SharedRing):
+    """
+    Producer side of the shared-memory frame ring (the simulator).
+
+    Input: Segment name, sensor count, encoded schema message, optional slot count
+    Output: Frames published with write(); close() marks the ring closed and unlinks it
+    """
+    def __init__(self, name, sensor_count, schema_payload, slots=SHM_SLOTS):
+        itemsize = slot_dtype(sensor_count).itemsize
+        slots = max(4, min(slots, SHM_MAX_BYTES // itemsize))
+        schema_area = len(schema_payload) + (-len(schema_payload) % 8)
+        size = HEADER_FIELDS * 8 + schema_area + slots * itemsize
+        try:
+            shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            # Left behind by a simulator that did not shut down cleanly
+            logging.warning(f"Replacing stale shared memory segment {name}")
+            stale = _attach(name)
+            # Readers still attached to it reattach to the new ring once it is marked closed
+            if stale.size >= HEADER_FIELDS * 8:
+                np.ndarray((HEADER_FIELDS,), np.uint64, stale.buf)[H_CLOSED] = 1
+            stale.close()
+            stale.unlink()
+            shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        header = np.ndarray((HEADER_FIELDS,), np.uint64, shm.buf)
+        header[:] = 0
+        header[H_SENSORS] = sensor_count
+        header[H_SLOTS] = slots
+        header[H_SCHEMA] = len(schema_payload)
+        shm.buf[HEADER_FIELDS * 8:HEADER_FIELDS * 8 + len(schema_payload)] = schema_payload
+        del header
+        self._map(shm)
+        self.seq_start[:] = 0
+        self.seq_end[:] = 0
+        self.seq = 0
+        # Published last, so readers never see a half-initialised segment
+        self.header[H_MAGIC] = SHM_MAGIC
+
+    def write(self, frame):
+        """
+        Copies one full frame into the next slot and publishes it.
+
+        Input: Keyframe SensorFrame with one value and status per sensor
+        Output: Ring sequence number of the frame
+        """
+        if frame.indices is not None:
+            raise ValueError("Shared-memory frames must be keyframes")
+        seq = self.seq + 1
+        slot = seq % self.slots
+        self.seq_start[slot] = seq
+        self.timestamp[slot] = frame.timestamp
+        self.sent[slot] = math.nan if frame.sent is None else frame.sent
+        self.values[slot] = frame.values
+        self.status[slot] = frame.status
+        self.seq_end[slot] = seq
+        self.header[H_SEQ] = self.seq = seq
+        return seq
+
+    def close(self):
+        """Tells readers the ring is gone (they reattach to a successor) and frees it."""
+        if self.shm is None:
+            return
+        self.header[H_CLOSED] = 1
+        shm = self._unmap()
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+
+class ShmRingReader(_SharedRing):
+    """
+    Consumer side of the shared-memory frame ring (CommThread / headless client).
+
+    Reading starts at the newest published frame. Frames the writer has
+    already overwritten are skipped; the resulting sequence gap shows up as
+    lost frames in the client's LatencyMonitor.
+
+    Input: Segment name (raises FileNotFoundError until the simulator has created it)
+    Output: schema dict; validated SensorFrames from frames()
+    """
+    def __init__(self, name):
+        shm = _attach(name)
+        if shm.size < HEADER_FIELDS * 8 or \
+                int(np.ndarray((1,), np.uint64, shm.buf)[0]) != SHM_MAGIC:
+            shm.close()
+            raise ValueError(f"Shared memory {name} is not a sensor frame ring (or not ready yet)")
+        self._map(shm)
+        self.schema = json.loads(self.schema_payload)
+        self.last_seq = max(0, int(self.header[H_SEQ]) - 1)
+        # Each frame is copied here and validated before it is handed out
+        self._values = np.empty(self.sensor_count, dtype=np.float64)
+        self._status = np.empty(self.sensor_count, dtype=np.uint8)
+        self.frames_read = 0
+        self.frames_torn = 0
+
+    def frames(self):
+        """
+        Yields every frame published since the previous call, oldest first.
+
+        Every frame's arrays are the reader's reusable buffers: use them
+        before asking for the next frame.
+
+        Input: None
+        Output: Generator of keyframe SensorFrames
+        """
+        head = int(self.header[H_SEQ])
+        # Anything older than one ring length has been overwritten already
+        seq = max(self.last_seq + 1, head - self.slots + 1)
+        while seq <= head:
+            slot = seq % self.slots
+            self.last_seq = seq
+            seq += 1
+            if int(self.seq_end[slot]) != self.last_seq:
+                # Overwritten (or being overwritten) since head was read
+                self.frames_torn += 1
+                continue
+            np.copyto(self._values, self.values[slot])
+            np.copyto(self._status, self.status[slot])
+            timestamp = float(self.timestamp[slot])
+            sent = float(self.sent[slot])
+            if int(self.seq_start[slot]) != self.last_seq:
+                # The writer started on this slot during the copy
+                self.frames_torn += 1
+                continue
+            self.frames_read += 1
+            yield SensorFrame(self.last_seq, timestamp, self._values, self._status,
+                              sent=None if math.isnan(sent) else sent)
+
+    def stats(self):
+        return {"shm_frames": self.frames_read, "shm_torn": self.frames_torn}
+
+    def close(self):
+        if self.shm is not None:
+            self._unmap()
@@ -0,0 +1,144 @@
+import numpy as np
+from core.protocol import STATUS_OK, STATUS_FAULT
+
+class VectorSimEngine:
+    """
+    Array-backed version of SensorSimulator's per-sensor random walk.
+
+    Values, limits, spans and fault start times live in NumPy arrays so that
+    drift, clamping, fault and spike decisions are taken for all sensors in a
+    handful of vector operations per tick. The per-sensor probabilities are
+    the same as the scalar loop in SensorSimulator.generate_data().
+
+    Input: Sensor config dict (ordered by ID), simulation params, optional RNG seed
+    Output: (values, status) arrays from step(), in sensor_ids order
+    """
+    def __init__(self, sensor_config, sim_config, seed=None):
+        self.sim_config = sim_config
+        self.sensor_ids = list(sensor_config)
+        count = len(self.sensor_ids)
+
+        limits = np.array([info['limits'] for info in sensor_config.values()], dtype=np.float64).reshape(count, 2)
+        self.low = limits[:, 0].copy()
+        self.high = limits[:, 1].copy()
+        self.span = self.high - self.low
+        # Same clamping band as the scalar loop: [low * 0.9, high * 1.1]
+        self.clamp_low = self.low * 0.9
+        self.clamp_high = self.high * 1.1
+
+        self.values = np.empty(count, dtype=np.float64)
+        # NaN means "no active fault", otherwise the time the fault started
+        self.fault_start = np.empty(count, dtype=np.float64)
+        self.rng = np.random.default_rng(seed)
+        self.reset()
+
+    def reset(self):
+        """Resets all sensor values to the middle of their range and clears faults."""
+        np.add(self.low, self.high, out=self.values)
+        self.values *= 0.5
+        self.clear_faults()
+
+    def clear_faults(self):
+        self.fault_start.fill(np.nan)
+
+    def step(self, now):
+        """
+        Advances every sensor by one tick.
+
+        Input: Frame timestamp (seconds) used for fault timing
+        Output: Tuple of (float64 values rounded to 2 decimals, uint8 status codes)
+        """
+        count = self.values.size
+        prob_fault = self.sim_config["fault_prob"]
+        prob_spike = self.sim_config["spike_prob"]
+        drift_factor = self.sim_config["drift_amount"]
+        fault_duration = self.sim_config.get("fault_duration", 20.0)
+
+        # 1. Update Trend (Drift) and clamp
+        drift = (self.rng.random(count) - 0.5) * (2 * drift_factor) * self.span
+        self.values += drift
+        np.minimum(self.clamp_high, self.values, out=self.values)
+        np.maximum(self.clamp_low, self.values, out=self.values)
+
+        final = self.values.copy()
+        status = np.zeros(count, dtype=np.uint8)
+
+        # 2. Sticky faults: keep the active ones, recover the expired ones
+        faulty = ~np.isnan(self.fault_start)
+        active = faulty & ((now - self.fault_start) < fault_duration)
+        self.fault_start[faulty & ~active] = np.nan
+
+        # 3. Sensors that started the tick healthy roll for a new fault or spike
+        roll = self.rng.random(count)
+        healthy = ~faulty
+        new_fault = healthy & (roll < prob_fault)
+        spike = healthy & ~new_fault & (roll < prob_fault + prob_spike)
+        self.fault_start[new_fault] = now
+
+        faulted = active | new_fault
+        final[faulted] = 0.0
+        status[faulted] = STATUS_FAULT
+
+        spike_idx = np.flatnonzero(spike)
+        if spike_idx.size:
+            # Transient spike 20% of span outside either limit, 50/50
+            upward = self.rng.random(spike_idx.size) < 0.5
+            offset = self.span[spike_idx] * 0.2
+            final[spike_idx] = np.where(upward, self.high[spike_idx] + offset, self.low[spike_idx] - offset)
+
+        np.round(final, 2, out=final)
+        return final, status
+
+class BurstGenerator:
+    """
+    Intermediate samples for sensors that sample faster than the frame rate.
+
+    Each sensor with a 'sample_rate' (Hz) gets sample_rate * elapsed samples
+    per frame (fractions carry over), as an oscillation of 'burst_amplitude'
+    x span around the slow random walk plus a little noise. The last sample
+    of every burst equals the frame value, so the burst and the frame's
+    latest reading always agree; faulty sensors read 0.0 throughout.
+
+    Input: Sensor config dict (ordered by ID), simulation params, optional RNG seed
+    Output: (positions, counts, samples) burst tuples from generate()
+    """
+    def __init__(self, sensor_config, sim_config, seed=None):
+        self.sim_config = sim_config
+        rates = [info.get('sample_rate', 0.0) for info in sensor_config.values()]
+        self.positions = np.flatnonzero(np.array(rates) > 0).astype(np.uint32)
+        infos = list(sensor_config.values())
+        self.rates = np.array([rates[i] for i in self.positions], dtype=np.float64)
+        spans = np.array([infos[i]['limits'][1] - infos[i]['limits'][0] for i in self.positions], dtype=np.float64)
+        self.amplitude = spans * sim_config.get("burst_amplitude", 0.05)
+        self.noise = spans * 0.005
+        # Signal frequency well below the sample rate, different per sensor
+        self.frequency = self.rates / 20.0 * (1.0 + 0.1 * np.arange(self.positions.size))
+        self.rng = np.random.default_rng(seed)
+        self.carry = np.zeros(self.positions.size)
+        self.last_time = None
+
+    def generate(self, timestamp, values, status):
+        """
+        Builds the burst for one frame.
+
+        Input: Frame timestamp, frame values and status arrays (all sensors)
+        Output: (uint32 positions, uint32 counts, float64 samples oldest first)
+        """
+        elapsed = self.sim_config.get("update_rate", 0.5) if self.last_time is None else timestamp - self.last_time
+        self.last_time = timestamp
+        owed = self.rates * max(elapsed, 0.0) + self.carry
+        counts = np.maximum(np.floor(owed + 1e-6), 1.0)  # Tolerate timestamp rounding
+        self.carry = np.maximum(owed - counts, 0.0)
+        counts = counts.astype(np.uint32)
+
+        # Sample k of n is taken (n - 1 - k) / rate before the frame timestamp
+        owner = np.repeat(np.arange(self.positions.size), counts)
+        ends = np.cumsum(counts)
+        back = (ends[owner] - 1 - np.arange(owner.size)) / self.rates[owner]
+        phase = 2 * np.pi * self.frequency[owner]
+        wave = np.sin(phase * (timestamp - back)) - np.sin(phase * timestamp)
+        noise = self.rng.normal(0.0, 1.0, owner.size) * self.noise[owner]
+        noise[ends - 1] = 0.0
+        samples = np.asarray(values, dtype=np.float64)[self.positions][owner] + self.amplitude[owner] * wave + noise
+        samples[np.asarray(status)[self.positions][owner] != STATUS_OK] = 0.0
+        return self.positions, counts, np.round(samples, 3)
@@ -0,0 +1,31 @@
+import time
+
+class StartupProfile:
+    """
+    Wall-clock breakdown of application startup.
+
+    Each mark() ends a phase (imports, construction, first paint, first
+    data) that started at the previous mark, or at creation for the first.
+    Marks cost a clock read, so they are always recorded; --profile-startup
+    only decides whether report() is printed.
+
+    Input: None (created as early as possible, e.g. at the top of main.py)
+    Output: report() table of phase durations and elapsed time in ms
+    """
+    def __init__(self):
+        self.start = self._last = time.perf_counter()
+        self.phases = []  # [(name, seconds, seconds since start)]
+
+    def mark(self, name):
+        now = time.perf_counter()
+        self.phases.append((name, now - self._last, now - self.start))
+        self._last = now
+
+    def elapsed(self):
+        return time.perf_counter() - self.start
+
+    def report(self, title="Startup profile"):
+        lines = [f"{title} (ms since main.py started):", f"  {'Phase':<34}{'Phase':>9}{'Total':>9}"]
+        for name, seconds, total in self.phases:
+            lines.append(f"  {name:<34}{seconds * 1e3:9.1f}{total * 1e3:9.1f}")
+        return "\n".join(lines)
@@ -0,0 +1,322 @@
+import os
+import json
+import glob
+import time
+import queue
+import logging
+import threading
+import numpy as np
+
+# On-disk layout
+#
+# A store directory holds numbered segments. Each segment is a data file
+# plus a small JSON sidecar:
+#   seg-000001.dat   one fixed-width block per sensor, in schema order:
+#                      float64[capacity] timestamps
+#                      float32[capacity] values
+#                      uint8[capacity]   status codes
+#   seg-000001.json  sensor IDs, capacity, rows written per sensor, time span
+# Only updates are stored (delta frames add rows for the sensors they carry),
+# so every sensor block fills at its own pace. Readers only trust the row
+# counts in the sidecar, which is rewritten after the data is synced.
+
+SEGMENT_PREFIX = "seg-"
+ROW_BYTES = 8 + 4 + 1            # timestamp + value + status per stored reading
+SEGMENT_BYTES = 64 << 20         # Rotate when a segment would grow past this
+SEGMENT_SECONDS = 3600.0         # ... or when it spans more than this
+SYNC_INTERVAL = 1.0              # Seconds between fsyncs of the active segment
+MAX_PENDING_FRAMES = 10000       # Frames queued to the writer before new ones are dropped
+
+class Segment:
+    """
+    One fixed-width columnar segment file, accessed through numpy.memmap.
+
+    Input: Data file path (the sidecar sits next to it)
+    Output: Zero-copy (times, values, status) views per sensor from column()
+    """
+    def __init__(self, path, sensor_ids, capacity, counts, t_start, t_end, mode='r'):
+        self.path = path
+        self.sensor_ids = list(sensor_ids)
+        self.positions = {sid: i for i, sid in enumerate(self.sensor_ids)}
+        self.capacity = capacity
+        self.counts = np.asarray(counts, dtype=np.int64)
+        self.t_start = t_start
+        self.t_end = t_end
+        self.data = np.memmap(path, dtype=np.uint8, mode=mode,
+                              shape=(max(1, len(self.sensor_ids) * capacity * ROW_BYTES),))
+        # [sensor, row] views over the blocks laid out as described above
+        count = len(self.sensor_ids)
+        stride = capacity * ROW_BYTES
+        self.times = np.ndarray((count, capacity), np.float64, self.data, 0, (stride, 8))
+        self.values = np.ndarray((count, capacity), np.float32, self.data, capacity * 8, (stride, 4))
+        self.status = np.ndarray((count, capacity), np.uint8, self.data, capacity * 12, (stride, 1))
+
+    @property
+    def meta_path(self):
+        return os.path.splitext(self.path)[0] + ".json"
+
+    @classmethod
+    def create(cls, path, sensor_ids, capacity):
+        """Allocates a new segment file and its sidecar."""
+        with open(path, 'wb') as f:
+            f.truncate(max(1, len(sensor_ids) * capacity * ROW_BYTES))
+        segment = cls(path, sensor_ids, capacity, np.zeros(len(sensor_ids)), None, None, mode='r+')
+        segment.save_meta()
+        return segment
+
+    @classmethod
+    def open(cls, path):
+        """Opens an existing segment read-only from its sidecar."""
+        with open(os.path.splitext(path)[0] + ".json") as f:
+            meta = json.load(f)
+        return cls(path, meta["sensors"], meta["capacity"], meta["counts"], meta["t_start"], meta["t_end"])
+
+    def is_full(self, positions, rows=1):
+        """True if a listed sensor has no room for `rows` more readings (one count, or one per position)."""
+        return bool(positions.size) and bool((self.counts[positions] + rows > self.capacity).any())
+
+    def write(self, positions, values, status, timestamp):
+        """Appends one reading per listed sensor position (caller checks is_full first)."""
+        rows = self.counts[positions]
+        self.times[positions, rows] = timestamp
+        self.values[positions, rows] = values
+        self.status[positions, rows] = status
+        self.counts[positions] += 1
+        if self.t_start is None:
+            self.t_start = timestamp
+        self.t_end = timestamp if self.t_end is None else max(self.t_end, timestamp)
+
+    def write_samples(self, positions, values, status, times):
+        """
+        Appends several readings per sensor, each with its own time (caller checks is_full first).
+
+        Input: Sensor positions (repeating; each sensor's readings oldest first), values,
+               status codes and times of equal length
+        Output: None
+        """
+        order = np.argsort(positions, kind='stable')
+        positions = positions[order]
+        unique, counts = np.unique(positions, return_counts=True)
+        # Row of each reading: the sensor's next free row plus its rank within the sensor
+        rank = np.arange(positions.size) - np.repeat(np.cumsum(counts) - counts, counts)
+        rows = self.counts[positions] + rank
+        self.times[positions, rows] = times[order]
+        self.values[positions, rows] = values[order]
+        self.status[positions, rows] = status[order]
+        self.counts[unique] += counts
+        if self.t_start is None:
+            self.t_start = float(times.min())
+        self.t_end = float(times.max()) if self.t_end is None else max(self.t_end, float(times.max()))
+
+    def sync(self):
+        """Flushes the data to disk, then publishes the new row counts."""
+        self.data.flush()
+        self.save_meta()
+
+    def save_meta(self):
+        meta = {
+            "sensors": self.sensor_ids,
+            "capacity": self.capacity,
+            "counts": self.counts.tolist(),
+            "t_start": self.t_start,
+            "t_end": self.t_end,
+        }
+        tmp_path = self.meta_path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.meta_path)
+
+    def column(self, sensor_id, t_start=None, t_end=None):
+        """
+        Stored readings of one sensor, optionally limited to [t_start, t_end].
+
+        Input: Sensor ID, optional time range
+        Output: (times, values, status) memmap views (empty if the sensor is unknown)
+        """
+        pos = self.positions.get(sensor_id)
+        if pos is None:
+            return np.empty(0), np.empty(0, dtype=np.float32), np.empty(0, dtype=np.uint8)
+        count = int(self.counts[pos])
+        times = self.times[pos][:count]
+        first = 0 if t_start is None else np.searchsorted(times, t_start, side='left')
+        last = count if t_end is None else np.searchsorted(times, t_end, side='right')
+        return times[first:last], self.values[pos][first:last], self.status[pos][first:last]
+
+def list_segments(directory):
+    """Paths of the segment data files in a store directory, oldest first."""
+    return sorted(glob.glob(os.path.join(directory, SEGMENT_PREFIX + "*.dat")))
+
+def read_range(directory, sensor_id, t_start=None, t_end=None):
+    """
+    Reads one sensor's stored readings over a time range, across segments.
+
+    Input: Store directory, Sensor ID, optional time range
+    Output: (times, values, status) arrays; views into the segment file when
+            only one segment holds data, otherwise a concatenated copy
+    """
+    parts = []
+    for path in list_segments(directory):
+        try:
+            segment = Segment.open(path)
+        except (OSError, ValueError, KeyError):
+            continue  # Segment still being created, or not one of ours
+        if segment.t_start is None:
+            continue
+        if (t_end is not None and segment.t_start > t_end) or (t_start is not None and segment.t_end < t_start):
+            continue
+        columns = segment.column(sensor_id, t_start, t_end)
+        if columns[0].size:
+            parts.append(columns)
+    if not parts:
+        return np.empty(0), np.empty(0, dtype=np.float32), np.empty(0, dtype=np.uint8)
+    if len(parts) == 1:
+        return parts[0]
+    return tuple(np.concatenate(column) for column in zip(*parts))
+
+class SegmentStore:
+    """
+    Append-only recorder for received readings.
+
+    append() only queues the frame, so the receiving thread never waits on
+    disk. A writer thread copies queued frames into the active segment's
+    memmap, fsyncs at most every sync_interval seconds, and starts a new
+    segment when the active one is full (segment_bytes), spans more than
+    segment_seconds, or the sensor set changes.
+
+    Input: Store directory, rotation and sync settings
+    Output: Segment files readable with read_range()
+    """
+    def __init__(self, directory, segment_bytes=SEGMENT_BYTES, segment_seconds=SEGMENT_SECONDS,
+                 sync_interval=SYNC_INTERVAL, max_pending=MAX_PENDING_FRAMES):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.segment_seconds = segment_seconds
+        self.sync_interval = sync_interval
+        os.makedirs(directory, exist_ok=True)
+
+        self.queue = queue.Queue(maxsize=max_pending)
+        self.thread = None
+        self.sensor_ids = []
+        self.segment = None
+        existing = list_segments(directory)
+        self.next_index = int(os.path.basename(existing[-1])[len(SEGMENT_PREFIX):-4]) + 1 if existing else 1
+
+        # Counters
+        self.frames_written = 0
+        self.frames_dropped = 0
+        self.segments_written = 0
+        self.syncs = 0
+
+    def stats(self):
+        return {
+            "frames_written": self.frames_written,
+            "frames_dropped": self.frames_dropped,
+            "segments_written": self.segments_written,
+            "syncs": self.syncs,
+        }
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, name="SegmentStore", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Writes everything still queued, syncs and closes the active segment."""
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+
+    def set_sensors(self, sensor_ids):
+        """Announces the sensor order of the following frames (e.g. on a new schema)."""
+        # Never dropped: the frames after it would be written in the wrong layout
+        self.queue.put(("sensors", list(sensor_ids)))
+
+    def append(self, positions, values, status, timestamp):
+        """Queues one frame's updated readings; drops it if the writer is too far behind."""
+        self._put(("frame", (positions, values, status, timestamp)))
+
+    def append_samples(self, positions, values, status, times):
+        """Queues readings with a time each, several per sensor (fast sensors' bursts)."""
+        self._put(("samples", (positions, values, status, times)))
+
+    def _put(self, item):
+        try:
+            self.queue.put_nowait(item)
+        except queue.Full:
+            self.frames_dropped += 1
+
+    def _run(self):
+        last_sync = time.monotonic()
+        running = True
+        while running:
+            try:
+                items = [self.queue.get(timeout=self.sync_interval)]
+            except queue.Empty:
+                items = []
+            # Drain whatever else is waiting so one wake-up handles a whole burst
+            while True:
+                try:
+                    items.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            for item in items:
+                if item is None:
+                    running = False
+                    break
+                try:
+                    self._write(*item)
+                except OSError as e:
+                    logging.error(f"Recording failed: {e}")
+
+            now = time.monotonic()
+            if self.segment is not None and (not running or now - last_sync >= self.sync_interval):
+                self.segment.sync()
+                self.syncs += 1
+                last_sync = now
+        self.segment = None
+
+    def _write(self, kind, payload):
+        if kind == "sensors":
+            if payload != self.sensor_ids:
+                self._close_segment()
+                self.sensor_ids = payload
+            return
+
+        positions, values, status, timestamp = payload
+        positions = np.asarray(positions, dtype=np.intp)
+        if kind == "samples":
+            unique, rows = np.unique(positions, return_counts=True)
+            newest = float(np.max(timestamp))
+        else:
+            unique, rows, newest = positions, 1, timestamp
+        segment = self.segment
+        if segment is not None and (segment.is_full(unique, rows) or
+                                    newest - segment.t_start >= self.segment_seconds):
+            self._close_segment()
+            segment = None
+        if segment is None:
+            if not self.sensor_ids:
+                return
+            segment = self.segment = self._new_segment()
+        if kind == "samples":
+            segment.write_samples(positions, np.asarray(values), np.asarray(status), np.asarray(timestamp))
+        else:
+            segment.write(positions, values, status, timestamp)
+        self.frames_written += 1
+
+    def _new_segment(self):
+        # Multiple of 8 rows keeps every column 8-byte aligned
+        capacity = max(8, self.segment_bytes // (len(self.sensor_ids) * ROW_BYTES) // 8 * 8)
+        path = os.path.join(self.directory, f"{SEGMENT_PREFIX}{self.next_index:06d}.dat")
+        self.next_index += 1
+        self.segments_written += 1
+        return Segment.create(path, self.sensor_ids, capacity)
+
+    def _close_segment(self):
+        if self.segment is not None:
+            self.segment.sync()
+            self.syncs += 1
+            self.segment = None
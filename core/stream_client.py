@@ -0,0 +1,274 @@
+import socket
+import json
+import time
+import logging
+import threading
+import numpy as np
+from core.sensor_config import HOST, PORT
+from core.protocol import PROTOCOL_JSON, PROTOCOL_BINARY, MSG_TYPE_SCHEMA, RECV_SIZE, FrameDecoder, SensorFrame
+from core.stream_state import SensorState, BatchAccumulator
+from core.latency import LatencyMonitor, STAGE_SEND, STAGE_NETWORK, STAGE_PARSE
+from core.shm_transport import ShmRingReader
+
+# Shared-memory transport: seconds between polls of the ring while it is idle
+SHM_POLL_INTERVAL = 0.002
+
+class StreamClient:
+    """
+    Simulator client without Qt: connection, protocol negotiation, framing,
+    state rebuild and bounded-rate batching.
+
+    run() is the receive loop (blocking; reconnects until stop()). With
+    shm_name set, frames are read from the simulator's shared-memory ring
+    (same host, no serialization) instead of TCP; commands still go to
+    host:port. Results
+    go to emit_batch / emit_schema / emit_connection, which call the
+    optional callbacks here; CommThread overrides them with Qt signals.
+    Whoever takes a batch calls batch_delivered() once it has handled it;
+    until then further frames are conflated into the next batch.
+
+    Input: Host, port, requested protocol, batches per second, optional
+           SegmentStore recorder, optional on_batch / on_schema / on_connection
+           callables, optional shared-memory ring name (None = TCP)
+    Output: SampleBatch / schema dict / connected flag through the callbacks
+    """
+    def __init__(self, host=HOST, port=PORT, protocol=PROTOCOL_BINARY, batch_rate=20.0, recorder=None,
+                 on_batch=None, on_schema=None, on_connection=None, shm_name=None):
+        self._stop_event = threading.Event()
+        self.host = host
+        self.port = port
+        # Requested wire protocol; JSON is used until the simulator accepts it
+        self.protocol = protocol
+        self.active_protocol = PROTOCOL_JSON
+        # Full sensor state rebuilt from keyframes and deltas, in schema order
+        self.state = SensorState()
+        # Stream parser; its counters (frames/bytes decoded and dropped) span reconnects
+        self.decoder = FrameDecoder()
+
+        # Frames are merged here and handed out in bounded-rate batches
+        self.batch = BatchAccumulator(self.state)
+        self.batch_interval = 1.0 / batch_rate
+        self._next_batch = 0.0
+        # Cleared while a batch is with the consumer; further frames are conflated meanwhile
+        self._batch_delivered = threading.Event()
+        self._batch_delivered.set()
+        # Per-stage latency histograms and sequence gaps (the GUI stages are filled by the Dashboard)
+        self.latency = LatencyMonitor()
+        # Optional SegmentStore; every applied frame is queued to it, off the consumer's thread
+        self.recorder = recorder
+        self.on_batch = on_batch
+        self.on_schema = on_schema
+        self.on_connection = on_connection
+        self.socket = None
+        self.socket_lock = threading.Lock()
+        # Shared-memory transport (same host): ring name, and the attached ShmRingReader
+        self.shm_name = shm_name
+        self.ring = None
+
+    def emit_batch(self, batch):
+        if self.on_batch is not None:
+            self.on_batch(batch)
+        else:
+            self.batch_delivered()
+
+    def emit_schema(self, schema):
+        if self.on_schema is not None:
+            self.on_schema(schema)
+
+    def emit_connection(self, connected):
+        if self.on_connection is not None:
+            self.on_connection(connected)
+
+    def batch_delivered(self, batch=None):
+        """Lets the next batch go out (the consumer has taken the previous one)."""
+        self._batch_delivered.set()
+
+    def send_command(self, command, **kwargs):
+        """Sends a JSON command to the simulator."""
+        payload = {"command": command}
+        payload.update(kwargs)
+        line = (json.dumps(payload) + "\n").encode('utf-8')
+        if self.socket:
+            try:
+                with self.socket_lock:
+                    self.socket.sendall(line)
+            except Exception as e:
+                logging.error(f"Failed to send command: {e}")
+        elif self.shm_name:
+            # Frames come through shared memory; a command gets a short TCP connection of its own
+            try:
+                with socket.create_connection((self.host, self.port), timeout=2.0) as sock:
+                    sock.sendall(line)
+                    sock.shutdown(socket.SHUT_WR)
+                    # Read until the simulator hangs up, so unread frames never reset the command away
+                    while sock.recv(RECV_SIZE):
+                        pass
+            except OSError as e:
+                logging.error(f"Failed to send command: {e}")
+
+    def handle_message(self, msg):
+        """Routes one decoded message (SensorFrame, schema, Ack or legacy JSON data)."""
+        if isinstance(msg, SensorFrame):
+            # Only the sensors carried by the frame changed (all of them for keyframes)
+            updated = self.state.apply(msg)
+            # Fast sensors' bursts go to the plots as arrays of samples (even in
+            # delta frames where no latest value changed)
+            burst = self.state.burst_samples(msg)
+            if updated.size or burst is not None:
+                self.batch.add(updated, msg.timestamp, burst)
+                if self.recorder is not None:
+                    self._record(updated, burst, msg.timestamp)
+            self._record_latency(msg)
+        elif msg.get("type") == MSG_TYPE_SCHEMA:
+            # Static metadata, sent once per connection; pending data belongs to the old layout
+            self.state.reset([sensor["id"] for sensor in msg["sensors"]],
+                             [sensor.get("sample_rate", 0.0) for sensor in msg["sensors"]])
+            self.batch.clear()
+            self.latency.reset_sequence()
+            if self.recorder is not None:
+                self.recorder.set_sensors(self.state.sensor_ids)
+            self.emit_schema(msg)
+        elif "status" in msg:
+            # It's a command response (Ack)
+            if "protocol" in msg and msg["status"] == "OK":
+                self.active_protocol = msg["protocol"]
+                logging.info(f"Using {self.active_protocol} protocol")
+        else:
+            # Legacy simulators send {sid: reading} dicts without a schema
+            if list(msg) != self.state.sensor_ids:
+                self.state.reset(msg)
+                self.batch.clear()
+                if self.recorder is not None:
+                    self.recorder.set_sensors(self.state.sensor_ids)
+            self.handle_message(SensorFrame.from_readings(0, msg))
+
+    def _record(self, updated, burst, timestamp):
+        """Queues one frame's readings to the recorder; sensors with a burst as every sample."""
+        state = self.state
+        if burst is not None:
+            positions, times, values = burst
+            self.recorder.append_samples(positions, values, state.status[positions], times)
+            # A burst ends on the frame value, so the latest value is not stored twice
+            updated = updated[~np.isin(updated, positions)]
+        if updated.size:
+            self.recorder.append(updated, state.values[updated], state.status[updated], timestamp)
+
+    def _record_latency(self, frame):
+        """Samples the simulator, socket and parse stages of one applied frame."""
+        latency = self.latency
+        latency.observe_seq(frame.seq)
+        received = self.decoder.received_at
+        if frame.sent is not None:
+            latency.record(STAGE_SEND, frame.sent - frame.timestamp)
+        if received:
+            if frame.sent is not None:
+                latency.record(STAGE_NETWORK, received - frame.sent)
+            latency.record(STAGE_PARSE, time.time() - received)
+
+    def flush_batch(self):
+        """Emits the pending batch if the rate limit allows and the consumer took the previous one."""
+        if not self.batch.frames or not self._batch_delivered.is_set():
+            return
+        now = time.monotonic()
+        if now < self._next_batch:
+            return
+        self._next_batch = now + self.batch_interval
+        self._batch_delivered.clear()
+        stats = self.decoder.stats()
+        if self.ring is not None:
+            stats.update(self.ring.stats())
+        batch = self.batch.take(stats)
+        batch.stats["frames_lost"] = self.latency.frames_lost
+        batch.emitted = time.time()
+        self.emit_batch(batch)
+
+    def run(self):
+        if self.shm_name:
+            self._run_shm()
+        else:
+            self._run_tcp()
+
+    def _run_tcp(self):
+        while not self._stop_event.is_set():
+            try:
+                # Create socket
+                self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                # Large kernel buffer so bursts of big frames are not throttled
+                self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, RECV_SIZE * 4)
+                self.socket.connect((self.host, self.port))
+                # Wake up regularly so pending batches go out even when the stream is idle
+                self.socket.settimeout(self.batch_interval)
+                self.emit_connection(True)
+
+                # Negotiate the wire protocol; old simulators reject it and we stay on JSON
+                self.decoder.reset()
+                self.active_protocol = PROTOCOL_JSON
+                if self.protocol != PROTOCOL_JSON:
+                    self.send_command("SET_PROTOCOL", protocol=self.protocol)
+
+                # Receive Loop
+                while not self._stop_event.is_set():
+                    try:
+                        # Received straight into the decoder's buffer; partial messages are kept
+                        dropped = self.decoder.frames_dropped
+                        messages = self.decoder.receive(self.socket)
+                        if messages is None:
+                            break
+
+                        for msg in messages:
+                            self.handle_message(msg)
+                        if self.decoder.frames_dropped != dropped:
+                            logging.warning(f"Dropped malformed frames: {self.decoder.stats()}")
+
+                    except socket.timeout:
+                        pass
+
+                    self.flush_batch()
+
+            except (ConnectionRefusedError, socket.timeout, OSError) as e:
+                logging.debug(f"Connection failed: {e}")
+                self._stop_event.wait(2)
+
+            except Exception as e:
+                logging.error(f"Thread error: {e}")
+                self._stop_event.wait(2)
+
+            finally:
+                self.socket.close()
+
+    def _run_shm(self):
+        while not self._stop_event.is_set():
+            try:
+                self.ring = ShmRingReader(self.shm_name)
+            except (FileNotFoundError, ValueError) as e:
+                # The simulator has not created the ring yet
+                logging.debug(f"Shared memory not available: {e}")
+                self._stop_event.wait(2)
+                continue
+
+            try:
+                self.emit_connection(True)
+                # The ring carries the same schema message TCP clients get on connect
+                self.handle_message(self.ring.schema)
+                # A closed ring means the simulator stopped or restarted with a new one
+                while not self._stop_event.is_set() and not self.ring.closed:
+                    # Same stage boundaries as TCP: 'network' is the time a frame waited in the ring
+                    self.decoder.received_at = time.time()
+                    last_seq = self.ring.last_seq
+                    for frame in self.ring.frames():
+                        self.handle_message(frame)
+                    self.flush_batch()
+                    if self.ring.last_seq == last_seq:
+                        self._stop_event.wait(SHM_POLL_INTERVAL)
+
+            except Exception as e:
+                logging.error(f"Thread error: {e}")
+                self._stop_event.wait(2)
+
+            finally:
+                self.ring.close()
+                self.ring = None
+                self.emit_connection(False)
+
+    def stop(self):
+        self._stop_event.set()
@@ -0,0 +1,222 @@
+import numpy as np
+from core.protocol import STATUS_LABELS
+
+class SensorState:
+    """
+    Latest value, status and timestamp of every sensor on the client side.
+
+    Keyframes overwrite the whole state, delta frames only the listed
+    positions, so the full picture is rebuilt from a change-only stream.
+
+    Input: Sensor IDs in schema order, optional per-sensor sample rates (Hz)
+    Output: Updated positions from apply(), reading dicts from readings()
+    """
+    def __init__(self, sensor_ids=(), sample_rates=None):
+        self.reset(sensor_ids, sample_rates)
+
+    def reset(self, sensor_ids, sample_rates=None):
+        self.sensor_ids = list(sensor_ids)
+        count = len(self.sensor_ids)
+        # 0 = one sample per frame; otherwise bursts are spread 1 / rate apart
+        self.sample_rates = np.zeros(count) if sample_rates is None else np.asarray(sample_rates, dtype=np.float64)
+        self.values = np.full(count, np.nan, dtype=np.float64)
+        self.status = np.zeros(count, dtype=np.uint8)
+        self.timestamps = np.zeros(count, dtype=np.float64)
+        self.synced = False  # True once a keyframe has been applied
+        self.keyframes = 0
+        self.deltas = 0
+
+    def apply(self, frame):
+        """
+        Merges one SensorFrame into the state.
+
+        Input: Keyframe or delta SensorFrame
+        Output: Array of updated positions (empty if the frame does not fit the schema)
+        """
+        count = len(self.sensor_ids)
+        # Same 2-decimal precision as the JSON frames (undoes float32 noise)
+        values = np.round(np.asarray(frame.values, dtype=np.float64), 2)
+        if frame.indices is None:
+            if values.size != count:
+                return np.empty(0, dtype=np.intp)
+            self.values[:] = values
+            self.status[:] = frame.status
+            self.timestamps.fill(frame.timestamp)
+            self.synced = True
+            self.keyframes += 1
+            return np.arange(count)
+
+        indices = np.asarray(frame.indices, dtype=np.intp)
+        if indices.size and indices.max() >= count:
+            return np.empty(0, dtype=np.intp)
+        self.values[indices] = values
+        self.status[indices] = frame.status
+        self.timestamps[indices] = frame.timestamp
+        self.deltas += 1
+        return indices
+
+    def burst_samples(self, frame):
+        """
+        Expands a frame's burst block into individual samples.
+
+        Input: SensorFrame (with or without a burst)
+        Output: (positions, times, values) arrays, or None if there is no usable burst
+        """
+        if frame.burst is None:
+            return None
+        positions, counts, samples = frame.burst
+        positions = np.asarray(positions, dtype=np.intp)
+        counts = np.asarray(counts, dtype=np.intp)
+        if not positions.size or positions.max() >= len(self.sensor_ids) or counts.sum() != len(samples):
+            return None
+        rates = self.sample_rates[positions]
+        if not (rates > 0).all():
+            return None  # Schema without sample rates: sample times are unknown
+
+        # Sample k of n was taken (n - 1 - k) / rate before the frame timestamp
+        owner = np.repeat(np.arange(positions.size), counts)
+        ends = np.cumsum(counts)
+        times = frame.timestamp - (ends[owner] - 1 - np.arange(owner.size)) / rates[owner]
+        values = np.round(np.asarray(samples, dtype=np.float64), 3)
+        return positions[owner], times, values
+
+    def readings(self, indices):
+        """Builds {sid: {value, status, timestamp}} for the given positions."""
+        sensor_ids = self.sensor_ids
+        return {
+            sensor_ids[i]: {"value": val, "status": STATUS_LABELS[code], "timestamp": ts}
+            for i, val, code, ts in zip(indices.tolist(), self.values[indices].tolist(),
+                                        self.status[indices].tolist(), self.timestamps[indices].tolist())
+        }
+
+class SampleBatch:
+    """
+    Everything received since the previous batch, handed to the GUI in one emit.
+
+    Snapshot: latest value/status/timestamp of each sensor that changed.
+    Samples: every (position, timestamp, value) received, in arrival order,
+             so plots keep points that the snapshot conflated away.
+
+    Input: Built by BatchAccumulator.take()
+    Output: None (plain container)
+    """
+    def __init__(self, sensor_ids, indices, values, status, timestamps,
+                 sample_index, sample_time, sample_value, frames, conflated, stats, frame_time=None):
+        self.sensor_ids = sensor_ids
+        self.indices = indices
+        self.values = values
+        self.status = status
+        self.timestamps = timestamps
+        self.sample_index = sample_index
+        self.sample_time = sample_time
+        self.sample_value = sample_value
+        self.frames = frames          # Frames merged into this batch
+        self.conflated = conflated    # Sensor updates overwritten before reaching the GUI
+        self.stats = stats            # Cumulative stream counters
+        self.frame_time = frame_time  # Timestamp of the newest frame merged in
+        self.emitted = None           # Set by CommThread when the batch is queued to the GUI
+
+    def readings(self):
+        """Snapshot as {sid: {value, status, timestamp}}."""
+        sensor_ids = self.sensor_ids
+        return {
+            sensor_ids[i]: {"value": val, "status": STATUS_LABELS[code], "timestamp": ts}
+            for i, val, code, ts in zip(self.indices.tolist(), self.values.tolist(),
+                                        self.status.tolist(), self.timestamps.tolist())
+        }
+
+    def samples_by_sensor(self, positions=None):
+        """
+        Groups the samples per sensor: {sid: (times, values)} with arrays in arrival order.
+
+        Input: Optional sensor positions to keep (e.g. only the plotted sensors; None = all)
+        Output: Dict of the sensors that have samples in this batch
+        """
+        index, sample_time, sample_value = self.sample_index, self.sample_time, self.sample_value
+        if positions is not None:
+            # Filter before grouping: splitting thousands of unwanted sensors dominates otherwise
+            wanted = np.zeros(len(self.sensor_ids), dtype=bool)
+            wanted[positions] = True
+            keep = wanted[index]
+            index, sample_time, sample_value = index[keep], sample_time[keep], sample_value[keep]
+        if not index.size:
+            return {}
+        order = np.argsort(index, kind='stable')
+        index = index[order]
+        bounds = np.flatnonzero(np.diff(index)) + 1
+        times = np.split(sample_time[order], bounds)
+        values = np.split(sample_value[order], bounds)
+        firsts = index[np.concatenate(([0], bounds))].tolist()
+        return {self.sensor_ids[i]: (t, v) for i, t, v in zip(firsts, times, values)}
+
+class BatchAccumulator:
+    """
+    Merges incoming frames into a latest-state snapshot plus an append-only
+    sample log until the GUI is ready for the next batch.
+
+    Input: SensorState shared with the receiving thread
+    Output: SampleBatch from take()
+    """
+    def __init__(self, state):
+        self.state = state
+        # Cumulative counters (survive take())
+        self.total_frames = 0
+        self.total_conflated = 0
+        self.batches = 0
+        self.clear()
+
+    def clear(self):
+        """Discards pending data (e.g. when the schema changes)."""
+        self._dirty = np.zeros(len(self.state.sensor_ids), dtype=bool)
+        self._chunks = []  # [(positions, values, timestamp or per-sample times)]
+        self.frames = 0
+        self.conflated = 0
+        self.newest = None
+
+    def add(self, updated, timestamp, burst=None):
+        """
+        Records the positions a frame just applied to the state.
+
+        Input: Updated positions, frame timestamp, optional (positions, times,
+               values) burst samples from SensorState.burst_samples()
+        Output: None
+        """
+        if self._dirty.size != len(self.state.sensor_ids):
+            self.clear()
+        overwritten = int(np.count_nonzero(self._dirty[updated]))
+        self._dirty[updated] = True
+        if burst is None:
+            self._chunks.append((updated, self.state.values[updated], timestamp))
+        else:
+            # Fast sensors contribute their burst instead of the single latest value
+            single = updated[~np.isin(updated, burst[0])]
+            self._chunks.append((single, self.state.values[single], timestamp))
+            self._chunks.append((burst[0], burst[2], burst[1]))
+        self.frames += 1
+        self.conflated += overwritten
+        if self.newest is None or timestamp > self.newest:
+            self.newest = timestamp
+        self.total_frames += 1
+        self.total_conflated += overwritten
+
+    def take(self, stats=None):
+        """Builds the batch for everything merged so far and starts a new one."""
+        indices = np.flatnonzero(self._dirty)
+        state = self.state
+        if self._chunks:
+            sample_index = np.concatenate([c[0] for c in self._chunks]).astype(np.intp)
+            sample_value = np.concatenate([c[1] for c in self._chunks])
+            sample_time = np.concatenate([np.broadcast_to(c[2], c[0].shape) for c in self._chunks]).astype(np.float64)
+        else:
+            sample_index = np.empty(0, dtype=np.intp)
+            sample_value = np.empty(0, dtype=np.float64)
+            sample_time = np.empty(0, dtype=np.float64)
+
+        self.batches += 1
+        counters = {"frames": self.total_frames, "conflated": self.total_conflated, "batches": self.batches}
+        counters.update(stats or {})
+        batch = SampleBatch(state.sensor_ids, indices, state.values[indices], state.status[indices],
+                            state.timestamps[indices], sample_index, sample_time, sample_value,
+                            self.frames, self.conflated, counters, self.newest)
+        self.clear()
+        return batch
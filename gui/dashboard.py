@@ -1,50 +1,130 @@
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-                             QLabel, QTableWidget, QTableWidgetItem, QHeaderView, QTabWidget, QTextEdit,
-                             QPushButton, QGridLayout, QGroupBox, QInputDialog, QMessageBox, QLineEdit)
+                             QLabel, QTableView, QHeaderView, QTabWidget, QTextEdit,
+                             QPushButton, QGridLayout, QGroupBox, QInputDialog, QMessageBox, QLineEdit,
+                             QScrollArea, QFrame)
 from PyQt6.QtCore import pyqtSlot, Qt, QTimer, QSize
-from PyQt6.QtGui import QColor, QFont, QIcon
+from PyQt6.QtGui import QFont, QIcon
 import pyqtgraph as pg
 import time
-from collections import deque
-from core.sensor_config import SENSOR_CONFIG
+import numpy as np
+from core.sensor_config import SENSOR_CONFIG, SIM_CONFIG, ALARM_CONFIG
 from core.notifications import NotificationManager
+from core.protocol import schema_to_config, STATUS_LABELS, STATUS_CODES, STATUS_FAULT
+from gui.sensor_table_model import SensorTableModel, ALARM_NONE, ALARM_FAULT, ALARM_LIMIT
+from core.history import RingHistory
+from core.decimate import minmax_decimate
+from core.rollup import RollupPyramid
+from core.alarms import (AlarmEngine, alarm_message, ALARM_NONE as STATE_NONE, ALARM_FAULT as STATE_FAULT,
+                         ALARM_LOW as STATE_LOW, ALARM_HIGH as STATE_HIGH)
+from core.latency import (STAGES, STAGE_LABELS, STAGE_QUEUE, STAGE_RENDER, STAGE_END_TO_END, STAGE_EVENT_LOOP,
+                          format_latency)
+
+# Trend plots are heavy widgets; sensors beyond this count are shown in the table only
+MAX_TREND_PLOTS = 50
+# Upper bound on stored samples per plotted sensor, whatever the data rate
+MAX_HISTORY_POINTS = 200000
+# Lower bound on min/max buckets per plot (used before the plot has been laid out)
+MIN_PLOT_BUCKETS = 100
+# Latency panel: event-loop probe period, panel refresh period and histogram window (ms)
+LAG_PROBE_MS = 100
+LATENCY_REFRESH_MS = 1000
+LATENCY_WINDOW_MS = 10000
+# Table colouring per alarm engine state (indexed by the state code)
+TABLE_ALARM_CLASSES = np.zeros(4, dtype=np.uint8)
+TABLE_ALARM_CLASSES[[STATE_NONE, STATE_FAULT, STATE_LOW, STATE_HIGH]] = [ALARM_NONE, ALARM_FAULT, ALARM_LIMIT, ALARM_LIMIT]
 
 class Dashboard(QMainWindow):
-    def __init__(self, comm_thread):
+    def __init__(self, comm_thread, fps=30):
         super().__init__()
         self.comm_thread = comm_thread
         self.setWindowTitle("ProLine Sensor Dashboard")
         self.resize(1200, 800)
 
-        # Data storage for plots (last 20 seconds @ 2Hz ~ 40-50 points)
-        self.history_len = 100 
-        # History keyed by Sensor ID
-        self.data_history = {sid: deque(maxlen=self.history_len) for sid in SENSOR_CONFIG}
-        self.time_history = {sid: deque(maxlen=self.history_len) for sid in SENSOR_CONFIG}
+        # Data storage for plots: live view width and how far back one can scroll,
+        # sized from the simulator's update rate
+        self.history_seconds = 20.0
+        self.history_retention = 4 * 3600.0
+        self.update_rate = SIM_CONFIG["update_rate"]
+        # Ring buffer per plotted Sensor ID (filled by build_sensor_views)
+        self.history = {}
+        # 1 s .. 10 min rollups of the plotted sensors, for ranges beyond the raw history
+        self.rollups = RollupPyramid(0)
+        self.plot_positions = {}  # {sid: column in the rollups}
+        # Plotted sensors' positions in the stream's sensor order, cached per sensor list
+        self._plotted_ids = None
+        self._plotted_stream_positions = np.empty(0, dtype=np.intp)
+        # Per plot: ViewBox, and whether it follows live data or was panned/zoomed away
+        self.plot_views = {}
+        self.follow_live = {}
+        self._applying_range = False
         self.start_time = time.time()
+
+        # Sensor metadata keyed by ID: local config until the simulator's schema arrives
+        self.sensor_info = {}
+
+        # Ingested state waiting to be drawn by render()
+        self.latest_readings = {}  # {sid: (reading, table alarm class)}
+        self.dirty_rows = set()
+        self.dirty_plots = set()
+        self.stream_stats = None
+
+        # Stage latency shared with the comm thread; the GUI fills queue/render/end-to-end
+        self.latency = comm_thread.latency
+        self._ingested_at = None        # Wall time of the first batch not yet rendered
+        self._pending_frame_time = None  # Newest frame timestamp not yet rendered
         
-        # Track last alarm message to prevent flooding (Deduplication)
+        # Alarm states as arrays (built by build_sensor_views); only transitions are logged
+        self.alarms = None
+        # Active alarm message per sensor
         self.alarm_states = {}
         
         # Notification System
         self.notifications = NotificationManager(self)
 
         self.setup_ui()
+        self.build_sensor_views(SENSOR_CONFIG)
         self.comm_thread.data_received.connect(self.update_data)
+        self.comm_thread.schema_received.connect(self.update_schema)
+
+        # Render loop: redraw cost follows the display rate, not the data rate
+        self.render_timer = QTimer(self)
+        self.render_timer.timeout.connect(self.render)
+        self.render_timer.start(max(1, int(1000 / fps)))
         self.comm_thread.connection_status.connect(self.update_status)
 
+        # Event-loop lag: how late a precise periodic timer actually fires
+        self._lag_expected = time.monotonic() + LAG_PROBE_MS / 1000.0
+        self.lag_timer = QTimer(self)
+        self.lag_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.lag_timer.timeout.connect(self.probe_event_loop)
+        self.lag_timer.start(LAG_PROBE_MS)
+        self.latency_timer = QTimer(self)
+        self.latency_timer.timeout.connect(self.refresh_latency_panel)
+        # Sends the alert digest once its window has passed, on the GUI thread (tray messages)
+        self.latency_timer.timeout.connect(self.notifications.poll)
+        self.latency_timer.start(LATENCY_REFRESH_MS)
+        self._latency_refreshes = 0
+
     def setup_ui(self):
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
         main_layout = QVBoxLayout(central_widget)
 
         # Header / Status
+        header_layout = QHBoxLayout()
         self.status_label = QLabel("DISCONNECTED")
         self.status_label.setStyleSheet("color: red; font-weight: bold; font-size: 16px;")
-        main_layout.addWidget(self.status_label)
+        # Stream counters (frames merged into GUI batches, conflated updates, dropped frames)
+        self.stream_label = QLabel("")
+        self.stream_label.setStyleSheet("color: #a6adc8; font-size: 12px;")
+        header_layout.addWidget(self.status_label)
+        header_layout.addStretch()
+        header_layout.addWidget(self.stream_label)
+        main_layout.addLayout(header_layout)
 
         # Tabs
         tabs = QTabWidget()
+        self.tabs = tabs
         main_layout.addWidget(tabs)
 
         # Dark Theme Palette
@@ -75,7 +155,7 @@ class Dashboard(QMainWindow):
                 background-color: #1e1e2e; /* Matches Window BG to look floating */
                 color: #89b4fa;
             }
-            QTableWidget {
+            QTableView {
                 background-color: #181825;
                 alternate-background-color: #1e1e2e;
                 color: #cdd6f4;
@@ -119,6 +199,10 @@ class Dashboard(QMainWindow):
                 background: #89b4fa;
                 color: #11111b; /* Dark text on bright tab */
             }
+            /* Scroll areas blend into their card */
+            QScrollArea, QScrollArea > QWidget, #trendsContainer {
+                background-color: transparent;
+            }
             /* Buttons */
             QPushButton {
                 background-color: #45475a;
@@ -150,27 +234,20 @@ class Dashboard(QMainWindow):
         table_group = QGroupBox("SENSOR READINGS")
         table_layout = QVBoxLayout(table_group)
         
-        self.sensor_table = QTableWidget()
+        # Model/view: readings live in arrays, the view only paints visible rows
         # [ID, Name, Value, Unit, Status, Time]
-        self.sensor_table.setColumnCount(6)
-        self.sensor_table.setHorizontalHeaderLabels(["ID", "Name", "Value", "Unit", "Status", "Time"])
+        self.table_model = SensorTableModel(STATUS_LABELS, self)
+        self.sensor_table = QTableView()
+        self.sensor_table.setModel(self.table_model)
         self.sensor_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        self.sensor_table.setRowCount(len(SENSOR_CONFIG))
         self.sensor_table.verticalHeader().setVisible(False)
+        # Uniform row heights so large tables never measure rows
+        self.sensor_table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.sensor_table.verticalHeader().setDefaultSectionSize(28)
         self.sensor_table.setAlternatingRowColors(True)
         # self.sensor_table.setStyleSheet("alternate-background-color: #444444;") # Handled by global css
-        
-        # Initialize Table
-        # Store row indices for each sensor ID
+        # Rows are created by build_sensor_views()
         self.sensor_rows = {}
-        for i, (sid, info) in enumerate(SENSOR_CONFIG.items()):
-            self.sensor_rows[sid] = i
-            self.sensor_table.setItem(i, 0, QTableWidgetItem(sid))
-            self.sensor_table.setItem(i, 1, QTableWidgetItem(info['name']))
-            self.sensor_table.setItem(i, 2, QTableWidgetItem("-"))
-            self.sensor_table.setItem(i, 3, QTableWidgetItem(info['unit']))
-            self.sensor_table.setItem(i, 4, QTableWidgetItem("-"))
-            self.sensor_table.setItem(i, 5, QTableWidgetItem("-"))
         
         table_layout.addWidget(self.sensor_table)
         left_layout.addWidget(table_group)
@@ -225,8 +302,23 @@ class Dashboard(QMainWindow):
         
         # CARD 2: Live Trends
         trends_group = QGroupBox("LIVE TRENDS (Last 20s)")
-        trends_layout = QVBoxLayout(trends_group)
+        trends_group_layout = QVBoxLayout(trends_group)
+        # Plots live in a scroll area so large sensor sets stay usable
+        trends_scroll = QScrollArea()
+        trends_scroll.setWidgetResizable(True)
+        trends_scroll.setFrameShape(QFrame.Shape.NoFrame)
+        # Plots are only created once scrolled (or resized) into view
+        trends_scroll.verticalScrollBar().valueChanged.connect(self.build_visible_plots)
+        trends_scroll.verticalScrollBar().rangeChanged.connect(self.build_visible_plots)
+        trends_container = QWidget()
+        trends_container.setObjectName("trendsContainer")
+        self.trends_layout = QVBoxLayout(trends_container)
+        self.trends_layout.setContentsMargins(0, 0, 0, 0)
+        trends_scroll.setWidget(trends_container)
+        trends_group_layout.addWidget(trends_scroll)
         self.plots = {}
+        self.plot_widgets = []
+        self.plot_slots = {}  # {sid: placeholder widget holding the plot once it is built}
         
         # msg_label = QLabel("LIVE TRENDS (Last 20s)")
         # msg_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -237,18 +329,7 @@ class Dashboard(QMainWindow):
         pg.setConfigOption('background', '#181825')
         pg.setConfigOption('foreground', '#cdd6f4')
         pg.setConfigOptions(antialias=True)
-
-        for sid, info in SENSOR_CONFIG.items():
-            title = f"{info['name']} ({sid})"
-            p = pg.PlotWidget(title=title)
-            p.showGrid(x=True, y=True, alpha=0.3)
-            p.setLabel('left', info['unit'])
-            p.getAxis('left').setPen('#888')
-            p.getAxis('bottom').setPen('#888')
-            
-            # Distinct color per plot could be nice, currently using yellow
-            self.plots[sid] = p.plot(pen=pg.mkPen('#89b4fa', width=2)) 
-            trends_layout.addWidget(p) # Add to GroupBox layout
+        # Plot widgets are created by build_sensor_views()
         
         plot_layout.addWidget(trends_group) # Add GroupBox to container
         
@@ -256,9 +337,113 @@ class Dashboard(QMainWindow):
         tabs.addTab(dash_tab, "Dashboard")
         
         # -- Maintenance Tab --
-        maint_tab = QWidget()
-        self.setup_maint_ui(maint_tab)
-        tabs.addTab(maint_tab, "Maintenance")
+        # Built on first selection; the system log collects messages until then
+        self.maint_tab = QWidget()
+        self.maint_built = False
+        self.is_unlocked = False
+        self.system_log = QTextEdit()
+        self.system_log.setReadOnly(True)
+        self.system_log.setStyleSheet("background-color: #1e1e1e; color: #50fa7b; font-family: Consolas; border: none;")
+        tabs.addTab(self.maint_tab, "Maintenance")
+        tabs.currentChanged.connect(self.on_tab_changed)
+
+    def on_tab_changed(self, index):
+        if self.tabs.widget(index) is self.maint_tab:
+            self.ensure_maintenance_ui()
+        else:
+            self.build_visible_plots()
+
+    def ensure_maintenance_ui(self):
+        """Builds the Maintenance tab the first time it is needed."""
+        if not self.maint_built:
+            self.maint_built = True
+            self.setup_maint_ui(self.maint_tab)
+            self.refresh_latency_panel(rotate=False)
+
+    def build_sensor_views(self, sensor_config):
+        """
+        (Re)builds the table rows, trend plots and histories for a sensor set.
+
+        Input: SENSOR_CONFIG-style dict keyed by sensor ID (local config or received schema)
+        Output: None
+        """
+        self.sensor_info = sensor_config
+        self.alarms = AlarmEngine(sensor_config, ALARM_CONFIG["hysteresis"], ALARM_CONFIG["debounce"])
+        self.alarm_states.clear()
+        self.latest_readings = {}
+        self.dirty_rows = set()
+        self.dirty_plots = set()
+
+        # Initialize Table
+        # Store row indices for each sensor ID
+        self.table_model.set_sensors(sensor_config)
+        self.sensor_rows = {sid: i for i, sid in enumerate(sensor_config)}
+
+        # Replace the trend plots: an empty slot per plotted sensor, the plot itself
+        # is built by build_visible_plots() once the slot is on screen
+        for widget in self.plot_slots.values():
+            self.trends_layout.removeWidget(widget)
+            widget.deleteLater()
+        self.plots = {}
+        self.plot_views = {}
+        self.plot_widgets = []
+        self.plot_slots = {}
+        plotted = list(sensor_config)[:MAX_TREND_PLOTS]
+        self.follow_live = {sid: True for sid in plotted}
+
+        for sid in plotted:
+            slot = QWidget()
+            slot.setMinimumHeight(120)
+            QVBoxLayout(slot).setContentsMargins(0, 0, 0, 0)
+            self.plot_slots[sid] = slot
+            self.trends_layout.addWidget(slot) # Add to scroll area layout
+
+        # Preallocated history for plotted sensors only, covering history_retention with headroom
+        # (fast sensors store sample_rate samples per second instead of one per frame)
+        self.history = {}
+        for sid in plotted:
+            rate = max(1.0 / self.update_rate, sensor_config[sid].get('sample_rate', 0.0))
+            self.history[sid] = RingHistory(min(MAX_HISTORY_POINTS, int(self.history_retention * rate) + 16))
+        self.plot_positions = {sid: i for i, sid in enumerate(plotted)}
+        self.rollups = RollupPyramid(len(plotted))
+        self._plotted_ids = None
+        # Once laid out (the slots have no geometry yet)
+        QTimer.singleShot(0, self.build_visible_plots)
+
+    def build_plot(self, sid):
+        """Creates the trend plot of a plotted sensor in its slot and queues its history for drawing."""
+        info = self.sensor_info[sid]
+        title = f"{info['name']} ({sid})"
+        p = pg.PlotWidget(title=title)
+        p.setMinimumHeight(120)
+        p.showGrid(x=True, y=True, alpha=0.3)
+        p.setLabel('left', info['unit'])
+        p.getAxis('left').setPen('#888')
+        p.getAxis('bottom').setPen('#888')
+
+        # X range is driven by render() (live) or the user (pan/zoom); Y fits the visible data
+        view = p.getViewBox()
+        view.enableAutoRange(x=False, y=True)
+        view.setAutoVisible(y=True)
+        view.sigXRangeChanged.connect(lambda _, x_range, sid=sid: self.on_plot_range_changed(sid, x_range))
+        self.plot_views[sid] = view
+
+        # Distinct color per plot could be nice, currently using yellow
+        self.plots[sid] = p.plot(pen=pg.mkPen('#89b4fa', width=2))
+        self.plot_widgets.append(p)
+        self.plot_slots[sid].layout().addWidget(p)
+        self.dirty_plots.add(sid)
+
+    def build_visible_plots(self, *args):
+        """Builds the plots whose slots are (at least partly) visible on screen."""
+        # Slots added since the last layout pass still sit on top of each other; until the
+        # scroll area has grown the container to fit them (its range change calls again)
+        self.trends_layout.activate()
+        if self.trends_layout.parentWidget().height() < self.trends_layout.minimumSize().height():
+            return
+        for sid, slot in self.plot_slots.items():
+            if sid not in self.plots and not slot.visibleRegion().isEmpty():
+                self.build_plot(sid)
 
     def setup_maint_ui(self, tab_widget):
         layout = QVBoxLayout(tab_widget)
@@ -339,17 +524,40 @@ class Dashboard(QMainWindow):
         log_group = QGroupBox("Live System Log (Debug)")
         log_group.setStyleSheet("QGroupBox { font-weight: bold; border: 1px solid #555; margin-top: 10px; } QGroupBox::title { subcontrol-origin: margin; left: 10px; padding: 0 5px; }")
         log_layout = QVBoxLayout(log_group)
-        
-        self.system_log = QTextEdit()
-        self.system_log.setReadOnly(True)
-        self.system_log.setStyleSheet("background-color: #1e1e1e; color: #50fa7b; font-family: Consolas; border: none;")
-        
         log_layout.addWidget(self.system_log)
-        layout.addWidget(log_group, stretch=1)
+
+        # 4. Stream Latency (next to the log)
+        latency_group = QGroupBox("Stream Latency")
+        latency_group.setStyleSheet("QGroupBox { font-weight: bold; border: 1px solid #555; margin-top: 10px; } QGroupBox::title { subcontrol-origin: margin; left: 10px; padding: 0 5px; }")
+        latency_layout = QGridLayout(latency_group)
+        for col, title in enumerate(("Stage", "p50", "p95", "p99", "Samples")):
+            header = QLabel(title)
+            header.setStyleSheet("color: #a6adc8; font-size: 12px;")
+            latency_layout.addWidget(header, 0, col)
+        self.latency_labels = {}
+        for row, stage in enumerate(STAGES, start=1):
+            latency_layout.addWidget(QLabel(STAGE_LABELS[stage]), row, 0)
+            cells = []
+            for col in range(1, 5):
+                cell = QLabel("-")
+                cell.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                cell.setStyleSheet("font-family: Consolas;")
+                latency_layout.addWidget(cell, row, col)
+                cells.append(cell)
+            self.latency_labels[stage] = cells
+        self.lbl_frames_lost = QLabel("Frames lost: 0 (0 gaps)")
+        latency_layout.addWidget(self.lbl_frames_lost, len(STAGES) + 1, 0, 1, 5)
+        self.lbl_alert_queue = QLabel("")
+        latency_layout.addWidget(self.lbl_alert_queue, len(STAGES) + 2, 0, 1, 5)
+        latency_layout.setRowStretch(len(STAGES) + 3, 1)
+
+        bottom_layout = QHBoxLayout()
+        bottom_layout.addWidget(log_group, stretch=3)
+        bottom_layout.addWidget(latency_group, stretch=2)
+        layout.addLayout(bottom_layout, stretch=1)
 
         # Initially Disable Controls
         self.set_controls_enabled(False)
-        self.is_unlocked = False
 
     def set_controls_enabled(self, enabled):
         self.btn_reset.setEnabled(enabled)
@@ -411,6 +619,8 @@ class Dashboard(QMainWindow):
             self.fault_log.clear()
         if hasattr(self, 'limit_log'):
             self.limit_log.clear()
+        # Alarms still active are logged again on their next reading
+        self.alarms.reset()
         self.alarm_states.clear()
         self.system_log.append("Local Logs Cleared.")
 
@@ -424,100 +634,201 @@ class Dashboard(QMainWindow):
             self.status_label.setStyleSheet("color: red; font-weight: bold; font-size: 16px;")
 
     @pyqtSlot(dict)
-    def update_data(self, data):
-        current_time = time.time()
-        time_rel = current_time - self.start_time
-
-        # Data is now a dict keyed by Sensor ID
-        for sid, reading in data.items():
-            if sid in SENSOR_CONFIG:
-                val = reading['value']
-                status = reading['status']
-                timestamp = reading['timestamp']
-                
-                # Get Config for limits/name
-                info = SENSOR_CONFIG[sid]
-                name = info['name']
-
-                # Update Table
-                row = self.sensor_rows[sid]
-                self.sensor_table.item(row, 2).setText(str(val))
-                self.sensor_table.item(row, 4).setText(status)
-                self.sensor_table.item(row, 5).setText(time.strftime("%H:%M:%S", time.localtime(timestamp)))
-
-                # Check Limits & Color
-                low, high = info['limits']
-                bg_color = None
-                text_color = QColor("#ffffff") # Default white text
-                
-                alarm_msg = None
-                alarm_type = "NONE" # NONE, FAULT, LIMIT
-
-                if status != "OK":
-                    bg_color = QColor("#bd93f9") # Dracula Purple for Fault
-                    text_color = QColor("#000000") 
-                    alarm_msg = f"FAULT: {status}"
-                    alarm_type = "FAULT"
-                elif val < low:
-                    bg_color = QColor("#ff5555") # Red for ALL Limits
-                    text_color = QColor("#000000") # Black text
-                    alarm_msg = f"LOW LIMIT: {val} < {low}"
-                    alarm_type = "LIMIT"
-                elif val > high:
-                    bg_color = QColor("#ff5555") # Red for ALL Limits
-                    text_color = QColor("#000000") # Black text
-                    alarm_msg = f"HIGH LIMIT: {val} > {high}"
-                    alarm_type = "LIMIT"
-                else:
-                    # Default: Transparent to let alternating row colors show
-                    bg_color = QColor(0, 0, 0, 0)
-
-                # Colorize row
-                for col in range(6):
-                    item = self.sensor_table.item(row, col)
-                    # Only override background if it's an alarm
-                    if alarm_msg:
-                        item.setBackground(bg_color)
-                        item.setForeground(text_color)
-                        item.setFont(QFont("Segoe UI", 9, QFont.Weight.Bold))
-                    else:
-                        # Restore default look
-                        item.setBackground(bg_color) # Transparent
-                        item.setForeground(QColor("#cdd6f4")) # Theme Text Color
-                        item.setFont(QFont("Segoe UI", 9, QFont.Weight.Normal))
-
-                # Log Alarm if needed
-                if alarm_msg:
-                    if alarm_type == "FAULT":
-                        alarm_msg += " (under fixation)"
-
-                    # Check for duplicates (Deduplication)
-                    last_msg = self.alarm_states.get(sid)
-                    
-                    if last_msg != alarm_msg:
-                        t_str = time.strftime("%H:%M:%S")
-                        log_entry = f"[{t_str}] {name} ({sid}) - {alarm_msg}"
-                        
-                        if alarm_type == "FAULT":
-                            self.fault_log.append(log_entry)
-                            # Trigger Notification
-                            self.notifications.send_alert(sid, name, f"Sensor Fault detected: {status}", "FAULT")
-                        elif alarm_type == "LIMIT":
-                            self.limit_log.append(log_entry)
-                            # Trigger Notification
-                            self.notifications.send_alert(sid, name, f"Limit Exceeded: {val}", "LIMIT")
-                            
-                        self.alarm_states[sid] = alarm_msg
-                else:
-                    # Reset alarm state when back to normal
-                    if sid in self.alarm_states:
-                        del self.alarm_states[sid]
-
-                # Update Plots
-                self.data_history[sid].append(val)
-                self.time_history[sid].append(time_rel)
-                self.plots[sid].setData(list(self.time_history[sid]), list(self.data_history[sid]))
+    def update_schema(self, schema):
+        """Rebuilds the sensor views from the schema the simulator sent on connect."""
+        sensor_config = schema_to_config(schema)
+        update_rate = schema.get("update_rate", self.update_rate)
+        if sensor_config != self.sensor_info or update_rate != self.update_rate:
+            self.update_rate = update_rate
+            self.build_sensor_views(sensor_config)
+        self.system_log.append(f"Schema received: {len(sensor_config)} sensors.")
+
+    def update_stream_stats(self, stats):
+        self.stream_label.setText(
+            f"Frames: {stats.get('frames', 0)} | Batches: {stats.get('batches', 0)} | "
+            f"Conflated: {stats.get('conflated', 0)} | Dropped: {stats.get('frames_dropped', 0)}"
+        )
+
+    @pyqtSlot(object)
+    def update_data(self, batch):
+        """
+        Ingests a batch from CommThread into in-memory state.
+
+        Alarms are evaluated for every reading (only state changes are logged
+        and notified), but the table and plots are only marked dirty; render()
+        draws them at the display rate.
+        """
+        self.stream_stats = batch.stats
+        now = time.time()
+        if batch.emitted is not None:
+            self.latency.record(STAGE_QUEUE, now - batch.emitted)
+        if self._ingested_at is None:
+            self._ingested_at = now
+        if batch.frame_time is not None and (self._pending_frame_time is None or
+                                             batch.frame_time > self._pending_frame_time):
+            self._pending_frame_time = batch.frame_time
+
+        # Latest reading per changed sensor, keyed by Sensor ID
+        data = batch.readings()
+        # Alarm states for the whole batch in one vectorized pass; only changes are logged/notified
+        positions, transitions = self.alarms.evaluate_batch(batch)
+        classes = TABLE_ALARM_CLASSES[self.alarms.state[positions]].tolist()
+        sensor_ids = self.alarms.sensor_ids
+        for pos, alarm_class in zip(positions.tolist(), classes):
+            sid = sensor_ids[pos]
+            self.latest_readings[sid] = (data[sid], alarm_class)
+            self.dirty_rows.add(sid)
+
+        for pos, current, val, code in zip(transitions.positions.tolist(), transitions.current.tolist(),
+                                           transitions.values.tolist(), transitions.status.tolist()):
+            sid = sensor_ids[pos]
+            if current == STATE_NONE:
+                # Reset alarm state when back to normal
+                self.alarm_states.pop(sid, None)
+                continue
+
+            info = self.sensor_info[sid]
+            name = info['name']
+            alarm_msg = alarm_message(current, val, code, info['limits'])
+            log_entry = f"[{time.strftime('%H:%M:%S')}] {name} ({sid}) - {alarm_msg}"
+            if current == STATE_FAULT:
+                self.fault_log.append(log_entry)
+                self.notifications.send_alert(sid, name, f"Sensor Fault detected: {STATUS_LABELS[code]}", "FAULT",
+                                              info['type'])
+            else:
+                self.limit_log.append(log_entry)
+                self.notifications.send_alert(sid, name, f"Limit Exceeded: {val}", "LIMIT", info['type'])
+            self.alarm_states[sid] = alarm_msg
+
+        # Keep every sample in the batch for the plots, not only the latest
+        rollup_samples = []
+        plotted = self.plotted_stream_positions(batch.sensor_ids)
+        for sid, (times, values) in batch.samples_by_sensor(plotted).items():
+            if sid in self.history:
+                rollup_samples.append((np.full(len(times), self.plot_positions[sid]), times, values))
+                times = times - self.start_time
+                self.history[sid].extend(times, values)
+                # Plots scrolled back in time only redraw if the new data lands in view
+                if self.follow_live[sid] or times[0] <= self.plot_views[sid].viewRange()[0][1]:
+                    self.dirty_plots.add(sid)
+        if rollup_samples:
+            # One incremental update of every rollup level for the whole batch
+            self.rollups.add(*(np.concatenate(column) for column in zip(*rollup_samples)))
+
+    def plotted_stream_positions(self, sensor_ids):
+        """Positions of the plotted sensors in a batch's sensor order (recomputed when the list changes)."""
+        if sensor_ids is not self._plotted_ids:
+            lookup = {sid: i for i, sid in enumerate(sensor_ids)}
+            self._plotted_stream_positions = np.array([lookup[sid] for sid in self.history if sid in lookup],
+                                                      dtype=np.intp)
+            self._plotted_ids = sensor_ids
+        return self._plotted_stream_positions
+
+    def on_plot_range_changed(self, sid, x_range):
+        """
+        Handles a user pan/zoom on a trend plot.
+
+        The plot keeps following live data while its right edge is at the
+        newest sample; otherwise it stays where the user left it.
+        """
+        if self._applying_range or sid not in self.history:
+            return
+        times, _ = self.history[sid].view()
+        newest = times[-1] if len(times) else 0.0
+        self.follow_live[sid] = x_range[1] >= newest - self.update_rate
+        self.dirty_plots.add(sid)
+
+    def render(self):
+        """Repaints only the table rows and plots that changed since the last frame."""
+        if self.stream_stats is not None:
+            self.update_stream_stats(self.stream_stats)
+            self.stream_stats = None
+
+        dirty_rows, self.dirty_rows = self.dirty_rows, set()
+        if dirty_rows:
+            # One array update for the table; the model signals contiguous row ranges
+            rows, values, status, timestamps, alarms = [], [], [], [], []
+            for sid in dirty_rows:
+                reading, alarm_class = self.latest_readings[sid]
+                rows.append(self.sensor_rows[sid])
+                values.append(reading['value'])
+                status.append(STATUS_CODES.get(reading['status'], STATUS_FAULT))
+                timestamps.append(reading['timestamp'])
+                alarms.append(alarm_class)
+            self.table_model.update_rows(rows, values, status, timestamps, alarms)
+
+        dirty_plots, self.dirty_plots = self.dirty_plots, set()
+        for sid in dirty_plots:
+            if sid not in self.plots:
+                # Not built yet: drawn from the history once it is scrolled into view
+                continue
+            # Contiguous views into the ring buffer: no per-update lists
+            times, values = self.history[sid].view()
+            view = self.plot_views[sid]
+            if self.follow_live[sid] and len(times):
+                x_start, x_end = times[-1] - self.history_seconds, times[-1]
+                self._applying_range = True
+                view.setXRange(x_start, x_end, padding=0)
+                self._applying_range = False
+            else:
+                x_start, x_end = view.viewRange()[0]
+            # At most a min/max pair per pixel column of the visible range: raw samples
+            # when they cover it at sub-second detail, otherwise the matching rollup level
+            buckets = max(int(view.width()), MIN_PLOT_BUCKETS)
+            raw_start = times[0] + self.start_time if len(times) else None
+            level = self.rollups.choose_level(x_start + self.start_time, x_end + self.start_time, buckets, raw_start)
+            if level is None:
+                self.plots[sid].setData(*minmax_decimate(times, values, x_start, x_end, buckets))
+            else:
+                env_times, env_values = self.rollups.envelope(level, x_start + self.start_time,
+                                                              x_end + self.start_time, self.plot_positions[sid])
+                self.plots[sid].setData(env_times - self.start_time, env_values)
+
+        if self._ingested_at is not None:
+            # Everything ingested so far is on screen now
+            now = time.time()
+            self.latency.record(STAGE_RENDER, now - self._ingested_at)
+            if self._pending_frame_time is not None:
+                self.latency.record(STAGE_END_TO_END, now - self._pending_frame_time)
+            self._ingested_at = self._pending_frame_time = None
+
+    def probe_event_loop(self):
+        """Records how late the lag timer fired (time the event loop was busy elsewhere)."""
+        now = time.monotonic()
+        self.latency.record(STAGE_EVENT_LOOP, max(0.0, now - self._lag_expected))
+        self._lag_expected = now + LAG_PROBE_MS / 1000.0
+
+    def refresh_latency_panel(self, rotate=True):
+        """Shows the rolling per-stage percentiles and sequence gaps in the Maintenance tab."""
+        if self.maint_built:
+            self._show_latency_panel()
+        if not rotate:
+            return
+        self._latency_refreshes += 1
+        if self._latency_refreshes * LATENCY_REFRESH_MS >= LATENCY_WINDOW_MS:
+            self._latency_refreshes = 0
+            self.latency.rotate()
+
+    def _show_latency_panel(self):
+        for stage, row in self.latency.summary().items():
+            cells = self.latency_labels[stage]
+            for cell, key in zip(cells, ("p50", "p95", "p99")):
+                cell.setText(format_latency(row[key]))
+            cells[3].setText(str(row["count"]))
+        self.lbl_frames_lost.setText(f"Frames lost: {self.latency.frames_lost} ({self.latency.gaps} gaps)")
+        alerts = self.notifications.stats()
+        self.lbl_alert_queue.setText(
+            f"Alert queue: {alerts['depth']} (max {alerts['max_depth']}) | Sent: {alerts['sent']} | "
+            f"Retries: {alerts['retries']} | Failed: {alerts['failed']} | Dropped: {alerts['dropped']} | "
+            f"Digests: {alerts['digests']}"
+        )
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Slots get their on-screen geometry once the window is laid out
+        QTimer.singleShot(0, self.build_visible_plots)
 
     def closeEvent(self, event):
         self.comm_thread.stop()
+        self.notifications.close(timeout=2.0)
         event.accept()
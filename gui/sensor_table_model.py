@@ -0,0 +1,126 @@
+import time
+import numpy as np
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt6.QtGui import QBrush, QColor, QFont
+
+# Alarm classes shown by the table
+ALARM_NONE = 0
+ALARM_FAULT = 1
+ALARM_LIMIT = 2
+
+class SensorTableModel(QAbstractTableModel):
+    """
+    Table model for the SENSOR READINGS view.
+
+    Readings live in NumPy arrays (one slot per row) and role data is served
+    from brushes and fonts built once, so the view only asks for the rows it
+    actually paints. update_rows() signals dataChanged per contiguous run of
+    changed rows instead of per cell.
+
+    Input: SENSOR_CONFIG-style dict via set_sensors(), readings via update_rows()
+    Output: Qt model data for a QTableView
+    """
+    HEADERS = ["ID", "Name", "Value", "Unit", "Status", "Time"]
+    COL_VALUE = 2
+    COL_STATUS = 4
+    COL_TIME = 5
+
+    def __init__(self, status_labels, parent=None):
+        super().__init__(parent)
+        self.status_labels = status_labels
+
+        # Cached role data
+        self._background = {
+            ALARM_NONE: QBrush(QColor(0, 0, 0, 0)),  # Transparent to let alternating row colors show
+            ALARM_FAULT: QBrush(QColor("#bd93f9")),  # Dracula Purple for Fault
+            ALARM_LIMIT: QBrush(QColor("#ff5555")),  # Red for ALL Limits
+        }
+        self._foreground = {
+            ALARM_NONE: QBrush(QColor("#cdd6f4")),   # Theme Text Color
+            ALARM_FAULT: QBrush(QColor("#000000")),
+            ALARM_LIMIT: QBrush(QColor("#000000")),
+        }
+        self._font_normal = QFont("Segoe UI", 9, QFont.Weight.Normal)
+        self._font_alarm = QFont("Segoe UI", 9, QFont.Weight.Bold)
+
+        self.set_sensors({})
+
+    def set_sensors(self, sensor_config):
+        """Replaces the rows with a new sensor set; readings start empty ("-")."""
+        self.beginResetModel()
+        self.sensor_ids = list(sensor_config)
+        self.names = [info['name'] for info in sensor_config.values()]
+        self.units = [info['unit'] for info in sensor_config.values()]
+        count = len(self.sensor_ids)
+        self.values = np.zeros(count, dtype=np.float64)
+        self.status = np.zeros(count, dtype=np.uint8)
+        self.timestamps = np.zeros(count, dtype=np.float64)
+        self.alarms = np.zeros(count, dtype=np.uint8)
+        self.has_data = np.zeros(count, dtype=bool)
+        self.endResetModel()
+
+    def update_rows(self, rows, values, status, timestamps, alarms):
+        """
+        Stores new readings for a set of rows and notifies the view.
+
+        Input: Row indices and matching value/status/timestamp/alarm arrays
+        Output: None (emits dataChanged once per contiguous run of rows)
+        """
+        rows = np.asarray(rows, dtype=np.intp)
+        if not rows.size:
+            return
+        self.values[rows] = values
+        self.status[rows] = status
+        self.timestamps[rows] = timestamps
+        self.alarms[rows] = alarms
+        self.has_data[rows] = True
+
+        rows = np.unique(rows)
+        breaks = np.flatnonzero(np.diff(rows) != 1)
+        starts = np.concatenate(([rows[0]], rows[breaks + 1]))
+        ends = np.concatenate((rows[breaks], [rows[-1]]))
+        last_col = len(self.HEADERS) - 1
+        for first, last in zip(starts.tolist(), ends.tolist()):
+            self.dataChanged.emit(self.index(first, 0), self.index(last, last_col))
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.sensor_ids)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row, col = index.row(), index.column()
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if col == 0:
+                return self.sensor_ids[row]
+            if col == 1:
+                return self.names[row]
+            if col == 3:
+                return self.units[row]
+            if not self.has_data[row]:
+                return "-"
+            if col == self.COL_VALUE:
+                return str(float(self.values[row]))
+            if col == self.COL_STATUS:
+                return self.status_labels[self.status[row]]
+            return time.strftime("%H:%M:%S", time.localtime(self.timestamps[row]))
+
+        if not self.has_data[row]:
+            return None  # Default look until the first reading
+        alarm = int(self.alarms[row])
+        if role == Qt.ItemDataRole.BackgroundRole:
+            return self._background[alarm]
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return self._foreground[alarm]
+        if role == Qt.ItemDataRole.FontRole:
+            return self._font_alarm if alarm else self._font_normal
+        return None
@@ -1,30 +1,124 @@
 import sys
+import signal
 import argparse
 import logging
-from PyQt6.QtWidgets import QApplication
-from gui.dashboard import Dashboard
-from core.comm_thread import CommThread
-from core.sensor_config import HOST, PORT
+from core.startup import StartupProfile
+
+# Started before the remaining imports so --profile-startup covers them
+PROFILE = StartupProfile()
+
+from core.sensor_config import HOST, PORT, SHM_NAME
+from core.protocol import PROTOCOLS, PROTOCOL_BINARY
+from core.store import SegmentStore
+PROFILE.mark("import core (numpy)")
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+def run_headless(args, recorder):
+    """Monitors without Qt: alarm lines to stdout or --alarm-log, status lines to stderr."""
+    from core.headless import HeadlessMonitor
+    PROFILE.mark("import headless monitor")
+    output = open(args.alarm_log, "a", encoding="utf-8") if args.alarm_log else sys.stdout
+    monitor = HeadlessMonitor(host=args.host, port=args.port, protocol=args.protocol, recorder=recorder,
+                              shm_name=args.shm, output=output, status_interval=args.status_interval)
+    signal.signal(signal.SIGTERM, lambda signum, frame: monitor.stop())
+    PROFILE.mark("monitor created")
+    if args.profile_startup:
+        logging.info(PROFILE.report())
+    try:
+        monitor.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if recorder is not None:
+            recorder.stop()
+        if output is not sys.stdout:
+            output.close()
+    return 0
+
+def profile_first_values(window, comm_thread, QTimer):
+    """Marks the first paint and the first rendered batch, then logs the startup profile."""
+    def on_first_paint():
+        PROFILE.mark("first paint")
+        logging.info(PROFILE.report())
+
+    def on_first_batch(batch):
+        comm_thread.data_received.disconnect(on_first_batch)
+        PROFILE.mark("first batch received")
+        # Runs right after the next Dashboard.render()
+        window.render_timer.timeout.connect(on_first_render)
+
+    def on_first_render():
+        window.render_timer.timeout.disconnect(on_first_render)
+        PROFILE.mark("first values drawn")
+        logging.info(PROFILE.report())
+
+    QTimer.singleShot(0, on_first_paint)
+    comm_thread.data_received.connect(on_first_batch)
+
+def run_dashboard(args, recorder):
+    # Qt is only imported for the GUI, so --headless never loads it
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtCore import QTimer
+    PROFILE.mark("import PyQt6")
+    from gui.dashboard import Dashboard
+    from core.comm_thread import CommThread
+    PROFILE.mark("import dashboard (pyqtgraph)")
+
+    app = QApplication(sys.argv)
+    PROFILE.mark("QApplication")
+
+    comm_thread = CommThread(host=args.host, port=args.port, protocol=args.protocol, recorder=recorder,
+                             shm_name=args.shm)
+    window = Dashboard(comm_thread, fps=args.fps)
+    PROFILE.mark("Dashboard()")
+
+    window.show()
+    comm_thread.start()
+    PROFILE.mark("window shown")
+    if args.profile_startup:
+        profile_first_values(window, comm_thread, QTimer)
+
+    exit_code = app.exec()
+    if recorder is not None:
+        # No more frames after the comm thread is done; then write out what is still queued
+        comm_thread.stop()
+        recorder.stop()
+    return exit_code
+
 def main():
     parser = argparse.ArgumentParser(description="ProLine Sensor Dashboard")
     parser.add_argument("-p", "--port", type=int, default=PORT, help="Port to connect to")
     parser.add_argument("--host", type=str, default=HOST, help="Host to connect to")
-    
+    parser.add_argument("--protocol", choices=PROTOCOLS, default=PROTOCOL_BINARY,
+                        help="Wire protocol to request from the simulator (falls back to json)")
+    parser.add_argument("--shm", nargs="?", const=SHM_NAME, default=None, metavar="NAME",
+                        help=f"Read frames from the simulator's shared-memory ring (same host; default name "
+                             f"{SHM_NAME}) instead of TCP; commands still use --host/--port")
+    parser.add_argument("--fps", type=int, default=30, help="Maximum dashboard redraw rate (frames per second)")
+    parser.add_argument("--record-dir", type=str, default=None,
+                        help="Record every received reading to memory-mapped segments in this directory")
+    parser.add_argument("--headless", action="store_true",
+                        help="Monitor alarms and send notifications without the GUI (no Qt)")
+    parser.add_argument("--alarm-log", type=str, default=None,
+                        help="Headless: append alarm lines to this file instead of stdout")
+    parser.add_argument("--status-interval", type=float, default=10.0,
+                        help="Headless: seconds between status lines on stderr")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="Log a breakdown of import and initialization time (and time to first live values)")
+
     args = parser.parse_args()
 
-    app = QApplication(sys.argv)
-    
-    comm_thread = CommThread(host=args.host, port=args.port)
-    window = Dashboard(comm_thread)
-    
-    window.show()
-    comm_thread.start()
-    
-    sys.exit(app.exec())
+    recorder = None
+    if args.record_dir:
+        recorder = SegmentStore(args.record_dir)
+        recorder.start()
+        logging.info(f"Recording to {args.record_dir}")
+
+    if args.headless:
+        sys.exit(run_headless(args, recorder))
+    sys.exit(run_dashboard(args, recorder))
 
 if __name__ == "__main__":
     main()
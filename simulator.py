@@ -4,18 +4,79 @@ import time
 import random
 import threading
 import argparse
-import select
-from core.sensor_config import HOST, PORT, SENSOR_CONFIG, SIM_CONFIG
+import selectors
+import numpy as np
+from core.sensor_config import HOST, PORT, SHM_NAME, SENSOR_CONFIG, SIM_CONFIG
+from core.sim_engine import VectorSimEngine, BurstGenerator
+from core.protocol import (PROTOCOL_JSON, PROTOCOL_BINARY, PROTOCOLS, STATUS_LABELS, SensorFrame,
+                           build_schema, encode_json, encode_json_frame, encode_binary_frame)
+from core.replay import ReplaySource, FrameRecorder
+from core.shm_transport import ShmRingWriter
+
+# Upper bound for a single unterminated command before it is discarded
+MAX_COMMAND_BYTES = 65536
+# Virtual clock mode: first frame time (fixed, so runs are reproducible)
+VIRTUAL_EPOCH = 1_700_000_000.0
+
+class _ClientSession:
+    """Per-connection state kept by the broadcast server."""
+    def __init__(self, conn, addr):
+        self.conn = conn
+        self.addr = addr
+        self.fd = conn.fileno()
+        self.inbox = bytearray()   # Partial command bytes
+        self.outbox = bytearray()  # Bytes not yet accepted by the kernel
+        self.protocol = PROTOCOL_JSON  # Until the client negotiates otherwise
+        self.needs_keyframe = True     # Delta mode: next frame for this client must be full
+        self.frames_dropped = 0
 
 class SensorSimulator:
-    def __init__(self, host=HOST, port=PORT, sensor_config=None, sim_config=None):
+    def __init__(self, host=HOST, port=PORT, sensor_config=None, sim_config=None, vectorized=False, delta=False,
+                 source=None, record_path=None, seed=None, virtual_clock=False, shm_name=None):
         self.host = host
         self.port = port
+        # Optional ReplaySource: recorded frames (and their sensor set) replace the random walk
+        self.source = source
+        if source is not None:
+            sensor_config = source.sensor_config
         self.sensor_config = sensor_config if sensor_config else SENSOR_CONFIG
         self.sim_config = sim_config if sim_config else SIM_CONFIG
+        # Optional recording of every generated frame (opened by start())
+        self.record_path = record_path
+        self.recorder = None
+        # Optional shared-memory ring every full frame is also published to (opened by start())
+        self.shm_name = shm_name
+        self.shm = None
+        self._replay_reported = False
         self._stop_event = threading.Event()
+        self._ready_event = threading.Event()
+        self._selector = None
+        self.clients = {}  # {fileno: _ClientSession}
+        self.frame_seq = 0
+        self._schema_payload = b""
+
+        # Delta mode: only sensors that moved past their deadband (or changed status)
+        # are sent, with a full keyframe every keyframe_interval frames
+        self.delta = delta
+        self.deadbands = self._build_deadbands()
+        self._sent_values = None  # Last broadcast value/status per sensor
+        self._sent_status = None
+        self._frames_since_keyframe = 0
         self.paused = False
+
+        # Reproducible runs: a seeded RNG, and optionally a simulated clock that advances
+        # one update_rate per frame while frames go out as fast as clients take them
+        self.rng = random.Random(seed)
+        self.virtual_clock = virtual_clock
+        self.virtual_time = self.sim_config.get("virtual_start", VIRTUAL_EPOCH)
         
+        # Array-backed engine for large sensor counts (None = per-sensor loop)
+        self.engine = VectorSimEngine(self.sensor_config, self.sim_config, seed=seed) if vectorized else None
+        # Multi-sample bursts for sensors with their own sample_rate (replays carry recorded bursts)
+        self.bursts = None
+        if source is None and any('sample_rate' in info for info in self.sensor_config.values()):
+            self.bursts = BurstGenerator(self.sensor_config, self.sim_config, seed=seed)
+
         # Initialize fault states: {sid: start_time_of_fault or None}
         self.fault_states = {sid: None for sid in self.sensor_config}
         
@@ -25,12 +86,25 @@ class SensorSimulator:
 
     def reset_simulation(self):
         """Resets all sensor values to default."""
-        for sid, info in self.sensor_config.items():
-            low, high = info['limits']
-            self.current_values[sid] = (low + high) / 2
-        self.fault_states = {sid: None for sid in self.sensor_config}
+        if self.source:
+            self.source.rewind()
+            self._replay_reported = False
+        elif self.engine:
+            self.engine.reset()
+        else:
+            for sid, info in self.sensor_config.items():
+                low, high = info['limits']
+                self.current_values[sid] = (low + high) / 2
+            self.fault_states = {sid: None for sid in self.sensor_config}
         print("Simulation Reset")
 
+    def clear_faults(self):
+        """Clears every active sticky fault."""
+        if self.engine:
+            self.engine.clear_faults()
+        else:
+            self.fault_states = {sid: None for sid in self.sensor_config}
+
     def process_command(self, cmd_data):
         """Handles incoming JSON commands."""
         try:
@@ -41,7 +115,7 @@ class SensorSimulator:
                 self.reset_simulation()
                 return {"status": "OK", "message": "Simulation Reset"}
             elif cmd == "CLEAR_FAULTS":
-                self.fault_states = {sid: None for sid in self.sensor_config}
+                self.clear_faults()
                 print("Faults Cleared")
                 return {"status": "OK", "message": "Faults Cleared"}
             elif cmd == "TOGGLE_SIM":
@@ -55,8 +129,18 @@ class SensorSimulator:
             print(f"Command Error: {e}")
             return {"status": "ERROR", "message": str(e)}
 
+    def next_timestamp(self):
+        """Time of the next frame: wall clock, or the virtual clock advanced by one tick."""
+        if self.virtual_clock:
+            self.virtual_time += self.sim_config.get("update_rate", 0.5)
+            return self.virtual_time
+        return time.time()
+
     def generate_data(self):
         """Generates a dictionary of sensor data with trend-based drift."""
+        if self.engine:
+            return self._generate_vectorized()
+
         data = {}
         
         # Unpack Simulation Params
@@ -64,14 +148,15 @@ class SensorSimulator:
         prob_spike = self.sim_config["spike_prob"]
         drift_factor = self.sim_config["drift_amount"]
         fault_duration = self.sim_config.get("fault_duration", 20.0)
-        current_time = time.time()
+        current_time = self.next_timestamp()
+        rng = self.rng
 
         for sid, info in self.sensor_config.items():
             low, high = info['limits']
             span = high - low
             
             # 1. Update Trend (Drift)
-            drift = (random.random() - 0.5) * 2 * (span * drift_factor)
+            drift = (rng.random() - 0.5) * 2 * (span * drift_factor)
             new_val = self.current_values[sid] + drift
             new_val = max(low * 0.9, min(high * 1.1, new_val))
             self.current_values[sid] = new_val
@@ -91,7 +176,7 @@ class SensorSimulator:
                     status = "OK"
             else:
                 # Sensor is "OK", check if we should trigger a new fault/spike
-                rand_check = random.random()
+                rand_check = rng.random()
                 
                 if rand_check < prob_fault:
                     status = "Faulty Sensor"
@@ -100,7 +185,7 @@ class SensorSimulator:
                 
                 elif rand_check < (prob_fault + prob_spike):
                     # Sudden Spike (Out of limits) - Spikes are transient (one-off)
-                    if random.choice([True, False]):
+                    if rng.choice([True, False]):
                         final_val = high + (span * 0.2)
                     else:
                         final_val = low - (span * 0.2)
@@ -111,86 +196,342 @@ class SensorSimulator:
                 "type": info['type'],
                 "unit": info['unit'],
                 "value": round(final_val, 2),
-                "timestamp": time.time(),
+                "timestamp": current_time,
                 "status": status
             }
         return data
 
+    def _generate_vectorized(self):
+        """Same frame layout as generate_data(), computed in bulk with one frame timestamp."""
+        return self._frame_to_data(self.generate_frame())
+
+    def generate_frame(self):
+        """Generates the next tick as a positional SensorFrame (values/status arrays)."""
+        if self.source:
+            return self.source.next_frame(self.frame_seq)
+        if self.engine:
+            current_time = self.next_timestamp()
+            values, status = self.engine.step(current_time)
+            frame = SensorFrame(self.frame_seq, current_time, values, status)
+        else:
+            frame = SensorFrame.from_readings(self.frame_seq, self.generate_data())
+        if self.bursts:
+            frame.burst = self.bursts.generate(frame.timestamp, frame.values, frame.status)
+        return frame
+
+    def _frame_to_data(self, frame):
+        """Expands a SensorFrame into the JSON frame layout (one dict per sensor)."""
+        return {
+            sid: {
+                "id": sid,
+                "name": info['name'],
+                "type": info['type'],
+                "unit": info['unit'],
+                "value": val,
+                "timestamp": frame.timestamp,
+                "status": STATUS_LABELS[code]
+            }
+            for (sid, info), val, code in zip(self.sensor_config.items(), frame.values.tolist(), frame.status.tolist())
+        }
+
+    def encode_frame(self, frame, protocol=PROTOCOL_JSON):
+        """Serializes one generated frame into the bytes broadcast to clients of a protocol."""
+        if protocol == PROTOCOL_BINARY:
+            return encode_binary_frame(frame)
+        return encode_json_frame(frame)
+
+    def _build_deadbands(self):
+        """Per-sensor deadband: the sensor's own 'deadband' or a fraction of its span."""
+        fraction = self.sim_config.get("deadband", 0.01)
+        return np.array([
+            info.get('deadband', (info['limits'][1] - info['limits'][0]) * fraction)
+            for info in self.sensor_config.values()
+        ], dtype=np.float64)
+
+    def _delta_frame(self, frame):
+        """
+        Reduces a full frame to the sensors that changed since they were last broadcast.
+
+        Input: Full SensorFrame for this tick
+        Output: The same frame when a keyframe is due, otherwise a delta SensorFrame
+        """
+        interval = self.sim_config.get("keyframe_interval", 20)
+        if self._sent_values is None or self._frames_since_keyframe + 1 >= interval:
+            self._sent_values = np.array(frame.values, dtype=np.float64)
+            self._sent_status = np.array(frame.status, dtype=np.uint8)
+            self._frames_since_keyframe = 0
+            return frame
+
+        changed = (np.abs(frame.values - self._sent_values) > self.deadbands) | (frame.status != self._sent_status)
+        indices = np.flatnonzero(changed).astype(np.uint32)
+        self._sent_values[indices] = frame.values[indices]
+        self._sent_status[indices] = frame.status[indices]
+        self._frames_since_keyframe += 1
+        # Fast sensors' samples are data, not state: every burst is sent
+        return SensorFrame(frame.seq, frame.timestamp, frame.values[indices], frame.status[indices], indices,
+                           frame.burst)
+
+    def wait_until_ready(self, timeout=None):
+        """Blocks until the server socket is listening. Returns False on timeout."""
+        return self._ready_event.wait(timeout)
+
     def start(self):
+        """
+        Runs the broadcast server until stop() is called.
+
+        A single selector multiplexes the listening socket and every client.
+        New clients first receive the schema message. Each tick generates and
+        encodes one positional frame, then queues the same bytes on every
+        client with non-blocking sends. Commands are read from any client in
+        between ticks and acknowledged to that client only. With shm_name,
+        every tick's full frame is also written to a shared-memory ring for
+        same-host readers, which are not tracked as clients.
+        """
         print("Socket created")
+        self._selector = selectors.DefaultSelector()
         with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
             s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
             print("Options applied")
             s.bind((self.host, self.port))
+            # Port 0 asks the OS for a free port; expose the real one
+            self.port = s.getsockname()[1]
             print(f"Bind address: {self.host}:{self.port}")
-            s.listen()
-            s.settimeout(1.0)
+            s.listen(socket.SOMAXCONN)
+            s.setblocking(False)
+            self._selector.register(s, selectors.EVENT_READ, data=None)
             print("Listening started")
+            # Static metadata is encoded once and sent to each client on connect
+            schema = build_schema(self.sensor_config)
+            update_rate = self.source.update_rate if self.source else self.sim_config.get("update_rate", 0.5)
+            schema["delta"] = self.delta
+            schema["update_rate"] = update_rate
+            self._schema_payload = encode_json(schema)
+            if self.record_path:
+                self.recorder = FrameRecorder(self.record_path, schema)
+                print(f"Recording frames to {self.record_path}")
+            if self.shm_name:
+                self.shm = ShmRingWriter(self.shm_name, len(self.sensor_config), self._schema_payload)
+                print(f"Shared memory ring: {self.shm.name} ({self.shm.slots} frames)")
+            self._ready_event.set()
 
-            while not self._stop_event.is_set():
-                try:
-                    try:
-                        conn, addr = s.accept()
-                        print("Client accepted")
-                    except socket.timeout:
-                        continue 
-
-                    with conn:
-                        last_update = time.time()
-                        update_rate = self.sim_config.get("update_rate", 0.5)
-                        
-                        while not self._stop_event.is_set():
-                            # I/O Multiplexing: Check if socket has data (Command) or if we need to send data (Timer)
-                            # Calculate time remaining until next data push
-                            now = time.time()
-                            time_since_update = now - last_update
-                            timeout = max(0, update_rate - time_since_update)
-                            
-                            # Wait for data or timeout
-                            # rlist=[conn] means we wait for incoming data
-                            rlist, _, _ = select.select([conn], [], [], timeout)
-                            
-                            if rlist:
-                                # Data received! (Command?)
-                                try:
-                                    raw_data = conn.recv(1024)
-                                    if not raw_data:
-                                        print("Client disconnected (EOF)")
-                                        break
-                                    
-                                    # Handle multiple commands if they come in a burst, split by newline
-                                    # But simplistic approach first: assume one JSON per packet or clean buffer
-                                    # For robustness, let's decode and parse
-                                    try:
-                                        msg = raw_data.decode('utf-8').strip()
-                                        if msg:
-                                            cmd_json = json.loads(msg)
-                                            response = self.process_command(cmd_json)
-                                            # Send Ack
-                                            conn.sendall((json.dumps(response) + "\n").encode('utf-8'))
-                                    except json.JSONDecodeError:
-                                        print(f"Invalid JSON received: {raw_data}")
-                                except (ConnectionResetError, BrokenPipeError):
-                                    print("Client disconnected (Reset)")
-                                    break
-                            
-                            # Check if it's time to send data
-                            if time.time() - last_update >= update_rate:
-                                if not self.paused:
-                                    sensor_data = self.generate_data()
-                                    json_data = json.dumps(sensor_data)
-                                    try:
-                                        conn.sendall((json_data + "\n").encode('utf-8'))
-                                    except (ConnectionResetError, BrokenPipeError):
-                                        print("Client disconnected (Pipe)")
-                                        break
-                                last_update = time.time()
-                                
-                except Exception as e:
-                    if not self._stop_event.is_set():
-                         print(f"Server error: {e}")
+            # Replay at full speed and virtual time only move on once every client has
+            # taken the previous frame
+            flow_control = (self.source is not None and self.source.speed <= 0) or \
+                (self.virtual_clock and self.source is None)
+            if flow_control and self.source is None:
+                update_rate = 0.0
+            next_update = time.time() + update_rate
+
+            try:
+                while not self._stop_event.is_set():
+                    # Sleep until the next tick, but wake regularly to notice stop()
+                    # Flow-controlled modes idle on the selector (new clients and drained
+                    # outboxes wake it up) instead of spinning
+                    idle = flow_control and (self.paused or not self.clients or
+                                             any(client.outbox for client in self.clients.values()))
+                    timeout = 1.0 if idle else min(max(0, next_update - time.time()), 1.0)
+                    for key, mask in self._selector.select(timeout):
+                        if key.data is None:
+                            self._accept_client(key.fileobj)
+                            continue
+                        client = key.data
+                        try:
+                            if mask & selectors.EVENT_READ:
+                                self._read_client(client)
+                            if mask & selectors.EVENT_WRITE and client.conn.fileno() != -1:
+                                self._flush_client(client)
+                        except Exception as e:
+                            # One misbehaving connection must not stop the broadcast to the others
+                            self._drop_client(client, f"Error: {e}")
+
+                    now = time.time()
+                    if flow_control and any(client.outbox for client in self.clients.values()):
+                        continue
+                    if now >= next_update:
+                        frame = None
+                        # The ring has no readers to wait for, so flow-controlled modes only serve TCP
+                        if not self.paused and (self.clients or (self.shm and not flow_control)):
+                            # Generate once, encode once per protocol, fan out the same bytes
+                            self.frame_seq += 1
+                            frame = self.generate_frame()
+                        if frame is not None:
+                            if self.recorder:
+                                self.recorder.write(frame)
+                            if self.delta:
+                                # Late joiners still get the full frame of this tick
+                                self._broadcast(self._delta_frame(frame), keyframe=frame)
+                            else:
+                                self._broadcast(frame)
+                            if self.shm:
+                                self.shm.write(frame)
+                        elif self.source and self.source.finished and not self._replay_reported:
+                            print("Replay finished (send RESET to play it again)")
+                            self._replay_reported = True
+                        if self.source:
+                            # Recorded gap to the next frame, scaled by the replay speed
+                            update_rate = self.source.delay() if frame is not None else self.source.update_rate
+                        next_update += update_rate
+                        if next_update < now:
+                            # We fell behind (slow tick); don't burst to catch up
+                            next_update = now + update_rate
+            except Exception as e:
+                if not self._stop_event.is_set():
+                    print(f"Server error: {e}")
+            finally:
+                if self.recorder:
+                    self.recorder.close()
+                    print(f"Recorded {self.recorder.frames} frames")
+                if self.shm:
+                    self.shm.close()
+                    self.shm = None
+                for client in list(self.clients.values()):
+                    self._drop_client(client)
+                self._selector.unregister(s)
+                self._selector.close()
+                self._ready_event.clear()
         print("Socket closed")
 
+    def _accept_client(self, server_sock):
+        try:
+            conn, addr = server_sock.accept()
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError as e:
+            # Aborted handshake, out of file descriptors, ...: the listener itself is fine
+            print(f"Accept failed: {e}")
+            return
+        try:
+            conn.setblocking(False)
+            client = _ClientSession(conn, addr)
+            self.clients[conn.fileno()] = client
+            self._selector.register(conn, selectors.EVENT_READ, data=client)
+        except Exception as e:
+            print(f"Accept failed: {e}")
+            self.clients.pop(conn.fileno(), None)
+            conn.close()
+            return
+        print(f"Client accepted: {addr} ({len(self.clients)} connected)")
+        self._send_to(client, self._schema_payload)
+
+    def _drop_client(self, client, reason=None):
+        if reason:
+            print(f"Client disconnected ({reason}): {client.addr}")
+        self.clients.pop(client.fd, None)
+        try:
+            self._selector.unregister(client.conn)
+        except (KeyError, ValueError):
+            pass
+        client.conn.close()
+
+    def _read_client(self, client):
+        try:
+            raw_data = client.conn.recv(4096)
+        except (BlockingIOError, InterruptedError):
+            return
+        except (ConnectionResetError, BrokenPipeError, OSError):
+            self._drop_client(client, "Reset")
+            return
+        if not raw_data:
+            self._drop_client(client, "EOF")
+            return
+
+        client.inbox += raw_data
+        # Commands may arrive in bursts, split across reads, with or without newlines
+        decoder = json.JSONDecoder()
+        while client.inbox:
+            text = client.inbox.decode('utf-8', errors='replace').lstrip()
+            if not text:
+                client.inbox.clear()
+                break
+            try:
+                cmd_json, end = decoder.raw_decode(text)
+            except json.JSONDecodeError:
+                newline = text.find("\n")
+                if newline == -1 and len(client.inbox) < MAX_COMMAND_BYTES:
+                    break  # Incomplete command, wait for the rest
+                bad = text if newline == -1 else text[:newline]
+                print(f"Invalid JSON received: {bad!r}")
+                client.inbox[:] = b"" if newline == -1 else text[newline + 1:].encode('utf-8')
+                continue
+            client.inbox[:] = text[end:].encode('utf-8')
+            if not isinstance(cmd_json, dict):
+                print(f"Invalid command received: {cmd_json!r}")
+                continue
+            response = self._handle_client_command(client, cmd_json)
+            # Send Ack to the requesting client only
+            self._send_to(client, encode_json(response))
+
+    def _handle_client_command(self, client, cmd_data):
+        """Handles per-connection commands, delegating simulation commands to process_command."""
+        if cmd_data.get("command") != "SET_PROTOCOL":
+            return self.process_command(cmd_data)
+
+        protocol = cmd_data.get("protocol")
+        if protocol not in PROTOCOLS:
+            return {"status": "ERROR", "message": f"Unsupported protocol: {protocol}"}
+        client.protocol = protocol
+        print(f"Client {client.addr} switched to {protocol} protocol")
+        return {"status": "OK", "message": f"Protocol set to {protocol}", "protocol": protocol}
+
+    def _broadcast(self, frame, keyframe=None):
+        """
+        Queues one frame on every client, encoding it at most once per protocol.
+
+        Input: Frame for this tick; optional full keyframe for clients that need one
+        Output: None
+        """
+        max_backlog = self.sim_config.get("max_client_backlog", 1_048_576)
+        if self.source is None and not self.virtual_clock:
+            # Hand-off time, for clients' latency breakdown (only comparable with a wall-clock timestamp)
+            frame.sent = time.time()
+            if keyframe is not None:
+                keyframe.sent = frame.sent
+        payloads = {}
+        for client in list(self.clients.values()):
+            if len(client.outbox) > max_backlog:
+                # Slow consumer: skip whole frames rather than stall everyone else
+                client.frames_dropped += 1
+                client.needs_keyframe = True  # It missed deltas
+                continue
+            outgoing = frame
+            if client.needs_keyframe and keyframe is not None:
+                outgoing = keyframe
+            key = (client.protocol, outgoing is frame)
+            payload = payloads.get(key)
+            if payload is None:
+                payload = payloads[key] = self.encode_frame(outgoing, client.protocol)
+            if outgoing.is_keyframe:
+                client.needs_keyframe = False
+            self._send_to(client, payload)
+
+    def _send_to(self, client, payload):
+        if client.outbox:
+            # Preserve ordering behind bytes the kernel has not accepted yet
+            client.outbox += payload
+            return
+        try:
+            sent = client.conn.send(payload)
+        except (BlockingIOError, InterruptedError):
+            sent = 0
+        except (ConnectionResetError, BrokenPipeError, OSError):
+            self._drop_client(client, "Pipe")
+            return
+        if sent < len(payload):
+            client.outbox += payload[sent:]
+            self._selector.modify(client.conn, selectors.EVENT_READ | selectors.EVENT_WRITE, data=client)
+
+    def _flush_client(self, client):
+        try:
+            sent = client.conn.send(client.outbox)
+        except (BlockingIOError, InterruptedError):
+            return
+        except (ConnectionResetError, BrokenPipeError, OSError):
+            self._drop_client(client, "Pipe")
+            return
+        del client.outbox[:sent]
+        if not client.outbox:
+            self._selector.modify(client.conn, selectors.EVENT_READ, data=client)
+
     def stop(self):
         """Signals the simulator to stop running."""
         self._stop_event.set()
@@ -223,6 +564,19 @@ if __name__ == "__main__":
     parser.add_argument("-p", "--port", type=int, default=PORT, help="Port to listen on")
     parser.add_argument("-r", "--rate", type=float, help="Update rate in seconds")
     parser.add_argument("-n", "--count", type=int, help="Total number of sensors")
+    parser.add_argument("--vectorized", action="store_true", help="Use the NumPy engine (recommended for large sensor counts)")
+    parser.add_argument("--delta", action="store_true", help="Send only changed sensors plus periodic keyframes")
+    parser.add_argument("--record", type=str, metavar="FILE", help="Record every generated frame to FILE")
+    parser.add_argument("--replay", type=str, metavar="FILE", help="Stream a recording instead of simulated data")
+    parser.add_argument("--speed", type=float, default=1.0, help="Replay speed factor (0 = as fast as clients read)")
+    parser.add_argument("--loop", action="store_true", help="Restart the replay when it reaches the end")
+    parser.add_argument("--seek", type=float, default=0.0, help="Start the replay this many seconds in")
+    parser.add_argument("--seed", type=int, help="Seed the random generator for reproducible runs")
+    parser.add_argument("--virtual-clock", action="store_true",
+                        help="Advance time by the update rate per frame and send frames as fast as clients read")
+    parser.add_argument("--shm", nargs="?", const=SHM_NAME, default=None, metavar="NAME",
+                        help=f"Also publish frames to a shared-memory ring for same-host dashboards "
+                             f"(default name {SHM_NAME})")
     
     args = parser.parse_args()
     
@@ -238,7 +592,15 @@ if __name__ == "__main__":
         print(f"Setting update rate to {args.rate}s")
         final_sim_config["update_rate"] = args.rate
 
-    sim = SensorSimulator(port=args.port, sensor_config=final_sensor_config, sim_config=final_sim_config)
+    source = None
+    if args.replay:
+        source = ReplaySource(args.replay, speed=args.speed, loop=args.loop, seek=args.seek)
+        print(f"Replaying {len(source.offsets)} frames of {len(source.sensor_config)} sensors "
+              f"from {args.replay} at {args.speed or 'max'}x")
+
+    sim = SensorSimulator(port=args.port, sensor_config=final_sensor_config, sim_config=final_sim_config,
+                          vectorized=args.vectorized, delta=args.delta, source=source, record_path=args.record,
+                          seed=args.seed, virtual_clock=args.virtual_clock, shm_name=args.shm)
     try:
         sim.start()
     except KeyboardInterrupt:
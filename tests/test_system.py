@@ -1,7 +1,44 @@
+import os
+import sys
+import time
 import unittest
+import tempfile
 import json
-from simulator import SensorSimulator
+import socket
+import threading
+import socketserver
+import contextlib
+import io
+import subprocess
+import numpy as np
+from simulator import SensorSimulator, generate_dynamic_config, VIRTUAL_EPOCH
 from core.sensor_config import SENSOR_CONFIG
+from core.sim_engine import VectorSimEngine, BurstGenerator, STATUS_OK, STATUS_FAULT
+from core.protocol import (SensorFrame, FrameDecoder, encode_binary_frame, encode_json, encode_json_frame,
+                           decode_json_message, schema_to_config, build_schema)
+from core.stream_state import SensorState, BatchAccumulator
+from core.history import RingHistory
+from core.decimate import minmax_decimate
+from core.store import SegmentStore, Segment, list_segments, read_range
+from core.rollup import RollupPyramid, RollupLevel
+from core.replay import ReplaySource, FrameRecorder
+from core.notifications import NotificationManager
+from core.headless import HeadlessMonitor
+from core.stream_client import StreamClient
+from core.shm_transport import ShmRingWriter, ShmRingReader
+from core.alarms import (AlarmEngine, ALARM_NONE as ALARM_NONE_STATE, ALARM_FAULT as ALARM_FAULT_STATE, ALARM_LOW,
+                         ALARM_HIGH)
+from core.latency import LatencyHistogram, LatencyMonitor, format_latency, STAGE_SEND, STAGE_NETWORK, STAGE_PARSE
+
+# Dashboard tests run without a display
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QApplication
+from core.comm_thread import CommThread
+from gui.dashboard import Dashboard
+from gui.sensor_table_model import SensorTableModel, ALARM_NONE, ALARM_LIMIT
+from benchmarks.pipeline import run_case
+from benchmarks import micro
 
 class TestSensorSystem(unittest.TestCase):
     """
@@ -81,5 +118,1928 @@ class TestSensorSystem(unittest.TestCase):
         reading = {"value": 0.0, "status": "SENSOR_ERROR", "timestamp": 123456}
         self.assertNotEqual(reading["status"], "OK")
 
+
+class TestVectorSimEngine(unittest.TestCase):
+    """
+    Unit tests for the array-backed simulation engine.
+    Checks it follows the same rules as the per-sensor loop.
+    """
+
+    def make_engine(self, **overrides):
+        sim_config = {"fault_prob": 0.0, "spike_prob": 0.0, "drift_amount": 0.05, "fault_duration": 20.0}
+        sim_config.update(overrides)
+        return VectorSimEngine(generate_dynamic_config(1000), sim_config, seed=1)
+
+    def test_vectorized_output_structure(self):
+        """
+        Verify that the vectorized mode keeps the generate_data() frame layout.
+
+        Input: SensorSimulator(vectorized=True)
+        Output: Asserts same keys as the scalar mode and a single frame timestamp
+        """
+        data = SensorSimulator(vectorized=True).generate_data()
+        scalar = SensorSimulator().generate_data()
+        self.assertEqual(set(data), set(scalar))
+        for sid, reading in data.items():
+            self.assertEqual(set(reading), set(scalar[sid]))
+            self.assertIsInstance(reading['value'], float)
+        self.assertEqual(len({r['timestamp'] for r in data.values()}), 1)
+
+    def test_drift_stays_in_clamp_band(self):
+        """
+        Verify that drift is bounded by the per-step span and the clamp band.
+
+        Input: 200 ticks without faults or spikes
+        Output: Asserts values stay in [low * 0.9, high * 1.1] and step size <= drift * span
+        """
+        engine = self.make_engine()
+        previous = engine.values.copy()
+        for tick in range(200):
+            values, status = engine.step(float(tick))
+            self.assertTrue(np.all(status == STATUS_OK))
+            self.assertTrue(np.all(values >= engine.clamp_low - 0.01))
+            self.assertTrue(np.all(values <= engine.clamp_high + 0.01))
+            self.assertTrue(np.all(np.abs(engine.values - previous) <= engine.span * 0.05 + 1e-9))
+            previous = engine.values.copy()
+
+    def test_faults_are_sticky_then_recover(self):
+        """
+        Verify that a fault reads 0.0 until fault_duration elapses, then recovers.
+
+        Input: fault_prob=1.0, ticks at t=0, t=10 and t=25
+        Output: Asserts status/value during the fault and OK after recovery
+        """
+        engine = self.make_engine(fault_prob=1.0)
+        for now in (0.0, 10.0):
+            values, status = engine.step(now)
+            self.assertTrue(np.all(status == STATUS_FAULT))
+            self.assertTrue(np.all(values == 0.0))
+        values, status = engine.step(25.0)
+        self.assertTrue(np.all(status == STATUS_OK))
+        self.assertTrue(np.all(values != 0.0))
+
+    def test_spikes_exceed_limits(self):
+        """
+        Verify that spikes land 20% of span outside either limit, in both directions.
+
+        Input: spike_prob=1.0
+        Output: Asserts every value is a high or low spike and both occur
+        """
+        engine = self.make_engine(spike_prob=1.0)
+        values, status = engine.step(0.0)
+        high_spike = np.round(engine.high + engine.span * 0.2, 2)
+        low_spike = np.round(engine.low - engine.span * 0.2, 2)
+        is_high = values == high_spike
+        is_low = values == low_spike
+        self.assertTrue(np.all(is_high | is_low))
+        self.assertTrue(is_high.any() and is_low.any())
+        self.assertTrue(np.all(status == STATUS_OK))
+
+    def test_fault_rate_matches_probability(self):
+        """
+        Verify that the fault rate matches fault_prob like the scalar loop.
+
+        Input: fault_prob=0.1 over 1000 sensors
+        Output: Asserts roughly 10% of sensors fault on the first tick
+        """
+        engine = self.make_engine(fault_prob=0.1)
+        _, status = engine.step(0.0)
+        self.assertAlmostEqual(np.mean(status == STATUS_FAULT), 0.1, delta=0.03)
+
+class TestWireProtocol(unittest.TestCase):
+    """
+    Unit tests for the JSON / binary framing shared by simulator and CommThread.
+    """
+
+    def make_frame(self, count=5):
+        values = np.linspace(-10.0, 10.0, count)
+        status = np.zeros(count, dtype=np.uint8)
+        status[1] = STATUS_FAULT
+        return SensorFrame(42, 1700000000.25, values, status)
+
+    def test_binary_round_trip(self):
+        """
+        Verify that a binary frame decodes back to the same sequence, timestamp and readings.
+
+        Input: SensorFrame encoded with encode_binary_frame
+        Output: Asserts decoded fields match (values at float32 precision)
+        """
+        frame = self.make_frame()
+        decoded = FrameDecoder().feed(encode_binary_frame(frame))
+        self.assertEqual(len(decoded), 1)
+        self.assertEqual(decoded[0].seq, 42)
+        self.assertEqual(decoded[0].timestamp, 1700000000.25)
+        np.testing.assert_allclose(decoded[0].values, frame.values, rtol=1e-6)
+        np.testing.assert_array_equal(decoded[0].status, frame.status)
+        readings = decoded[0].to_readings(["S01", "S02", "S03", "S04", "S05"])
+        self.assertEqual(readings["S02"]["status"], "Faulty Sensor")
+
+    def test_mixed_stream_split_at_every_byte(self):
+        """
+        Verify that JSON lines and binary frames interleave and survive arbitrary splits.
+
+        Input: Ack line + binary frame + JSON data line, fed one byte at a time
+        Output: Asserts the three messages come out in order
+        """
+        stream = (encode_json({"status": "OK"}) + encode_binary_frame(self.make_frame())
+                  + encode_json({"type": "data", "seq": 1, "timestamp": 0.0, "values": [1.5], "statuses": [0]}))
+        decoder = FrameDecoder()
+        messages = []
+        for i in range(len(stream)):
+            messages.extend(decoder.feed(stream[i:i + 1]))
+        self.assertEqual(messages[0], {"status": "OK"})
+        self.assertIsInstance(messages[1], SensorFrame)
+        self.assertEqual(messages[2].values.tolist(), [1.5])
+
+    def test_large_frames_across_recv_boundaries(self):
+        """
+        Verify that frames far larger than one read survive being split anywhere.
+
+        Input: Two 20k-sensor JSON frames and a binary frame, fed in 1000-byte chunks
+        Output: Asserts all three frames decode intact with nothing dropped
+        """
+        simulator = SensorSimulator(sensor_config=generate_dynamic_config(20000), vectorized=True)
+        frame = simulator.generate_frame()
+        stream = simulator.encode_frame(frame, "json") * 2 + simulator.encode_frame(frame, "binary")
+        decoder = FrameDecoder(capacity=4096)
+        messages = []
+        for i in range(0, len(stream), 1000):
+            messages.extend(decoder.feed(stream[i:i + 1000]))
+        self.assertEqual(len(messages), 3)
+        for msg in messages:
+            np.testing.assert_allclose(msg.values, frame.values, rtol=1e-6)
+        self.assertEqual(decoder.stats()["frames_dropped"], 0)
+        self.assertEqual(decoder.stats()["bytes_received"], len(stream))
+
+    def test_malformed_messages_are_counted(self):
+        """
+        Verify that broken lines and unknown binary frames are dropped and counted.
+
+        Input: Garbage line, binary frame with unknown type, valid Ack
+        Output: Asserts the Ack still decodes and drop counters match
+        """
+        bad_binary = b"\xa5\x01\x09\x00" + (3).to_bytes(4, "little") + bytes(16) + b"xyz"
+        stream = b"{not json\n" + bad_binary + encode_json({"status": "OK"})
+        decoder = FrameDecoder()
+        self.assertEqual(decoder.feed(stream), [{"status": "OK"}])
+        self.assertEqual(decoder.frames_dropped, 2)
+        self.assertEqual(decoder.bytes_dropped, 10 + len(bad_binary))
+
+        # Data frame whose sensor count claims more values than its payload holds
+        short = bytearray(encode_binary_frame(self.make_frame()))
+        short[20:24] = (50).to_bytes(4, "little")
+        frames = decoder.feed(bytes(short) + encode_binary_frame(self.make_frame()))
+        self.assertEqual(len(frames), 1)
+        self.assertEqual(decoder.frames_dropped, 3)
+        self.assertEqual(decoder.bytes_dropped, 10 + len(bad_binary) + len(short))
+
+    def test_binary_frame_is_compact(self):
+        """
+        Verify that positional frames are much smaller than the per-sensor JSON layout.
+
+        Input: 1000-sensor frame encoded as binary, positional JSON and legacy JSON
+        Output: Asserts binary < positional JSON and binary < legacy JSON / 10
+        """
+        simulator = SensorSimulator(sensor_config=generate_dynamic_config(1000), vectorized=True)
+        frame = simulator.generate_frame()
+        binary_size = len(simulator.encode_frame(frame, "binary"))
+        legacy_size = len(json.dumps(simulator.generate_data()))
+        self.assertLess(binary_size, len(simulator.encode_frame(frame, "json")))
+        self.assertLess(binary_size * 10, legacy_size)
+
+class TestDeltaStreaming(unittest.TestCase):
+    """
+    Unit tests for deadband / change-only delta frames and client-side state rebuild.
+    """
+
+    def setUp(self):
+        sim_config = {"fault_prob": 0.01, "spike_prob": 0.01, "drift_amount": 0.02,
+                      "deadband": 0.02, "keyframe_interval": 10}
+        self.simulator = SensorSimulator(sensor_config=generate_dynamic_config(500), sim_config=sim_config,
+                                         vectorized=True, delta=True)
+
+    def next_frames(self):
+        self.simulator.frame_seq += 1
+        full = self.simulator.generate_frame()
+        return full, self.simulator._delta_frame(full)
+
+    def test_keyframe_then_deltas(self):
+        """
+        Verify that the first frame and every keyframe_interval-th frame are full.
+
+        Input: 21 ticks with keyframe_interval=10
+        Output: Asserts keyframes at ticks 0, 10, 20 and deltas in between
+        """
+        kinds = [self.next_frames()[1].is_keyframe for _ in range(21)]
+        self.assertEqual([i for i, key in enumerate(kinds) if key], [0, 10, 20])
+
+    def test_deltas_only_carry_changes(self):
+        """
+        Verify that deltas carry only sensors past the deadband or with a status change,
+        and that the rebuilt client state stays within the deadband of the truth.
+
+        Input: 30 ticks through a binary encode/decode and SensorState
+        Output: Asserts deltas are partial and state error <= deadband
+        """
+        state = SensorState(self.simulator.sensor_config)
+        decoder = FrameDecoder()
+        sizes = []
+        for _ in range(30):
+            full, delta = self.next_frames()
+            if not delta.is_keyframe:
+                sizes.append(len(delta.values))
+            frame, = decoder.feed(encode_binary_frame(delta))
+            state.apply(frame)
+            np.testing.assert_array_equal(state.status, full.status)
+            self.assertTrue(np.all(np.abs(state.values - full.values) <= self.simulator.deadbands + 1e-3))
+        self.assertLess(np.mean(sizes), len(self.simulator.sensor_config))
+
+    def test_state_merges_json_delta(self):
+        """
+        Verify that a JSON delta line only touches the listed positions.
+
+        Input: Keyframe for 3 sensors, then a delta for position 1
+        Output: Asserts updated positions and untouched neighbours
+        """
+        state = SensorState(["S01", "S02", "S03"])
+        state.apply(SensorFrame(1, 10.0, np.array([1.0, 2.0, 3.0]), np.zeros(3, dtype=np.uint8)))
+        line = encode_json({"type": "data", "seq": 2, "timestamp": 11.0, "indices": [1], "values": [5.5], "statuses": [1]})
+        updated = state.apply(FrameDecoder().feed(line)[0])
+        self.assertEqual(updated.tolist(), [1])
+        self.assertEqual(state.values.tolist(), [1.0, 5.5, 3.0])
+        self.assertEqual(state.readings(updated), {"S02": {"value": 5.5, "status": "Faulty Sensor", "timestamp": 11.0}})
+
+class TestBurstFrames(unittest.TestCase):
+    """
+    Tests for multi-sample frames of sensors with their own sample rate.
+    """
+
+    def make_config(self):
+        config = generate_dynamic_config(3)
+        config["S02"] = dict(config["S02"], sample_rate=1000.0)
+        config["S03"] = dict(config["S03"], sample_rate=30.0)
+        return config
+
+    def make_frame(self, config, seq=1, timestamp=100.0):
+        generator = BurstGenerator(config, {"update_rate": 0.05}, seed=1)
+        values = np.array([50.0, 1000.0, 700.0])
+        status = np.zeros(3, dtype=np.uint8)
+        return SensorFrame(seq, timestamp, values, status, burst=generator.generate(timestamp, values, status))
+
+    def test_generator_counts_and_continuity(self):
+        """
+        Verify that bursts hold sample_rate x elapsed samples and end on the frame value.
+
+        Input: 1000 Hz and 30 Hz sensors, four frames 50 ms apart, second sensor faulty on the last
+        Output: Asserts counts (with fractional carry), last sample == frame value, zeros while faulty
+        """
+        generator = BurstGenerator(self.make_config(), {"update_rate": 0.05}, seed=1)
+        values = np.array([50.0, 1000.0, 700.0])
+        status = np.zeros(3, dtype=np.uint8)
+        counts = []
+        for tick in range(3):
+            positions, count, samples = generator.generate(100.0 + tick * 0.05, values, status)
+            counts.append(count.tolist())
+            self.assertEqual(positions.tolist(), [1, 2])
+            ends = np.cumsum(count) - 1
+            self.assertEqual(samples[ends].tolist(), [1000.0, 700.0])
+        self.assertEqual([c[0] for c in counts], [50, 50, 50])
+        self.assertEqual(sum(c[1] for c in counts), 4)  # 1.5 samples per frame, carried over
+
+        status[1] = STATUS_FAULT
+        _, count, samples = generator.generate(100.15, values, status)
+        self.assertTrue((samples[:count[0]] == 0.0).all())
+
+    def test_burst_survives_both_encodings(self):
+        """
+        Verify that bursts round-trip through binary and JSON frames, alongside delta indices.
+
+        Input: Keyframe and delta frame with a burst block
+        Output: Asserts decoded positions/counts/samples and latest values
+        """
+        frame = self.make_frame(self.make_config())
+        delta = SensorFrame(2, 100.05, np.array([701.0]), np.zeros(1, dtype=np.uint8),
+                            np.array([2], dtype=np.uint32), frame.burst)
+        decoder = FrameDecoder()
+        messages = decoder.feed(encode_binary_frame(frame) + encode_binary_frame(delta) +
+                                encode_json_frame(frame) + encode_json_frame(delta))
+        self.assertEqual(len(messages), 4)
+        for decoded in messages:
+            positions, counts, samples = decoded.burst
+            self.assertEqual(positions.tolist(), frame.burst[0].tolist())
+            self.assertEqual(counts.tolist(), frame.burst[1].tolist())
+            np.testing.assert_allclose(samples, frame.burst[2], atol=1e-3)
+        self.assertEqual(messages[1].indices.tolist(), [2])
+        self.assertEqual(decoder.frames_dropped, 0)
+
+        # Clients that predate bursts read the same values from the frame head
+        legacy = decode_json_message(json.loads(encode_json_frame(frame)))
+        self.assertEqual(legacy.values.tolist(), [50.0, 1000.0, 700.0])
+
+    def test_client_ingests_bursts_as_sample_arrays(self):
+        """
+        Verify that CommThread turns bursts into evenly spaced plot samples.
+
+        Input: Schema with sample rates, one frame with a 50-sample burst for S02
+        Output: Asserts S02 gets 50 samples 1 ms apart ending at the frame time, others one sample
+        """
+        config = self.make_config()
+        comm = CommThread()
+        comm.handle_message(build_schema(config))
+        comm.handle_message(self.make_frame(config))
+        samples = comm.batch.take().samples_by_sensor()
+        times, values = samples["S02"]
+        self.assertEqual(len(times), 50)
+        np.testing.assert_allclose(np.diff(times), 0.001)
+        self.assertEqual(times[-1], 100.0)
+        self.assertEqual(values[-1], 1000.0)
+        self.assertEqual(len(samples["S01"][0]), 1)
+
+class TestBatchAccumulator(unittest.TestCase):
+    """
+    Unit tests for merging frames into GUI batches (snapshot + sample log).
+    """
+
+    def setUp(self):
+        self.state = SensorState(["S01", "S02", "S03"])
+        self.batch = BatchAccumulator(self.state)
+
+    def apply(self, seq, timestamp, values, indices=None):
+        frame = SensorFrame(seq, timestamp, np.array(values, dtype=np.float64),
+                            np.zeros(len(values), dtype=np.uint8), indices)
+        self.batch.add(self.state.apply(frame), timestamp)
+
+    def test_snapshot_keeps_latest_and_samples_keep_all(self):
+        """
+        Verify that a batch holds the latest value per sensor but every sample for plots.
+
+        Input: Keyframe at t=1 and a delta for S02 at t=2
+        Output: Asserts snapshot values, per-sensor samples and conflation count
+        """
+        self.apply(1, 1.0, [10.0, 20.0, 30.0])
+        self.apply(2, 2.0, [21.0], np.array([1], dtype=np.uint32))
+        batch = self.batch.take()
+
+        self.assertEqual(batch.frames, 2)
+        self.assertEqual(batch.conflated, 1)
+        self.assertEqual(batch.readings()["S02"], {"value": 21.0, "status": "OK", "timestamp": 2.0})
+        samples = batch.samples_by_sensor()
+        self.assertEqual(samples["S02"][0].tolist(), [1.0, 2.0])
+        self.assertEqual(samples["S02"][1].tolist(), [20.0, 21.0])
+        self.assertEqual(samples["S01"][1].tolist(), [10.0])
+        # Only the requested (e.g. plotted) sensors are grouped
+        samples = batch.samples_by_sensor(np.array([1, 2]))
+        self.assertEqual(list(samples), ["S02", "S03"])
+        self.assertEqual(samples["S02"][1].tolist(), [20.0, 21.0])
+        self.assertEqual(batch.samples_by_sensor(np.empty(0, dtype=np.intp)), {})
+
+    def test_take_starts_a_new_batch(self):
+        """
+        Verify that take() resets the pending batch but keeps cumulative counters.
+
+        Input: Two batches of one frame each
+        Output: Asserts the second batch only has its own sensor and counters accumulate
+        """
+        self.apply(1, 1.0, [10.0, 20.0, 30.0])
+        self.batch.take()
+        self.apply(2, 2.0, [31.0], np.array([2], dtype=np.uint32))
+        batch = self.batch.take({"frames_dropped": 4})
+        self.assertEqual(list(batch.readings()), ["S03"])
+        self.assertEqual(batch.stats, {"frames": 2, "conflated": 0, "batches": 2, "frames_dropped": 4})
+
+class TestRingHistory(unittest.TestCase):
+    """
+    Unit tests for the preallocated plot history ring buffer.
+    """
+
+    def test_wraps_and_stays_contiguous(self):
+        """
+        Verify that after wrapping the view is the newest samples, oldest first, without copying.
+
+        Input: 13 samples appended/extended into a capacity-5 buffer
+        Output: Asserts view contents and that it shares memory with the buffer
+        """
+        history = RingHistory(5)
+        history.append(0.0, 0.0)
+        history.extend(np.arange(1.0, 8.0), np.arange(1.0, 8.0) * 10)
+        history.extend(np.arange(8.0, 13.0), np.arange(8.0, 13.0) * 10)
+        times, values = history.view()
+        self.assertEqual(times.tolist(), [8.0, 9.0, 10.0, 11.0, 12.0])
+        self.assertEqual(values.tolist(), [80.0, 90.0, 100.0, 110.0, 120.0])
+        self.assertTrue(np.shares_memory(times, history._times))
+        self.assertTrue(times.flags['C_CONTIGUOUS'])
+
+    def test_extend_larger_than_capacity(self):
+        """
+        Verify that an oversized extend keeps only the last `capacity` samples.
+
+        Input: 12 samples into a capacity-4 buffer
+        Output: Asserts the last four samples are kept
+        """
+        history = RingHistory(4)
+        history.extend(np.arange(12.0), np.arange(12.0))
+        self.assertEqual(history.view()[0].tolist(), [8.0, 9.0, 10.0, 11.0])
+        self.assertEqual(len(history), 4)
+
+    def test_window_is_selected_by_time(self):
+        """
+        Verify that window() returns only samples within the requested time span.
+
+        Input: 100 samples 0.5 s apart, 10 s window
+        Output: Asserts 21 samples from t=39.5 to t=49.5
+        """
+        history = RingHistory(100)
+        history.extend(np.arange(100) * 0.5, np.ones(100))
+        times, _ = history.window(10.0)
+        self.assertEqual(times.size, 21)
+        self.assertEqual((times[0], times[-1]), (39.5, 49.5))
+
+class TestMinMaxDecimation(unittest.TestCase):
+    """
+    Unit tests for the per-pixel min/max plot decimation.
+    """
+
+    def test_envelope_keeps_spikes(self):
+        """
+        Verify that a million-sample range is reduced to a bounded envelope that keeps extremes.
+
+        Input: 1,000,000 samples of a sine with one spike and one dip, 500 buckets
+        Output: Asserts point count bound, spike/dip present, times sorted
+        """
+        times = np.arange(1_000_000, dtype=np.float64)
+        values = np.sin(times / 1000.0)
+        values[123_457] = 50.0
+        values[876_543] = -50.0
+        out_t, out_v = minmax_decimate(times, values, 0.0, 999_999.0, 500)
+        self.assertLessEqual(len(out_t), 2 * 500 + 2)
+        self.assertEqual(out_v.max(), 50.0)
+        self.assertEqual(out_v.min(), -50.0)
+        self.assertIn(123_457.0, out_t.tolist())
+        self.assertTrue(np.all(np.diff(out_t) >= 0))
+
+    def test_small_range_passes_through(self):
+        """
+        Verify that a range that already fits is returned raw, with one sample beyond each edge.
+
+        Input: 100 samples, visible range [10, 20], 100 buckets
+        Output: Asserts samples 9..21 are returned unchanged
+        """
+        times = np.arange(100, dtype=np.float64)
+        out_t, out_v = minmax_decimate(times, times * 2, 10.0, 20.0, 100)
+        self.assertEqual(out_t.tolist(), list(range(9, 22)))
+        self.assertEqual(out_v.tolist(), [t * 2.0 for t in range(9, 22)])
+
+    def test_zoomed_range_only_reads_visible_samples(self):
+        """
+        Verify that only the visible range (plus edge samples) is decimated.
+
+        Input: 100,000 samples, visible range [40000, 60000], 100 buckets
+        Output: Asserts every output time lies within one sample of the range
+        """
+        times = np.arange(100_000, dtype=np.float64)
+        out_t, _ = minmax_decimate(times, np.cos(times), 40_000.0, 60_000.0, 100)
+        self.assertLessEqual(len(out_t), 2 * 100 + 2)
+        self.assertGreaterEqual(out_t[0], 39_999.0)
+        self.assertLessEqual(out_t[-1], 60_001.0)
+
+class TestRollupPyramid(unittest.TestCase):
+    """
+    Unit tests for the multi-resolution rollups.
+    """
+
+    def test_incremental_buckets_match_raw_samples(self):
+        """
+        Verify that rollups built batch by batch match statistics computed from the raw samples.
+
+        Input: 2 sensors, 1200 s of 0.1 s samples added in 60 batches
+        Output: Asserts count/min/max/mean/last of 1 min buckets for both sensors
+        """
+        rng = np.random.default_rng(3)
+        times = np.repeat(np.arange(0.0, 1200.0, 0.1), 2)
+        positions = np.tile([0, 1], len(times) // 2)
+        values = rng.normal(size=len(times))
+        pyramid = RollupPyramid(2)
+        for chunk in np.array_split(np.arange(len(times)), 60):
+            pyramid.add(positions[chunk], times[chunk], values[chunk])
+
+        buckets = pyramid.query(2, 0.0, 1199.0)
+        self.assertEqual(buckets["time"].tolist(), [60.0 * i for i in range(20)])
+        for i in range(20):
+            for pos in (0, 1):
+                mask = (positions == pos) & (np.floor(times / 60.0) == i)
+                self.assertEqual(buckets["count"][i, pos], mask.sum())
+                self.assertAlmostEqual(buckets["min"][i, pos], values[mask].min())
+                self.assertAlmostEqual(buckets["max"][i, pos], values[mask].max())
+                self.assertAlmostEqual(buckets["mean"][i, pos], values[mask].mean())
+                self.assertEqual(buckets["last"][i, pos], values[mask][-1])
+
+    def test_ring_drops_expired_buckets(self):
+        """
+        Verify that a level only keeps `capacity` buckets and ignores late samples for expired ones.
+
+        Input: 4-bucket 1 s level fed 10 s of data, then one sample for second 0
+        Output: Asserts only the last 4 buckets are returned
+        """
+        level = RollupLevel(1.0, 4, 1)
+        level.add(np.zeros(10, dtype=np.intp), np.arange(10.0), np.arange(10.0))
+        level.add(np.zeros(1, dtype=np.intp), np.array([0.5]), np.array([99.0]))
+        buckets = level.query(0.0, 100.0)
+        self.assertEqual(buckets["time"].tolist(), [6.0, 7.0, 8.0, 9.0])
+        self.assertEqual(buckets["last"][:, 0].tolist(), [6.0, 7.0, 8.0, 9.0])
+        self.assertEqual(level.oldest(), 6.0)
+
+    def test_day_query_reads_few_buckets(self):
+        """
+        Verify that a day of 1 Hz data for many sensors is answered from the coarse levels.
+
+        Input: 20 sensors, one sample per second for 24 h; level chosen for 1000 pixels
+        Output: Asserts the chosen level, bucket count and per-sensor counts
+        """
+        sensors = 20
+        pyramid = RollupPyramid(sensors)
+        for hour in range(24):
+            t = np.arange(hour * 3600.0, (hour + 1) * 3600.0)
+            pyramid.add(np.tile(np.arange(sensors), len(t)), np.repeat(t, sensors), np.ones(len(t) * sensors))
+
+        level = pyramid.choose_level(0.0, 86400.0, 1000)
+        self.assertEqual(pyramid.levels[level].resolution, 600.0)
+        buckets = pyramid.query(level, 0.0, 86400.0)
+        self.assertEqual(buckets["count"].shape, (144, sensors))
+        self.assertTrue((buckets["count"] == 600).all())
+        self.assertIsNone(pyramid.choose_level(86000.0, 86400.0, 1000, raw_start=80000.0))
+        self.assertEqual(pyramid.choose_level(86000.0, 86400.0, 1000), 0)
+        self.assertEqual(pyramid.choose_level(80000.0, 86400.0, 1000, raw_start=80000.0), 1)
+        # Raw history (capped for fast sensors) starting inside the range: the 1 s level has it all
+        self.assertEqual(pyramid.choose_level(86000.0, 86400.0, 1000, raw_start=86200.0), 0)
+        # ... unless the rollups start no earlier than the raw samples (e.g. right after startup)
+        fresh = RollupPyramid(1)
+        fresh.add(np.zeros(10, dtype=np.intp), np.linspace(100.0, 110.0, 10), np.ones(10))
+        self.assertIsNone(fresh.choose_level(50.0, 110.0, 1000, raw_start=100.0))
+
+        times, values = pyramid.envelope(level, 0.0, 86400.0, 5)
+        self.assertEqual(len(times), 2 * 144)
+        self.assertTrue((values == 1.0).all())
+
+class TestSegmentStore(unittest.TestCase):
+    """
+    Tests for the memory-mapped columnar recording store.
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def record(self, store, frames):
+        store.start()
+        store.set_sensors(["S01", "S02", "S03"])
+        for timestamp, positions, values in frames:
+            positions = np.array(positions, dtype=np.intp)
+            store.append(positions, np.array(values), np.zeros(len(positions), dtype=np.uint8), timestamp)
+        store.stop()
+
+    def test_round_trip_and_range_read(self):
+        """
+        Verify that keyframes and deltas are stored per sensor and read back by time range.
+
+        Input: One keyframe and two deltas for 3 sensors
+        Output: Asserts per-sensor rows, range filtering and zero-copy memmap views
+        """
+        store = SegmentStore(self.directory)
+        self.record(store, [(100.0, [0, 1, 2], [1.0, 2.0, 3.0]),
+                            (101.0, [1], [2.5]),
+                            (102.0, [1, 2], [2.75, 3.5])])
+        self.assertEqual(store.stats()["frames_written"], 3)
+        self.assertEqual(len(list_segments(self.directory)), 1)
+
+        times, values, status = read_range(self.directory, "S02")
+        self.assertEqual(times.tolist(), [100.0, 101.0, 102.0])
+        self.assertEqual(values.tolist(), [2.0, 2.5, 2.75])
+        self.assertFalse(times.flags["OWNDATA"])  # View into the mapped file
+        times, values, _ = read_range(self.directory, "S03", 101.0, 200.0)
+        self.assertEqual(times.tolist(), [102.0])
+        self.assertEqual(read_range(self.directory, "S01", 101.0, 200.0)[0].size, 0)
+        self.assertEqual(read_range(self.directory, "S99")[0].size, 0)
+
+    def test_rotation_by_size_and_time(self):
+        """
+        Verify that segments rotate when full, when they span too long, and on a new sensor set.
+
+        Input: 8-row segments, 20 frames one second apart, 10 s segment span
+        Output: Asserts several segments and a seamless read across them
+        """
+        store = SegmentStore(self.directory, segment_bytes=1, segment_seconds=10.0)
+        self.record(store, [(float(t), [0, 1, 2], [t, t, t]) for t in range(20)])
+        segments = [Segment.open(path) for path in list_segments(self.directory)]
+        self.assertEqual([s.capacity for s in segments], [8] * 3)
+        self.assertEqual([int(s.counts[0]) for s in segments], [8, 8, 4])
+        times, values, _ = read_range(self.directory, "S01", 5.0, 15.0)
+        self.assertEqual(times.tolist(), [float(t) for t in range(5, 16)])
+
+        # A restart keeps appending after the existing segments
+        store = SegmentStore(self.directory, segment_seconds=5.0)
+        self.record(store, [(float(t), [0], [t]) for t in range(20, 32)])
+        self.assertEqual(len(list_segments(self.directory)), 6)
+        self.assertEqual(read_range(self.directory, "S01")[0].size, 32)
+
+    def test_comm_thread_feeds_recorder(self):
+        """
+        Verify that CommThread records every applied frame under the schema's sensor order.
+
+        Input: Schema for 2 sensors, a keyframe and a delta through handle_message
+        Output: Asserts both sensors' stored rows
+        """
+        store = SegmentStore(self.directory)
+        store.start()
+        comm = CommThread(recorder=store)
+        comm.handle_message(build_schema({"A": SENSOR_CONFIG["S01"], "B": SENSOR_CONFIG["S02"]}))
+        comm.handle_message(SensorFrame(1, 10.0, np.array([1.0, 2.0]), np.zeros(2, dtype=np.uint8)))
+        comm.handle_message(SensorFrame(2, 11.0, np.array([3.0]), np.ones(1, dtype=np.uint8),
+                                        np.array([1], dtype=np.uint32)))
+        store.stop()
+        self.assertEqual(read_range(self.directory, "A")[1].tolist(), [1.0])
+        times, values, status = read_range(self.directory, "B")
+        self.assertEqual(values.tolist(), [2.0, 3.0])
+        self.assertEqual(status.tolist(), [0, 1])
+
+    def test_comm_thread_records_every_burst_sample(self):
+        """
+        Verify that fast sensors are recorded sample by sample, not one value per frame.
+
+        Input: 1000 Hz S02; two keyframes 50 ms apart with bursts, then a delta carrying only a burst
+        Output: Asserts every burst sample stored once in time order, ending on the frame times,
+                and one row per frame for the slow sensor
+        """
+        config = generate_dynamic_config(3)
+        config["S02"] = dict(config["S02"], sample_rate=1000.0)
+        generator = BurstGenerator(config, {"update_rate": 0.05}, seed=1)
+        store = SegmentStore(self.directory)
+        store.start()
+        comm = CommThread(recorder=store)
+        comm.handle_message(build_schema(config))
+        samples = 0
+        for seq, timestamp in ((1, 100.0), (2, 100.05)):
+            values = np.array([50.0, 1000.0, 700.0])
+            status = np.zeros(3, dtype=np.uint8)
+            burst = generator.generate(timestamp, values, status)
+            samples += int(burst[1][burst[0] == 1].sum())  # S02 only (S03 has a sample rate too)
+            comm.handle_message(SensorFrame(seq, timestamp, values, status, burst=burst))
+        comm.handle_message(SensorFrame(3, 100.1, np.empty(0), np.empty(0, dtype=np.uint8),
+                                        np.empty(0, dtype=np.uint32),
+                                        burst=(np.array([1]), np.array([3]), np.array([1.0, 2.0, 3.0]))))
+        store.stop()
+
+        times, values, _ = read_range(self.directory, "S02")
+        self.assertEqual(times.size, samples + 3)
+        self.assertTrue((np.diff(times) > 0).all())
+        self.assertIn(100.05, times.tolist())
+        self.assertEqual(times[-1], 100.1)
+        self.assertEqual(values[-3:].tolist(), [1.0, 2.0, 3.0])
+        self.assertEqual(read_range(self.directory, "S01")[0].tolist(), [100.0, 100.05])
+
+class TestAlarmEngine(unittest.TestCase):
+    """
+    Tests for the vectorized alarm engine (no Qt).
+    """
+
+    def setUp(self):
+        # S01 limits 20..80: hysteresis band 1.2
+        self.engine = AlarmEngine(SENSOR_CONFIG, hysteresis=0.02)
+        self.ok = np.zeros(1, dtype=np.uint8)
+
+    def evaluate(self, value, status=None):
+        status = self.ok if status is None else np.array([status], dtype=np.uint8)
+        return self.engine.evaluate(np.array([0]), np.array([value]), status)
+
+    def test_only_transitions_are_reported(self):
+        """
+        Verify that evaluate() returns state changes only, with old and new states.
+
+        Input: Every sensor in range, then S01 high twice, then S01 faulty
+        Output: Asserts empty, one HIGH, empty, one HIGH -> FAULT transition
+        """
+        positions = np.arange(len(SENSOR_CONFIG))
+        values = np.array([50.0, 1000.0, 700.0, 2.5, 50.0])
+        status = np.zeros(len(values), dtype=np.uint8)
+        self.assertEqual(len(self.engine.evaluate(positions, values, status)), 0)
+
+        values[0] = 95.0
+        changes = self.engine.evaluate(positions, values, status)
+        self.assertEqual(changes.positions.tolist(), [0])
+        self.assertEqual((changes.previous.tolist(), changes.current.tolist()), ([ALARM_NONE_STATE], [ALARM_HIGH]))
+        self.assertEqual(changes.values.tolist(), [95.0])
+        self.assertEqual(len(self.engine.evaluate(positions, values, status)), 0)
+
+        status[0] = STATUS_FAULT
+        changes = self.engine.evaluate(positions, values, status)
+        self.assertEqual((changes.previous.tolist(), changes.current.tolist()), ([ALARM_HIGH], [ALARM_FAULT_STATE]))
+        self.assertEqual(self.engine.state.tolist(), [ALARM_FAULT_STATE, 0, 0, 0, 0])
+
+    def test_hysteresis_band_stops_toggling(self):
+        """
+        Verify that a value jittering at a limit raises the alarm once and clears it past the band.
+
+        Input: S01 around its low limit 20 (band 1.2)
+        Output: Asserts one LOW transition for the jitter, NONE only above 21.2
+        """
+        changes = [len(self.evaluate(value)) for value in (19.9, 20.1, 19.95, 20.5, 21.0)]
+        self.assertEqual(changes, [1, 0, 0, 0, 0])
+        self.assertEqual(self.engine.state[0], ALARM_LOW)
+        self.assertEqual(self.evaluate(21.5).current.tolist(), [ALARM_NONE_STATE])
+
+    def test_debounce_requires_consecutive_readings(self):
+        """
+        Verify that a limit state is only taken after `debounce` consecutive readings, faults at once.
+
+        Input: Engine with debounce 3; S01 high, interrupted, then high three times; then a fault
+        Output: Asserts the HIGH transition on the third consecutive reading and an immediate FAULT
+        """
+        self.engine = AlarmEngine(SENSOR_CONFIG, debounce=3)
+        changes = [len(self.evaluate(value)) for value in (95.0, 95.0, 50.0, 95.0, 95.0, 95.0)]
+        self.assertEqual(changes, [0, 0, 0, 0, 0, 1])
+        self.assertEqual(self.evaluate(95.0, STATUS_FAULT).current.tolist(), [ALARM_FAULT_STATE])
+
+    def test_partial_frames_and_reset(self):
+        """
+        Verify that delta frames only touch their sensors and reset() re-arms active alarms.
+
+        Input: Full frame with S01 and S05 high, delta frame with S05 only, reset, delta again
+        Output: Asserts S01 keeps its state, S05 is reported again after reset
+        """
+        positions = np.arange(len(SENSOR_CONFIG))
+        status = np.zeros(len(positions), dtype=np.uint8)
+        self.engine.evaluate(positions, np.array([95.0, 1000.0, 700.0, 2.5, 150.0]), status)
+        self.assertEqual(len(self.engine.evaluate(np.array([4]), np.array([150.0]), status[:1])), 0)
+        self.assertEqual(self.engine.state[0], ALARM_HIGH)
+        self.engine.reset()
+        changes = self.engine.evaluate(np.array([4]), np.array([150.0]), status[:1])
+        self.assertEqual(changes.positions.tolist(), [4])
+
+    def test_vectorized_at_100k_sensors(self):
+        """
+        Verify that one frame of 100k sensors is classified in a single vectorized pass.
+
+        Input: 100k sensors with limits 0..100, 1% out of range, one faulty
+        Output: Asserts transition counts and a generous time bound
+        """
+        count = 100000
+        config = {f"S{i:06d}": {"limits": (0.0, 100.0)} for i in range(count)}
+        engine = AlarmEngine(config)
+        positions = np.arange(count)
+        values = np.full(count, 50.0)
+        values[::100] = 150.0
+        status = np.zeros(count, dtype=np.uint8)
+        status[1] = STATUS_FAULT
+
+        start = time.perf_counter()
+        changes = engine.evaluate(positions, values, status)
+        elapsed = time.perf_counter() - start
+        self.assertEqual(len(changes), count // 100 + 1)
+        self.assertEqual(int((changes.current == ALARM_HIGH).sum()), count // 100)
+        self.assertLess(elapsed, 0.5)
+        self.assertEqual(len(engine.evaluate(positions, values, status)), 0)
+
+class TestDashboardRendering(unittest.TestCase):
+    """
+    Tests for the Dashboard ingest / render split (offscreen Qt platform).
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.dashboard = Dashboard(CommThread(), fps=30)
+        self.dashboard.render_timer.stop()
+        # Plots are built once their slots are on screen
+        self.dashboard.show()
+        QApplication.processEvents()
+        self.state = SensorState(SENSOR_CONFIG)
+        self.accumulator = BatchAccumulator(self.state)
+
+    def tearDown(self):
+        self.dashboard.close()
+
+    def cell(self, row, col, role=Qt.ItemDataRole.DisplayRole):
+        model = self.dashboard.table_model
+        return model.data(model.index(row, col), role)
+
+    def make_batch(self, values, status=None):
+        status = np.zeros(len(values), dtype=np.uint8) if status is None else np.array(status, dtype=np.uint8)
+        frame = SensorFrame(1, 1000.0, np.array(values, dtype=np.float64), status)
+        self.accumulator.add(self.state.apply(frame), frame.timestamp)
+        return self.accumulator.take()
+
+    def test_ingest_defers_drawing_to_render(self):
+        """
+        Verify that update_data only updates state and render() draws dirty rows once.
+
+        Input: One batch for all sensors, S01 above its high limit
+        Output: Asserts table unchanged before render, updated after, dirty sets emptied
+        """
+        values = [95.0, 1000.0, 700.0, 2.5, 50.0]
+        self.dashboard.update_data(self.make_batch(values))
+        self.assertEqual(self.cell(0, 2), "-")
+        self.assertEqual(self.dashboard.alarm_states["S01"], "HIGH LIMIT: 95.0 > 80.0")
+
+        self.dashboard.render()
+        self.assertEqual(self.cell(0, 2), "95.0")
+        self.assertEqual(self.cell(0, 0, Qt.ItemDataRole.BackgroundRole).color().name(), "#ff5555")
+        self.assertEqual(self.dashboard.dirty_rows, set())
+        self.assertEqual(self.dashboard.dirty_plots, set())
+        x_data, y_data = self.dashboard.plots["S01"].getData()
+        self.assertEqual(y_data.tolist(), [95.0])
+
+    def test_fault_row_is_purple(self):
+        """
+        Verify that a faulty sensor is coloured as a fault and logged once.
+
+        Input: Two batches with S02 faulty
+        Output: Asserts purple row and a single fault log entry
+        """
+        values = [50.0, 0.0, 700.0, 2.5, 50.0]
+        for _ in range(2):
+            self.dashboard.update_data(self.make_batch(values, [0, 1, 0, 0, 0]))
+        self.dashboard.render()
+        self.assertEqual(self.cell(1, 0, Qt.ItemDataRole.BackgroundRole).color().name(), "#bd93f9")
+        self.assertEqual(self.dashboard.fault_log.toPlainText().count("Pressure (S02)"), 1)
+
+    def test_limit_jitter_is_logged_once(self):
+        """
+        Verify that a value jittering around a limit is logged and notified once.
+
+        Input: S01 alternating just above and below its high limit 80
+        Output: Asserts one limit log entry and the alarm kept active inside the hysteresis band
+        """
+        for value in (80.5, 79.8, 80.3, 79.5, 80.1):
+            self.dashboard.update_data(self.make_batch([value, 1000.0, 700.0, 2.5, 50.0]))
+        self.assertEqual(self.dashboard.limit_log.toPlainText().count("(S01)"), 1)
+        self.assertEqual(self.dashboard.alarm_states["S01"], "HIGH LIMIT: 80.5 > 80.0")
+        self.dashboard.update_data(self.make_batch([70.0, 1000.0, 700.0, 2.5, 50.0]))
+        self.assertNotIn("S01", self.dashboard.alarm_states)
+
+    def test_panned_plot_ignores_data_outside_view(self):
+        """
+        Verify that a plot scrolled back in time stops following live data.
+
+        Input: Two batches; the S01 plot is panned to the first before the second arrives
+        Output: Asserts S01 is not redrawn for off-screen data, and resumes following at the edge
+        """
+        self.dashboard.update_data(self.make_batch([50.0, 1000.0, 700.0, 2.5, 50.0]))
+        self.dashboard.render()
+        view = self.dashboard.plot_views["S01"]
+        first = 1000.0 - self.dashboard.start_time
+        view.setXRange(first - 30.0, first - 10.0, padding=0)
+        self.assertFalse(self.dashboard.follow_live["S01"])
+        self.dashboard.render()
+
+        frame = SensorFrame(2, 1060.0, np.array([60.0, 1000.0, 700.0, 2.5, 50.0]), np.zeros(5, dtype=np.uint8))
+        self.accumulator.add(self.state.apply(frame), frame.timestamp)
+        self.dashboard.update_data(self.accumulator.take())
+        self.assertNotIn("S01", self.dashboard.dirty_plots)
+        self.assertEqual(len(self.dashboard.history["S01"]), 2)
+
+        view.setXRange(first, first + 60.0, padding=0)
+        self.assertTrue(self.dashboard.follow_live["S01"])
+        self.dashboard.render()
+        x_data, y_data = self.dashboard.plots["S01"].getData()
+        self.assertEqual(y_data.tolist(), [50.0, 60.0])
+
+    def test_zoomed_out_plot_draws_rollups(self):
+        """
+        Verify that a plot zoomed out beyond the raw history is drawn from the rollups.
+
+        Input: One hour of 1 Hz samples for S01, a ~2 h range ending before the newest sample,
+               raw history holding only the last 100 s
+        Output: Asserts the plot shows evenly spaced rollup buckets (two points each) from the start
+        """
+        self.dashboard.history["S01"] = RingHistory(100)
+        times = np.arange(3600.0) + self.dashboard.start_time
+        frames = [SensorFrame(i, t, np.array([50.0, 1000.0, 700.0, 2.5, 50.0]), np.zeros(5, dtype=np.uint8))
+                  for i, t in enumerate(times)]
+        for frame in frames:
+            self.accumulator.add(self.state.apply(frame), frame.timestamp)
+        self.dashboard.update_data(self.accumulator.take())
+
+        self.dashboard.plot_views["S01"].setXRange(-3600.0, 3000.0, padding=0)
+        self.assertFalse(self.dashboard.follow_live["S01"])
+        self.dashboard.render()
+        x_data, y_data = self.dashboard.plots["S01"].getData()
+        self.assertLess(x_data[0], 60.0)
+        self.assertEqual(len(x_data) % 2, 0)
+        steps = np.diff(x_data[::2])
+        self.assertTrue(np.all(steps == steps[0]) and steps[0] >= 10.0)
+        self.assertTrue(np.all(y_data == 50.0))
+
+    def test_offscreen_plots_and_maintenance_tab_are_deferred(self):
+        """
+        Verify that only on-screen plots and no Maintenance tab widgets are built at startup.
+
+        Input: Schema with 40 sensors and one batch, then scrolling down and opening the Maintenance tab
+        Output: Asserts a few plots built, the rest built with their history on scroll, the log kept
+        """
+        sensor_config = generate_dynamic_config(40)
+        self.dashboard.update_schema(build_schema(sensor_config))
+        for _ in range(3):  # Slots added, then laid out by the scroll area
+            QApplication.processEvents()
+        built = set(self.dashboard.plots)
+        self.assertIn("S01", built)
+        self.assertLess(len(built), 40)
+        self.assertFalse(self.dashboard.maint_built)
+
+        state = SensorState(sensor_config)
+        accumulator = BatchAccumulator(state)
+        frame = SensorFrame(1, 1000.0, np.array([sum(info['limits']) / 2 for info in sensor_config.values()]),
+                            np.zeros(40, dtype=np.uint8))
+        accumulator.add(state.apply(frame), frame.timestamp)
+        self.dashboard.update_data(accumulator.take())
+        self.dashboard.render()
+        self.assertNotIn("S40", self.dashboard.plots)
+        self.assertEqual(len(self.dashboard.history["S40"]), 1)
+
+        scroll = self.dashboard.plot_slots["S40"].parentWidget().parentWidget().parentWidget()
+        scroll.verticalScrollBar().setValue(scroll.verticalScrollBar().maximum())
+        self.assertIn("S40", self.dashboard.plots)
+        self.dashboard.render()
+        self.assertEqual(self.dashboard.plots["S40"].getData()[1].tolist(), [frame.values[39]])
+
+        self.dashboard.tabs.setCurrentWidget(self.dashboard.maint_tab)
+        self.assertTrue(self.dashboard.maint_built)
+        self.assertIn("Schema received: 40 sensors.", self.dashboard.system_log.toPlainText())
+        self.assertFalse(self.dashboard.btn_reset.isEnabled())
+
+    def test_table_model_coalesces_row_updates(self):
+        """
+        Verify that the table model handles 10k rows and signals changed rows in runs.
+
+        Input: 10,000-sensor config, updates for rows 3-5 and 9000
+        Output: Asserts row count, two dataChanged ranges and the stored values
+        """
+        config = generate_dynamic_config(10000)
+        model = SensorTableModel(("OK", "Faulty Sensor"))
+        model.set_sensors(config)
+        self.assertEqual(model.rowCount(), 10000)
+        self.assertIsNone(model.data(model.index(9000, 0), Qt.ItemDataRole.BackgroundRole))
+
+        ranges = []
+        model.dataChanged.connect(lambda first, last: ranges.append((first.row(), last.row())))
+        model.update_rows([5, 9000, 3, 4], [1.5, 2.5, 3.5, 4.5], [0, 1, 0, 0], [1000.0] * 4,
+                          [ALARM_NONE, ALARM_LIMIT, ALARM_NONE, ALARM_NONE])
+        self.assertEqual(ranges, [(3, 5), (9000, 9000)])
+        self.assertEqual(model.data(model.index(9000, 2)), "2.5")
+        self.assertEqual(model.data(model.index(9000, 4)), "Faulty Sensor")
+        self.assertEqual(model.data(model.index(4000, 2)), "-")
+
+class TestBroadcastServer(unittest.TestCase):
+    """
+    Integration tests for the multi-client broadcast server.
+    Runs the simulator in-process on an ephemeral port.
+    """
+
+    def setUp(self):
+        """Start the simulator on a free port with a fast tick."""
+        sim_config = {"update_rate": 0.05, "fault_prob": 0.0, "spike_prob": 0.0, "drift_amount": 0.05}
+        self.sensor_config = generate_dynamic_config(12)
+        self.simulator = SensorSimulator(port=0, sensor_config=self.sensor_config, sim_config=sim_config)
+        self.server_thread = threading.Thread(target=self.simulator.start, daemon=True)
+        self.server_thread.start()
+        self.assertTrue(self.simulator.wait_until_ready(5.0))
+        self.clients = []
+
+    def tearDown(self):
+        for conn in self.clients:
+            conn.close()
+        self.simulator.stop()
+        self.server_thread.join(5.0)
+
+    def connect(self):
+        conn = socket.create_connection((self.simulator.host, self.simulator.port), timeout=5.0)
+        self.clients.append(conn)
+        return conn.makefile("rb")
+
+    def read_message(self, reader):
+        return decode_json_message(json.loads(reader.readline()))
+
+    def test_comm_thread_batches_flow_through_queued_signal(self):
+        """
+        Verify that CommThread keeps delivering batches once the GUI thread takes them.
+
+        Input: Real CommThread connected to the simulator, GUI event loop pumped by the test
+        Output: Asserts several batches arrive (each after the previous one's queued
+                data_received -> batch_delivered slot ran) and the stream reached the state
+        """
+        app = QApplication.instance() or QApplication([])
+        comm = CommThread(port=self.simulator.port)
+        batches = []
+        comm.data_received.connect(batches.append)
+        comm.start()
+        try:
+            deadline = time.monotonic() + 5.0
+            while len(batches) < 3 and time.monotonic() < deadline:
+                app.processEvents()
+                time.sleep(0.01)
+        finally:
+            comm.stop()
+        self.assertGreaterEqual(len(batches), 3)
+        self.assertEqual(batches[-1].sensor_ids, list(self.sensor_config))
+
+    def test_connection_errors_do_not_stop_server(self):
+        """
+        Verify that a failing accept or client connection only affects that connection.
+
+        Input: accept() raising ConnectionAbortedError; a client whose read handler raises
+        Output: Asserts the other client keeps receiving frames and the server keeps running
+        """
+        class AbortingListener:
+            def accept(self):
+                raise ConnectionAbortedError("handshake aborted")
+        self.assertIsNone(self.simulator._accept_client(AbortingListener()))
+
+        bad = self.connect()
+        good = self.connect()
+        self.read_message(bad)
+        self.read_message(good)
+        bad_port = self.clients[0].getsockname()[1]
+        read_client = self.simulator._read_client
+
+        def failing_read(client):
+            if client.addr[1] == bad_port:
+                raise RuntimeError("handler bug")
+            read_client(client)
+        self.simulator._read_client = failing_read
+        self.clients[0].sendall(b'{"command": "RESET"}\n')
+
+        deadline = time.monotonic() + 5.0
+        while len(self.simulator.clients) > 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(len(self.simulator.clients), 1)
+        for _ in range(3):
+            self.assertIsInstance(self.read_message(good), SensorFrame)
+        self.assertTrue(self.server_thread.is_alive())
+
+    def test_schema_sent_once_on_connect(self):
+        """
+        Verify that a new client first gets the schema, then positional frames only.
+
+        Input: One connection to a simulator with 12 dynamically generated sensors
+        Output: Asserts schema metadata/limits and frames without per-sensor metadata
+        """
+        reader = self.connect()
+        schema = self.read_message(reader)
+        self.assertEqual(schema["type"], "schema")
+        self.assertEqual(schema_to_config(schema), self.sensor_config)
+
+        line = reader.readline()
+        self.assertNotIn(b"Extra Sensor", line)
+        frame = decode_json_message(json.loads(line))
+        self.assertIsInstance(frame, SensorFrame)
+        self.assertEqual(len(frame.values), len(self.sensor_config))
+
+    def test_every_client_receives_frames(self):
+        """
+        Verify that several concurrent clients are all served.
+
+        Input: Three simultaneous connections
+        Output: Asserts each client receives a full sensor frame
+        """
+        readers = [self.connect() for _ in range(3)]
+        for reader in readers:
+            self.read_message(reader)  # Schema
+            frame = self.read_message(reader)
+            self.assertEqual(len(frame.values), len(self.sensor_config))
+
+    def test_command_does_not_stall_broadcast(self):
+        """
+        Verify that a command from one client is acknowledged to that client
+        while the other clients keep receiving frames.
+
+        Input: CLEAR_FAULTS sent without a trailing newline, split across two writes
+        Output: Asserts Ack on the sender and data on the observer
+        """
+        observer = self.connect()
+        sender = self.connect()
+        self.read_message(observer)
+        self.read_message(sender)
+
+        self.clients[1].sendall(b'{"command": ')
+        self.clients[1].sendall(b'"CLEAR_FAULTS"}')
+
+        ack = None
+        for _ in range(50):
+            msg = self.read_message(sender)
+            if isinstance(msg, dict) and "status" in msg:
+                ack = msg
+                break
+        self.assertEqual(ack, {"status": "OK", "message": "Faults Cleared"})
+        self.assertIsInstance(self.read_message(observer), SensorFrame)
+
+    def test_binary_protocol_negotiation(self):
+        """
+        Verify that a client can switch to binary frames while others stay on JSON.
+
+        Input: SET_PROTOCOL binary from one client
+        Output: Asserts Ack, then binary frames; JSON for the observer
+        """
+        observer = self.connect()
+        self.connect()
+        conn = self.clients[1]
+        conn.sendall(b'{"command": "SET_PROTOCOL", "protocol": "binary"}\n')
+
+        decoder = FrameDecoder()
+        ack, frame = None, None
+        while frame is None or ack is None:
+            for msg in decoder.feed(conn.recv(65536)):
+                if isinstance(msg, SensorFrame):
+                    # JSON frames may still arrive before the Ack
+                    frame = msg if ack else None
+                elif "status" in msg:
+                    ack = msg
+        self.assertEqual(ack["protocol"], "binary")
+        self.assertEqual(len(frame.values), len(self.sensor_config))
+        self.assertGreater(frame.seq, 0)
+        self.read_message(observer)  # Schema
+        self.assertIsInstance(self.read_message(observer), SensorFrame)
+
+    def test_delta_mode_late_joiner_gets_keyframe(self):
+        """
+        Verify that in delta mode a client joining mid-stream starts from a keyframe.
+
+        Input: Delta mode enabled, client connects after several ticks
+        Output: Asserts the first data frame the client sees is full
+        """
+        self.simulator.delta = True
+        self.simulator.sim_config["keyframe_interval"] = 1000
+        first = self.connect()
+        self.read_message(first)
+        for _ in range(3):
+            self.read_message(first)
+
+        late = self.connect()
+        self.read_message(late)  # Schema
+        frame = self.read_message(late)
+        self.assertTrue(frame.is_keyframe)
+        self.assertEqual(len(frame.values), len(self.sensor_config))
+
+class TestVirtualClock(unittest.TestCase):
+    """
+    Tests for seeded, virtual-time simulation runs.
+    """
+
+    SIM_CONFIG = {"update_rate": 5.0, "fault_prob": 0.05, "spike_prob": 0.05, "drift_amount": 0.05,
+                  "fault_duration": 20.0}
+
+    def make_simulator(self, **kwargs):
+        return SensorSimulator(port=0, sensor_config=generate_dynamic_config(50), sim_config=self.SIM_CONFIG,
+                               virtual_clock=True, **kwargs)
+
+    def test_seeded_runs_are_identical(self):
+        """
+        Verify that the same seed reproduces the same frames in both engines, on the virtual clock.
+
+        Input: Two simulators per engine with seed 7, 100 frames each
+        Output: Asserts identical values/status and timestamps stepping by update_rate
+        """
+        for vectorized in (False, True):
+            first = self.make_simulator(seed=7, vectorized=vectorized)
+            second = self.make_simulator(seed=7, vectorized=vectorized)
+            for tick in range(1, 101):
+                a, b = first.generate_frame(), second.generate_frame()
+                self.assertEqual(a.values.tolist(), b.values.tolist())
+                self.assertEqual(a.status.tolist(), b.status.tolist())
+                self.assertEqual(a.timestamp, VIRTUAL_EPOCH + tick * 5.0)
+        other = self.make_simulator(seed=8).generate_frame()
+        self.assertNotEqual(other.values.tolist(), self.make_simulator(seed=7).generate_frame().values.tolist())
+
+    def test_fault_duration_follows_virtual_time(self):
+        """
+        Verify that sticky faults last fault_duration of simulated time, not wall time.
+
+        Input: fault_prob=1.0, 20 s faults, 5 s virtual ticks
+        Output: Asserts four faulty frames, one recovered frame, then a new fault
+        """
+        simulator = SensorSimulator(sensor_config=generate_dynamic_config(1),
+                                    sim_config=dict(self.SIM_CONFIG, fault_prob=1.0), seed=1, virtual_clock=True)
+        statuses = [simulator.generate_frame().status[0] for _ in range(6)]
+        self.assertEqual(statuses, [STATUS_FAULT] * 4 + [STATUS_OK, STATUS_FAULT])
+
+    def test_server_runs_faster_than_real_time(self):
+        """
+        Verify that in virtual mode the server streams frames as fast as the client reads them.
+
+        Input: Virtual clock with 5 s ticks; client reads 300 frames (25 simulated minutes)
+        Output: Asserts consecutive timestamps within a few wall-clock seconds
+        """
+        simulator = self.make_simulator(seed=3)
+        thread = threading.Thread(target=simulator.start, daemon=True)
+        thread.start()
+        self.assertTrue(simulator.wait_until_ready(5.0))
+        conn = socket.create_connection((simulator.host, simulator.port), timeout=5.0)
+        try:
+            reader = conn.makefile("rb")
+            reader.readline()  # Schema
+            times = [decode_json_message(json.loads(reader.readline())).timestamp for _ in range(300)]
+        finally:
+            conn.close()
+            simulator.stop()
+            thread.join(5.0)
+        self.assertEqual(np.diff(times).tolist(), [5.0] * 299)
+
+class TestReplay(unittest.TestCase):
+    """
+    Tests for recording simulator sessions and replaying them.
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "session.jsonl")
+        self.servers = []
+
+    def tearDown(self):
+        for simulator, thread, conn in self.servers:
+            conn.close()
+            simulator.stop()
+            thread.join(5.0)
+        self.tmp.cleanup()
+
+    def write_recording(self, times):
+        config = generate_dynamic_config(3)
+        recorder = FrameRecorder(self.path, build_schema(config))
+        for i, t in enumerate(times):
+            recorder.write(SensorFrame(i, t, np.array([float(i), 1.0, 2.0]), np.zeros(3, dtype=np.uint8)))
+        recorder.close()
+        return config
+
+    def serve(self, **kwargs):
+        """Starts a simulator on a free port and returns a reader connected to it."""
+        sim_config = {"update_rate": 0.02, "fault_prob": 0.0, "spike_prob": 0.0, "drift_amount": 0.05}
+        simulator = SensorSimulator(port=0, sim_config=sim_config, **kwargs)
+        thread = threading.Thread(target=simulator.start, daemon=True)
+        thread.start()
+        self.assertTrue(simulator.wait_until_ready(5.0))
+        conn = socket.create_connection((simulator.host, simulator.port), timeout=5.0)
+        self.servers.append((simulator, thread, conn))
+        return simulator, conn.makefile("rb")
+
+    def test_pacing_seek_and_loop(self):
+        """
+        Verify that playback follows the recorded gaps at N x speed, seeks, and loops with rising timestamps.
+
+        Input: Recording with frames at t = 100, 101, 102, 103, 105; speed 2, seek 2 s, loop
+        Output: Asserts frame values, per-frame delays and monotonic timestamps across two passes
+        """
+        config = self.write_recording([100.0, 101.0, 102.0, 103.0, 105.0])
+        source = ReplaySource(self.path, speed=2.0)
+        self.assertEqual(source.sensor_config, config)
+        self.assertEqual(source.update_rate, 0.5)
+        delays = []
+        while not source.finished:
+            source.next_frame(0)
+            delays.append(source.delay())
+        self.assertEqual(delays, [0.5, 0.5, 0.5, 1.0, 0.0])
+        self.assertIsNone(source.next_frame(0))
+
+        source = ReplaySource(self.path, speed=2.0, loop=True, seek=2.0)
+        frames = [source.next_frame(i) for i in range(6)]
+        self.assertEqual([f.values[0] for f in frames], [2.0, 3.0, 4.0, 2.0, 3.0, 4.0])
+        self.assertEqual([f.timestamp for f in frames], [102.0, 103.0, 105.0, 106.0, 107.0, 109.0])
+
+    def test_record_live_session_and_replay_it(self):
+        """
+        Verify that frames streamed live are recorded and replayed unchanged at full speed.
+
+        Input: Live simulator with --record, then a max-speed replay of that file
+        Output: Asserts the replayed client sees the schema and the recorded frames in order
+        """
+        simulator, reader = self.serve(sensor_config=generate_dynamic_config(4), record_path=self.path)
+        reader.readline()  # Schema
+        live = [decode_json_message(json.loads(reader.readline())) for _ in range(5)]
+        simulator.stop()
+        self.servers[-1][1].join(5.0)
+
+        source = ReplaySource(self.path, speed=0)
+        self.assertEqual(source.sensor_config, generate_dynamic_config(4))
+        recorded = len(source.offsets)
+        self.assertGreaterEqual(recorded, 5)
+
+        _, reader = self.serve(source=source)
+        schema = decode_json_message(json.loads(reader.readline()))
+        self.assertEqual(schema_to_config(schema), generate_dynamic_config(4))
+        replayed = [decode_json_message(json.loads(reader.readline())) for _ in range(recorded)]
+        for original, frame in zip(live, replayed):
+            self.assertEqual(frame.timestamp, original.timestamp)
+            self.assertEqual(frame.values.tolist(), original.values.tolist())
+        self.assertTrue(source.finished)
+
+class TestLatencyInstrumentation(unittest.TestCase):
+    """
+    Tests for per-stage latency histograms, stage timestamps on the wire and sequence gaps.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def test_histogram_percentiles_and_rotation(self):
+        """
+        Verify that fixed-bucket percentiles bound the recorded samples and windows roll over.
+
+        Input: 98 samples of 1 ms and 2 of 500 ms, then two rotations
+        Output: Asserts p50 within one bucket of 1 ms, p99 near 500 ms, empty after two rotations
+        """
+        histogram = LatencyHistogram()
+        self.assertIsNone(histogram.percentile(50))
+        for _ in range(98):
+            histogram.record(0.001)
+        histogram.record(0.5)
+        histogram.record(0.5)
+        self.assertTrue(0.001 <= histogram.percentile(50) <= 0.001 * 10 ** 0.1 * 1.0001)
+        self.assertTrue(0.5 <= histogram.percentile(99) <= 0.5 * 10 ** 0.1 * 1.0001)
+        self.assertEqual(histogram.percentile(100), histogram.percentile(99))
+        histogram.record(1e6)
+        self.assertEqual(histogram.percentile(100), float("inf"))
+        self.assertEqual(format_latency(histogram.percentile(100)), "> 100 s")
+
+        histogram.rotate()
+        self.assertEqual(histogram.count(), 101)  # Previous window still counts
+        histogram.rotate()
+        self.assertEqual(histogram.count(), 0)
+        self.assertEqual(histogram.total, 101)
+
+    def test_sequence_gaps(self):
+        """
+        Verify that missing sequence numbers are counted as lost frames and gaps.
+
+        Input: Sequence 1, 2, 5, 6, 9 then a reset and 1
+        Output: Asserts 4 frames lost in 2 gaps, no gap across the reset
+        """
+        monitor = LatencyMonitor()
+        for seq in (1, 2, 5, 6, 9):
+            monitor.observe_seq(seq)
+        monitor.reset_sequence()
+        monitor.observe_seq(1)
+        self.assertEqual((monitor.frames_lost, monitor.gaps), (4, 2))
+
+    def test_sent_time_on_the_wire_feeds_stage_histograms(self):
+        """
+        Verify that the sent timestamp survives both encodings and CommThread samples each stage.
+
+        Input: Frames generated 30 ms and sent 10 ms before decoding, binary and JSON, seq 1 and 3
+        Output: Asserts decoded sent times, send/network/parse samples and one lost frame
+        """
+        now = time.time()
+        comm = CommThread()
+        comm.handle_message(build_schema(generate_dynamic_config(3)))
+        frames = [SensorFrame(1, now - 0.03, np.array([1.0, 2.0, 3.0]), np.zeros(3, dtype=np.uint8), sent=now - 0.01),
+                  SensorFrame(3, now - 0.03, np.array([1.0, 2.0, 3.0]), np.zeros(3, dtype=np.uint8), sent=now - 0.01)]
+        messages = comm.decoder.feed(encode_binary_frame(frames[0]) + encode_json_frame(frames[1]))
+        self.assertEqual([m.sent for m in messages], [now - 0.01, now - 0.01])
+        for msg in messages:
+            comm.handle_message(msg)
+
+        send = comm.latency.histograms[STAGE_SEND]
+        self.assertEqual(send.count(), 2)
+        self.assertTrue(0.02 <= send.percentile(50) < 0.03)
+        self.assertTrue(0.01 <= comm.latency.histograms[STAGE_NETWORK].percentile(50) < 0.1)
+        self.assertEqual(comm.latency.histograms[STAGE_PARSE].count(), 2)
+        self.assertEqual(comm.latency.frames_lost, 1)
+
+        # Frames without stage timestamps still decode (e.g. recordings)
+        plain = comm.decoder.feed(encode_binary_frame(SensorFrame(4, now, np.ones(3), np.zeros(3, dtype=np.uint8))))
+        self.assertIsNone(plain[0].sent)
+
+    def test_dashboard_records_gui_stages_and_shows_panel(self):
+        """
+        Verify that the Dashboard samples queue, render and end-to-end stages and fills the panel.
+
+        Input: One emitted batch ingested and rendered
+        Output: Asserts one sample per GUI stage and percentiles in the Maintenance tab
+        """
+        comm = CommThread()
+        dashboard = Dashboard(comm, fps=30)
+        dashboard.render_timer.stop()
+        try:
+            state = SensorState(SENSOR_CONFIG)
+            accumulator = BatchAccumulator(state)
+            frame = SensorFrame(1, time.time() - 0.05, np.array([50.0, 1000.0, 700.0, 2.5, 50.0]),
+                                np.zeros(5, dtype=np.uint8))
+            accumulator.add(state.apply(frame), frame.timestamp)
+            batch = accumulator.take()
+            batch.emitted = time.time() - 0.002
+            dashboard.update_data(batch)
+            dashboard.render()
+
+            histograms = comm.latency.histograms
+            self.assertEqual([histograms[stage].count() for stage in ("queue", "render", "end_to_end")], [1, 1, 1])
+            self.assertGreaterEqual(histograms["end_to_end"].percentile(50), 0.05)
+            dashboard.tabs.setCurrentWidget(dashboard.maint_tab)
+            dashboard.refresh_latency_panel()
+            self.assertNotEqual(dashboard.latency_labels["end_to_end"][0].text(), "-")
+            self.assertEqual(dashboard.latency_labels["end_to_end"][3].text(), "1")
+        finally:
+            dashboard.close()
+
+class _SMTPStandIn(socketserver.ThreadingTCPServer):
+    """Minimal local SMTP server: records messages and connections, can reject DATA or stall."""
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, reject_data=0, greeting_delay=0.0):
+        super().__init__(("127.0.0.1", 0), _SMTPHandler)
+        self.messages = []
+        self.connections = 0
+        self.reject_data = reject_data  # Transient 451 replies before DATA is accepted
+        self.greeting_delay = greeting_delay
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write(line.encode("ascii") + b"\r\n")
+
+    def handle(self):
+        server = self.server
+        server.connections += 1
+        time.sleep(server.greeting_delay)
+        self.reply("220 stand-in ESMTP")
+        for raw in self.rfile:
+            command = raw.decode("ascii", errors="replace").strip().upper()
+            if command.startswith(("EHLO", "HELO")):
+                self.reply("250 stand-in")
+            elif command.startswith(("MAIL", "RCPT", "RSET", "NOOP")):
+                self.reply("250 OK")
+            elif command == "DATA":
+                if server.reject_data:
+                    server.reject_data -= 1
+                    self.reply("451 Try again later")
+                    continue
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                lines = []
+                for data in self.rfile:
+                    if data == b".\r\n":
+                        break
+                    lines.append(data)
+                server.messages.append(b"".join(lines).decode("utf-8", errors="replace"))
+                self.reply("250 Queued")
+            elif command == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Not implemented")
+
+class TestNotificationDelivery(unittest.TestCase):
+    """
+    Tests for background alert delivery against a local SMTP stand-in.
+    """
+
+    def serve(self, **kwargs):
+        server = _SMTPStandIn(**kwargs)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return server
+
+    def make_manager(self, server, **kwargs):
+        kwargs.setdefault("max_immediate", 100)  # Delivery tests: every FAULT goes out at once
+        manager = NotificationManager(**kwargs)
+        manager.email_config.update(enabled=True, smtp_server="127.0.0.1", smtp_port=server.server_address[1],
+                                    use_tls=False, password="")
+        self.addCleanup(manager.close, 1.0)
+        return manager
+
+    def send(self, manager, sid, level="FAULT"):
+        with contextlib.redirect_stdout(io.StringIO()):  # Mock SMS output
+            manager.send_alert(sid, f"Sensor {sid}", "Limit Exceeded: 95.0", level)
+
+    def test_slow_server_does_not_block_caller(self):
+        """
+        Verify that send_alert returns immediately while the mail server is slow.
+
+        Input: Stand-in that waits 0.5 s before its greeting, one alert
+        Output: Asserts send_alert takes < 0.1 s and the email arrives after flush()
+        """
+        server = self.serve(greeting_delay=0.5)
+        manager = self.make_manager(server)
+        start = time.monotonic()
+        self.send(manager, "S01")
+        self.assertLess(time.monotonic() - start, 0.1)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertTrue(manager.flush(5.0))
+        self.assertEqual(len(server.messages), 1)
+        self.assertIn("Sensor S01", server.messages[0])
+
+    def test_connection_is_reused(self):
+        """
+        Verify that consecutive alerts share one SMTP session per worker.
+
+        Input: One worker, three alerts
+        Output: Asserts three messages over a single connection and the sent counter
+        """
+        server = self.serve()
+        manager = self.make_manager(server, workers=1)
+        for sid in ("S01", "S02", "S03"):
+            self.send(manager, sid)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertTrue(manager.flush(5.0))
+        self.assertEqual(len(server.messages), 3)
+        self.assertEqual(server.connections, 1)
+        self.assertEqual(manager.stats()["sent"], 6)  # Email + mock SMS per alert
+
+    def test_transient_failure_is_retried_with_backoff(self):
+        """
+        Verify that a rejected delivery is retried until it succeeds.
+
+        Input: Stand-in answering 451 to the first two DATA commands, 10 ms backoff
+        Output: Asserts two retries, no failure and the message delivered
+        """
+        server = self.serve(reject_data=2)
+        manager = self.make_manager(server, workers=1, backoff=0.01)
+        self.send(manager, "S01")
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertTrue(manager.flush(5.0))
+        stats = manager.stats()
+        self.assertEqual((stats["retries"], stats["failed"]), (2, 0))
+        self.assertEqual(len(server.messages), 1)
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        """
+        Verify that deliveries beyond the queue bound are dropped and counted.
+
+        Input: No workers, queue of two, two alerts (two deliveries each)
+        Output: Asserts depth 2, two dropped, max depth 2
+        """
+        server = self.serve()
+        manager = self.make_manager(server, workers=0, queue_size=2)
+        with self.assertLogs(level="WARNING"):
+            self.send(manager, "S01")
+            self.send(manager, "S02")
+        stats = manager.stats()
+        self.assertEqual((stats["depth"], stats["dropped"], stats["max_depth"]), (2, 2, 2))
+        self.assertFalse(manager.flush(0.05))
+
+    def test_close_is_bounded_with_hung_deliveries(self):
+        """
+        Verify that close() keeps to one overall deadline and stops workers despite a full queue.
+
+        Input: Two workers stuck in a delivery, a full queue of two more, close(timeout=0.5)
+        Output: Asserts close returns within ~0.5 s and both workers exit once their delivery ends
+        """
+        release = threading.Event()
+
+        def hang(smtp):
+            release.wait(5.0)
+        manager = NotificationManager(workers=2, queue_size=2)
+        for _ in range(2):
+            manager._queue.put_nowait((hang, ()))
+        deadline = time.monotonic() + 5.0
+        while manager._queue.qsize() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        for _ in range(2):
+            manager._queue.put_nowait((hang, ()))  # No room left for stop sentinels
+
+        start = time.monotonic()
+        manager.close(timeout=0.5)
+        self.assertLess(time.monotonic() - start, 0.9)
+        release.set()
+        for worker in manager._workers:
+            worker.join(2.0)
+            self.assertFalse(worker.is_alive())
+
+    def test_sms_backend_is_imported_lazily(self):
+        """
+        Verify that importing the notification manager does not load Twilio.
+
+        Input: Fresh interpreter creating a NotificationManager (SMS disabled)
+        Output: Asserts twilio was not imported
+        """
+        code = ("import sys; from core.notifications import NotificationManager; NotificationManager().close(); "
+                "print('twilio' in sys.modules)")
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))), timeout=60)
+        self.assertEqual(result.stdout.strip(), "False", result.stderr)
+
+    def test_alert_storm_is_digested(self):
+        """
+        Verify that a line-wide trip costs a bounded number of emails.
+
+        Input: 200 LIMIT alerts and 5 FAULT alerts within one window, 3 immediate FAULTs allowed
+        Output: Asserts 3 immediate FAULT emails plus one digest listing the rest by level and type
+        """
+        server = self.serve()
+        manager = self.make_manager(server, digest_window=60.0, max_immediate=3)
+        config = generate_dynamic_config(205)
+        for sid in list(config)[:200]:
+            self.send(manager, sid, "LIMIT")
+        with contextlib.redirect_stdout(io.StringIO()):
+            for sid in list(config)[200:]:
+                manager.send_alert(sid, f"Sensor {sid}", "Sensor Fault detected: Faulty Sensor", "FAULT", "Generic")
+            self.assertTrue(manager.flush(5.0))
+            self.assertEqual(len(server.messages), 3)
+
+            manager.poll(time.time() + 1.0)  # Window not over yet
+            self.assertEqual(manager.stats()["digests"], 0)
+            manager.poll(time.time() + 61.0)
+            self.assertTrue(manager.flush(5.0))
+
+        self.assertEqual(len(server.messages), 4)
+        digest = server.messages[-1]
+        self.assertIn("Smart Factory Alert Digest: 202 sensors (FAULT)", digest)
+        self.assertIn("[FAULT] Generic: 2 sensors", digest)
+        self.assertIn("[LIMIT] Unknown: 200 sensors", digest)
+        self.assertIn("... and 180 more", digest)
+        self.assertEqual(manager.flush_digest(), 0)
+
+    def test_single_digested_alert_keeps_regular_format(self):
+        """
+        Verify that a digest holding one alert is sent like a regular alert.
+
+        Input: One LIMIT alert, digest flushed explicitly
+        Output: Asserts the regular subject and body
+        """
+        server = self.serve()
+        manager = self.make_manager(server)
+        self.send(manager, "S01", "LIMIT")
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(manager.flush_digest(), 1)
+            self.assertTrue(manager.flush(5.0))
+        self.assertIn("Subject: Smart Factory Alert: LIMIT", server.messages[0])
+        self.assertIn("ID:         S01", server.messages[0])
+
+class TestHeadlessMonitor(unittest.TestCase):
+    """
+    Tests for the Qt-free monitor (StreamClient + AlarmEngine + notifications).
+    """
+
+    def test_monitor_does_not_import_qt(self):
+        """
+        Verify that the headless modules load without Qt.
+
+        Input: Fresh interpreter importing core.headless
+        Output: Asserts no PyQt6 module was imported
+        """
+        code = "import sys, core.headless; print(any(m.startswith('PyQt6') for m in sys.modules))"
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))), timeout=60)
+        self.assertEqual(result.stdout.strip(), "False", result.stderr)
+
+    def test_alarm_lines_from_live_stream(self):
+        """
+        Verify that the monitor follows a simulator's schema and writes alarm changes once.
+
+        Input: Simulator with 12 sensors, every frame one sensor above its high limit
+        Output: Asserts a single LIMIT line for it, the alarm active and a status line
+        """
+        sensor_config = generate_dynamic_config(12)
+        sim_config = {"update_rate": 0.05, "fault_prob": 0.0, "spike_prob": 0.0, "drift_amount": 0.0}
+        simulator = SensorSimulator(port=0, sensor_config=sensor_config, sim_config=sim_config, vectorized=True)
+        high = sensor_config["S06"]["limits"][1]
+        generate = simulator.generate_frame
+
+        def generate_with_alarm():
+            frame = generate()
+            frame.values[5] = high * 2
+            return frame
+        simulator.generate_frame = generate_with_alarm
+        server = threading.Thread(target=simulator.start, daemon=True)
+        with contextlib.redirect_stdout(io.StringIO()):
+            server.start()
+            self.assertTrue(simulator.wait_until_ready(5.0))
+
+        output, status = io.StringIO(), io.StringIO()
+        notifications = NotificationManager()
+        notifications.cooldown = 0.0
+        monitor = HeadlessMonitor(port=simulator.port, output=output, status_output=status,
+                                  notifications=notifications)
+        try:
+            monitor.start()
+            deadline = time.monotonic() + 5.0
+            while monitor.stream_stats.get("frames", 0) < 5 and time.monotonic() < deadline:
+                monitor.process_events(0.1)
+            self.assertEqual(monitor.sensor_info, sensor_config)
+            self.assertEqual(output.getvalue().count("(S06)"), 1)
+            self.assertIn("LIMIT", output.getvalue())
+            self.assertIn("S06", monitor.alarm_states)
+            self.assertIn("Schema received: 12 sensors.", status.getvalue())
+            self.assertIn("Active alarms: 1", monitor.status_line())
+        finally:
+            with contextlib.redirect_stdout(io.StringIO()):
+                monitor.shutdown()
+                simulator.stop()
+            server.join(5.0)
+
+class TestSharedMemoryTransport(unittest.TestCase):
+    """
+    Tests for the same-host shared-memory frame ring.
+    """
+
+    def setUp(self):
+        # Unique per test, so parallel or aborted runs never share a segment
+        self.name = f"proline_test_{os.getpid()}_{id(self)}"
+
+    def _frame(self, count, value, seq=0):
+        return SensorFrame(seq, 1000.0 + value, np.full(count, value, dtype=np.float64),
+                           np.full(count, int(value) % 4, dtype=np.uint8), sent=2000.0 + value)
+
+    def test_ring_round_trip(self):
+        """
+        Verify that frames and the schema arrive unchanged.
+
+        Input: Writer for 5 sensors; 3 frames, read after the first
+        Output: Asserts schema, values, status, timestamps, sent, seq and that frames
+                are copies (independent of the ring)
+        """
+        schema = build_schema(generate_dynamic_config(5))
+        writer = ShmRingWriter(self.name, 5, encode_json(schema), slots=8)
+        try:
+            writer.write(self._frame(5, 1.0))
+            reader = ShmRingReader(self.name)
+            self.assertEqual(reader.schema, schema)
+            # Reading starts at the newest published frame
+            frames = [(f.seq, f.timestamp, f.sent, f.values.copy(), f.status.copy()) for f in reader.frames()]
+            self.assertEqual([f[0] for f in frames], [1])
+            writer.write(self._frame(5, 2.0))
+            writer.write(self._frame(5, 3.0))
+            for frame, value in zip(reader.frames(), (2.0, 3.0)):
+                np.testing.assert_array_equal(frame.values, value)
+                np.testing.assert_array_equal(frame.status, int(value) % 4)
+                self.assertEqual((frame.timestamp, frame.sent, frame.is_keyframe),
+                                 (1000.0 + value, 2000.0 + value, True))
+                # Later writes to the slot do not change a frame already handed out
+                writer.write(self._frame(5, 9.0))
+                writer.write(self._frame(5, 9.0))
+                np.testing.assert_array_equal(frame.values, value)
+            self.assertEqual(reader.stats(), {"shm_frames": 3, "shm_torn": 0})
+            reader.close()
+            with self.assertRaises(ValueError):
+                writer.write(SensorFrame(0, 0.0, np.zeros(1), np.zeros(1, dtype=np.uint8), indices=[0]))
+        finally:
+            writer.close()
+        self.assertTrue(reader.closed)
+        with self.assertRaises(FileNotFoundError):
+            ShmRingReader(self.name)
+
+    def test_lapped_reader_skips_overwritten_frames(self):
+        """
+        Verify that a reader more than a ring behind loses frames instead of reading stale
+        ones, and that frames the writer is overwriting never reach the consumer.
+
+        Input: 4-slot ring, 10 frames written before the reader catches up; then a
+               slot caught mid-write and a slot overwritten before it is read
+        Output: Asserts only the last 4 frames are read, the torn ones are skipped and counted
+        """
+        writer = ShmRingWriter(self.name, 3, encode_json(build_schema(generate_dynamic_config(3))), slots=4)
+        try:
+            reader = ShmRingReader(self.name)
+            for value in range(1, 11):
+                writer.write(self._frame(3, float(value)))
+            self.assertEqual([int(f.values[0]) for f in reader.frames()], [7, 8, 9, 10])
+
+            for value in range(11, 14):
+                writer.write(self._frame(3, float(value)))
+            # Writer halfway through seq 15 in the slot of seq 11: start stamped, values partly written
+            writer.seq_start[15 % 4] = 15
+            writer.values[15 % 4, :2] = 99.0
+            frames = reader.frames()
+            self.assertEqual(int(next(frames).values[0]), 12)
+            # ... and laps the slot of seq 13 before the reader gets there
+            writer.write(self._frame(3, 14.0))
+            writer.seq = 16  # Seq 15 stays half-written, 16 never lands
+            writer.write(self._frame(3, 17.0))
+            consumed = [frame.values.copy() for frame in frames]
+            self.assertEqual(consumed, [])
+            self.assertEqual(reader.stats(), {"shm_frames": 5, "shm_torn": 2})
+            self.assertEqual([int(f.values[0]) for f in reader.frames()], [14, 17])
+            reader.close()
+        finally:
+            writer.close()
+
+    def test_reader_leaves_ring_of_crashed_writer(self):
+        """
+        Verify that a new writer marks a stale segment closed, so attached readers move on.
+
+        Input: Writer that goes away without close() (as after a crash), then a new writer
+        Output: Asserts the attached reader sees the old ring closed and a new reader gets new frames
+        """
+        schema = encode_json(build_schema(generate_dynamic_config(3)))
+        crashed = ShmRingWriter(self.name, 3, schema, slots=4)
+        crashed.write(self._frame(3, 1.0))
+        reader = ShmRingReader(self.name)
+        crashed._unmap()  # Mapping gone, segment neither closed nor unlinked
+        self.assertFalse(reader.closed)
+        with self.assertLogs(level="WARNING"):
+            writer = ShmRingWriter(self.name, 3, schema, slots=4)
+        try:
+            self.assertTrue(reader.closed)
+            reader.close()
+            writer.write(self._frame(3, 5.0))
+            reader = ShmRingReader(self.name)
+            self.assertEqual([int(f.values[0]) for f in reader.frames()], [5])
+            reader.close()
+        finally:
+            writer.close()
+
+    def test_simulator_to_client_without_tcp_clients(self):
+        """
+        Verify that a StreamClient in shared-memory mode follows the simulator and sends commands.
+
+        Input: Simulator publishing 12 sensors to a ring, no TCP clients; client with shm_name
+        Output: Asserts schema and batches arrive from the ring, no TCP bytes are received,
+                and TOGGLE_SIM reaches the simulator
+        """
+        sensor_config = generate_dynamic_config(12)
+        sim_config = {"update_rate": 0.01, "fault_prob": 0.0, "spike_prob": 0.0, "drift_amount": 0.0}
+        simulator = SensorSimulator(port=0, sensor_config=sensor_config, sim_config=sim_config, vectorized=True,
+                                    shm_name=self.name)
+        server = threading.Thread(target=simulator.start, daemon=True)
+        with contextlib.redirect_stdout(io.StringIO()):
+            server.start()
+            self.assertTrue(simulator.wait_until_ready(5.0))
+
+        schemas, batches = [], []
+        client = StreamClient(port=simulator.port, on_schema=schemas.append, on_batch=batches.append,
+                              shm_name=self.name)
+        receiver = threading.Thread(target=client.run, daemon=True)
+        receiver.start()
+        try:
+            deadline = time.monotonic() + 5.0
+            while sum(batch.frames for batch in batches) < 10 and time.monotonic() < deadline:
+                client.batch_delivered()
+                time.sleep(0.02)
+            self.assertEqual([sensor["id"] for sensor in schemas[0]["sensors"]], list(sensor_config))
+            self.assertEqual(batches[-1].sensor_ids, list(sensor_config))
+            self.assertGreaterEqual(batches[-1].stats["shm_frames"], 10)
+            self.assertEqual(batches[-1].stats["bytes_received"], 0)
+            self.assertEqual(simulator.clients, {})
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                client.send_command("TOGGLE_SIM")
+            self.assertTrue(simulator.paused)
+        finally:
+            client.stop()
+            receiver.join(5.0)
+            with contextlib.redirect_stdout(io.StringIO()):
+                simulator.stop()
+                server.join(5.0)
+        self.assertFalse(receiver.is_alive())
+        self.assertIsNone(client.ring)
+
+class TestPipelineBenchmark(unittest.TestCase):
+    """
+    Smoke test for the end-to-end benchmark harness (short run, offscreen Qt platform).
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def test_run_case_reports_throughput_and_latency(self):
+        """
+        Verify that one benchmark case streams frames end to end and reports its metrics.
+
+        Input: 12 sensors at 20 Hz for one second, binary protocol, feeding a Dashboard
+        Output: Asserts received frames, bytes, latency percentiles and JSON-serializable result
+        """
+        result = run_case(12, 0.05, duration=1.0, warmup=0.5, dashboard=True)
+        self.assertGreater(result["frames_received"], 5)
+        self.assertGreater(result["bytes_per_s"], 0)
+        self.assertLessEqual(result["latency_ms"]["p50"], result["latency_ms"]["p99"])
+        self.assertGreater(result["rss_mb"], 0)
+        self.assertEqual(json.loads(json.dumps(result))["sensors"], 12)
+
+class TestMicroBenchmarks(unittest.TestCase):
+    """
+    Checks that the hot-path microbenchmarks run and stay covered by the committed baselines.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def test_every_default_case_has_a_baseline(self):
+        """
+        Verify that baselines.json holds a number for each benchmark at each default sensor count.
+
+        Input: Committed baseline file
+        Output: Asserts every case key is present with a positive time
+        """
+        baselines = micro.load_baselines()
+        for name in micro.BENCHMARKS:
+            for sensors in micro.DEFAULT_SIZES:
+                self.assertGreater(baselines.get(micro.case_key(name, sensors), 0), 0)
+
+    def test_run_and_compare(self):
+        """
+        Verify that each benchmark runs at a small size and that slow cases are flagged.
+
+        Input: All benchmarks at 10 sensors, one quick repeat; synthetic baselines
+        Output: Asserts one timing per benchmark and the regression flag against the threshold
+        """
+        results = micro.run_benchmarks(sizes=(10,), repeat=1, min_time=0.0)
+        self.assertEqual(set(results), {micro.case_key(name, 10) for name in micro.BENCHMARKS})
+        self.assertTrue(all(seconds > 0 for seconds in results.values()))
+
+        report = micro.compare({"a[10]": 2.0, "b[10]": 1.2, "c[10]": 1.0}, {"a[10]": 1.0, "b[10]": 1.0}, 1.5)
+        self.assertEqual([row["regression"] for row in report], [True, False, False])
+        self.assertIsNone(report[2]["baseline"])
+
 if __name__ == '__main__':
     unittest.main()